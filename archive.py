@@ -0,0 +1,172 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from records import empty_record
+from extractors import extract_details, NOT_AVAILABLE
+from fastpath import parse_project_record, unwrap
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    rera_no TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    codec TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_rera ON pages (rera_no, kind, fetched_at);
+"""
+
+# Page kinds that together make up one project's detail snapshot
+HTML_KINDS = ('project', 'promoter')
+API_KINDS = ('api-project', 'api-promoter')
+# Promoter fields served from the promoter cache instead of a fetched promoter tab or payload
+CACHED_PROMOTER_KIND = 'cached-promoter'
+
+
+def compress(data, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def blob_path(root, sha256, codec):
+    return os.path.join(root, 'objects', sha256[:2], f"{sha256[2:]}.{'zst' if codec == 'zstd' else 'gz'}")
+
+
+def read_blob(root, sha256, codec):
+    with open(blob_path(root, sha256, codec), 'rb') as f:
+        return decompress(f.read(), codec).decode('utf-8')
+
+
+class PageArchive:
+    """Content-addressed, compressed store of every fetched page, indexed by RERA number and fetch time"""
+
+    def __init__(self, root='page_archive', codec=None):
+        self.root = root
+        self.codec = codec or ('zstd' if zstandard else 'gzip')
+        if self.codec == 'zstd' and zstandard is None:
+            raise RuntimeError("zstd archives need the zstandard package (pip install zstandard)")
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, 'index.sqlite3'), check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def store(self, content, kind, rera_no, url):
+        """Archive one page; identical content is stored once however often it is fetched"""
+        data = content.encode('utf-8')
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = blob_path(self.root, sha256, self.codec)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compress(data, self.codec))
+            os.replace(tmp_path, path)
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO pages (rera_no, kind, url, fetched_at, sha256, codec) VALUES (?, ?, ?, ?, ?, ?)",
+                (rera_no or '', kind, url, time.time(), sha256, self.codec)
+            )
+        return sha256
+
+    def store_detail(self, rera_no, url, page_sources, cached_promoter=None):
+        """Archive the project and promoter tab snapshots of one detail page"""
+        for kind in HTML_KINDS:
+            if page_sources.get(kind):
+                self.store(page_sources[kind], kind, rera_no, url)
+        if cached_promoter:
+            self.store_cached_promoter(rera_no, url, cached_promoter)
+
+    def store_cached_promoter(self, rera_no, url, cached_promoter):
+        """Archive the promoter cache's fields in place of a promoter tab or payload that was never fetched"""
+        self.store(json.dumps(cached_promoter, sort_keys=True), CACHED_PROMOTER_KIND, rera_no, url)
+
+    def latest_snapshots(self):
+        """Most recent (url, kind pair, blobs) per RERA number, ready for re-extraction"""
+        rows = self.conn.execute(
+            "SELECT rera_no, kind, url, sha256, codec, fetched_at FROM pages p WHERE rera_no != '' "
+            "AND kind != 'listing' "
+            "AND fetched_at = (SELECT MAX(fetched_at) FROM pages q WHERE q.rera_no = p.rera_no AND q.kind = p.kind) "
+            "ORDER BY rera_no"
+        )
+        snapshots = {}
+        for rera_no, kind, url, sha256, codec, fetched_at in rows:
+            snapshots.setdefault(rera_no, {'url': url})[kind] = (sha256, codec, fetched_at)
+        for rera_no, entry in snapshots.items():
+            for project_kind, promoter_kind in (HTML_KINDS, API_KINDS):
+                # A promoter cache hit archives the cached fields instead; whichever is newer is what the record used
+                promoters = [kind for kind in (promoter_kind, CACHED_PROMOTER_KIND) if kind in entry]
+                if project_kind in entry and promoters:
+                    promoter_kind = max(promoters, key=lambda kind: entry[kind][2])
+                    yield (self.root, rera_no, entry['url'], (project_kind, promoter_kind),
+                           entry[project_kind][:2], entry[promoter_kind][:2])
+                    break
+
+    def latest_pages(self, kinds):
+        """Most recent (rera_no, kind, url, content) of every archived URL of the given kinds"""
+        placeholders = ', '.join('?' * len(kinds))
+        rows = self.conn.execute(
+            f"SELECT rera_no, kind, url, sha256, codec FROM pages p WHERE kind IN ({placeholders}) "
+            "AND fetched_at = (SELECT MAX(fetched_at) FROM pages q WHERE q.kind = p.kind AND q.url = p.url) "
+            "ORDER BY id", kinds
+        ).fetchall()
+        for rera_no, kind, url, sha256, codec in rows:
+            yield rera_no, kind, url, read_blob(self.root, sha256, codec)
+
+    def close(self):
+        self.conn.close()
+
+
+def reextract_snapshot(job):
+    """Rebuild one project's record from its archived pages (runs in a worker process)"""
+    root, rera_no, url, kinds, first_blob, second_blob = job
+    first = read_blob(root, *first_blob)
+    second = read_blob(root, *second_blob)
+    cached_promoter = {}
+    if kinds[1] == CACHED_PROMOTER_KIND:
+        cached_promoter, second = json.loads(second), None
+    if kinds[0] == API_KINDS[0]:
+        record = parse_project_record(unwrap(json.loads(first)), unwrap(json.loads(second)) if second else {}, url)
+        record.update(cached_promoter)
+        return record
+
+    record = empty_record(url)
+    record['RERA Regd. No'] = rera_no
+    details = extract_details(first, second or '')
+    details.update(cached_promoter)
+    for key, value in details.items():
+        if value and value != NOT_AVAILABLE:
+            record[key] = value
+    return record
+
+
+def reextract(archive_root, workers=None, chunksize=16):
+    """Re-run the extractors over every archived project in a process pool, yielding records"""
+    archive = PageArchive(archive_root)
+    try:
+        jobs = list(archive.latest_snapshots())
+    finally:
+        archive.close()
+    print(f"🗄️ Re-extracting {len(jobs)} archived projects from {archive_root}...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(reextract_snapshot, jobs, chunksize=chunksize)
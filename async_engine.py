@@ -0,0 +1,364 @@
+import asyncio
+
+from records import record_from_stub
+from metrics import RunMetrics
+from ratelimit import HostRateController
+from extractors import parse_project_tab, parse_promoter_tab, parse_listing_cards, collect_document_links, NOT_AVAILABLE
+from browser_config import (
+    DEFAULT_STAGE_TIMEOUTS, NETWORK_QUIET_MS, PENDING_REQUESTS_HOOK, NETWORK_IDLE_SCRIPT,
+    PROJECT_CARD_SELECTOR, NEXT_PAGE_XPATH, PROMOTER_TAB_XPATH, PROMOTER_TABLE_LABELS
+)
+
+try:
+    from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    async_playwright = None
+
+BASE_URL = "https://rera.odisha.gov.in"
+PROJECTS_URL = "https://rera.odisha.gov.in/projects/project-list"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--disable-blink-features=AutomationControlled']
+
+# Readiness conditions, evaluated in the page by wait_for_function
+NETWORK_IDLE_JS = f"quietMs => (function () {{ {NETWORK_IDLE_SCRIPT} }})(quietMs)"
+CARDS_RENDERED_JS = f"""() => {{
+    const cards = Array.from(document.querySelectorAll('{PROJECT_CARD_SELECTOR}'));
+    return cards.length > 0 && cards.every(card => card.innerText.trim());
+}}"""
+LISTING_CHANGED_JS = f"""previous => {{
+    const card = document.querySelector('{PROJECT_CARD_SELECTOR}');
+    return !!card && card.innerText.trim() !== previous;
+}}"""
+FIRST_CARD_TEXT_JS = f"""() => {{
+    const card = document.querySelector('{PROJECT_CARD_SELECTOR}');
+    return card ? card.innerText.trim() : '';
+}}"""
+DETAIL_HEADING_JS = "() => Array.from(document.querySelectorAll('h1, h2, h3')).some(h => h.innerText.trim())"
+PROMOTER_TABLE_JS = """labels => Array.from(document.querySelectorAll("div[class*='promoter'] tr, table tr")).some(row => {
+    const cells = row.querySelectorAll('td');
+    return cells.length > 1 && cells[1].innerText.trim() && labels.some(label => cells[0].innerText.includes(label));
+})"""
+CARD_DETAILS_LINK_XPATH = (
+    ".//a[contains(text(), 'View Details') or contains(text(), 'Details') or contains(@class, 'view-details')"
+    " or contains(@href, 'details')]"
+)
+
+
+class AsyncTabEngine:
+    """Many concurrent tabs of one Chromium, driven over CDP from a single asyncio event loop"""
+
+    def __init__(self, tabs=8, headless=True, blocked_urls=(), stage_timeouts=None, archive=None, metrics=None,
+                 attach_to=None, per_host_limit=2, min_interval=0.5, recycle_after=50, promoter_cache=None,
+                 documents=None, rate_controller=None):
+        self.tabs = tabs
+        self.headless = headless
+        self.blocked_urls = list(blocked_urls)
+        self.stage_timeouts = dict(DEFAULT_STAGE_TIMEOUTS, **(stage_timeouts or {}))
+        self.archive = archive
+        self.metrics = metrics or RunMetrics()
+        self.attach_to = attach_to
+        self.recycle_after = recycle_after
+        self.promoter_cache = promoter_cache
+        self.documents = documents
+        # The same AIMD limits and circuit breaker as the Selenium and HTTP paths, shared with them if given
+        self.rate_controller = rate_controller or HostRateController(per_host_limit, min_interval, metrics=self.metrics)
+        self.base_url = BASE_URL
+        self.projects_url = PROJECTS_URL
+        self.playwright = None
+        self.browser = None
+        self.context = None
+
+    async def start(self):
+        """Launch (or attach to) the browser and open the shared context"""
+        if async_playwright is None:
+            raise RuntimeError("The async engine needs playwright (pip install playwright && playwright install chromium)")
+        self.playwright = await async_playwright().start()
+        with self.metrics.stage('driver_start'):
+            if self.attach_to:
+                self.browser = await self.playwright.chromium.connect_over_cdp(f"http://{self.attach_to}")
+            else:
+                self.browser = await self.playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        self.context = await self.browser.new_context(user_agent=USER_AGENT, viewport={'width': 1920, 'height': 1080})
+        await self.context.add_init_script(PENDING_REQUESTS_HOOK)
+        print(f"🧭 Async engine: up to {self.tabs} tabs in one browser")
+
+    async def new_tab(self):
+        """Open a tab with the resource blocking list applied through its CDP session"""
+        page = await self.context.new_page()
+        if self.blocked_urls:
+            cdp = await self.context.new_cdp_session(page)
+            await cdp.send('Network.enable')
+            await cdp.send('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        return page
+
+    async def wait_for(self, page, script, stage, arg=None, description=None):
+        """Await a readiness condition within the stage's timeout budget"""
+        try:
+            with self.metrics.stage(f"wait_{stage}"):
+                await page.wait_for_function(script, arg=arg, timeout=self.stage_timeouts[stage] * 1000, polling=200)
+            return True
+        except PlaywrightTimeoutError:
+            print(f"   ⏱️ Timed out after {self.stage_timeouts[stage]}s waiting for {description or stage}")
+            self.metrics.increment('timeouts', stage)
+            return False
+
+    async def wait_for_network_idle(self, page):
+        return await self.wait_for(page, NETWORK_IDLE_JS, 'idle', NETWORK_QUIET_MS, 'network idle')
+
+    async def load(self, page, url, ready, stage, arg=None):
+        """Navigate a tab and await network idle plus the stage's readiness condition"""
+        try:
+            print(f"Loading: {url}")
+            # Only the page load holds a host slot; tab clicks and parsing run alongside other tabs' loads
+            async with self.rate_controller.async_slot(url) as request:
+                with self.metrics.stage('navigate'):
+                    await page.goto(url, wait_until='domcontentloaded', timeout=self.stage_timeouts['page'] * 1000)
+                await self.wait_for_network_idle(page)
+                is_ready = await self.wait_for(page, ready, stage, arg)
+                if not is_ready:
+                    request.fail()
+            return is_ready
+        except PlaywrightError as e:
+            print(f"Error loading {url}: {str(e)}")
+            self.metrics.increment('errors', 'load')
+            return False
+
+    async def iter_listing_pages(self):
+        """Walk every listing page in one tab, yielding the project stubs on each"""
+        page = await self.new_tab()
+        try:
+            if not await self.load(page, self.projects_url, CARDS_RENDERED_JS, 'listing'):
+                print(f"No project cards found with {PROJECT_CARD_SELECTOR}")
+                return
+            page_number = 1
+            while True:
+                print(f"   📄 Listing page {page_number}")
+                with self.metrics.stage('listing_page'):
+                    stubs = await self.stubs_from_current_page(page, page_number)
+                yield stubs
+                with self.metrics.stage('next_listing_page'):
+                    has_next = await self.go_to_next_listing_page(page)
+                if not has_next:
+                    break
+                page_number += 1
+        finally:
+            await page.close()
+
+    async def stubs_from_current_page(self, page, page_number):
+        page_source = await page.content()
+        if self.archive:
+            listing_url = f"{self.projects_url}#page={page_number}"
+            await asyncio.to_thread(self.archive.store, page_source, 'listing', '', listing_url)
+        stubs = await asyncio.to_thread(parse_listing_cards, page_source, self.base_url)
+        page_text = await page.evaluate(FIRST_CARD_TEXT_JS)
+        for index, stub in enumerate(stubs):
+            if not stub['detail_url']:
+                print("   🔗 No href on View Details, intercepting click target...")
+                stub['detail_url'] = await self.intercept_detail_url(page, index)
+                await self.restore_listing_page(page, page_number, page_text)
+        return stubs
+
+    async def intercept_detail_url(self, page, index):
+        """Click a card's View Details just to learn where it navigates, then go back"""
+        button = page.locator(PROJECT_CARD_SELECTOR).nth(index).locator(f"xpath={CARD_DETAILS_LINK_XPATH}")
+        if not await button.count():
+            return ''
+        listing_url = page.url
+        await button.first.evaluate("element => element.click()")
+        if not await self.wait_for(page, "url => location.href !== url", 'detail', listing_url, 'detail page navigation'):
+            return ''
+        detail_url = page.url
+        with self.metrics.stage('back'):
+            await page.go_back()
+            await self.wait_for(page, CARDS_RENDERED_JS, 'listing', description='listing cards')
+        return detail_url
+
+    async def restore_listing_page(self, page, page_number, expected_text):
+        """Get back to a listing page after a click-through reset the pagination"""
+        if await page.evaluate(FIRST_CARD_TEXT_JS) == expected_text:
+            return
+        await self.load(page, self.projects_url, CARDS_RENDERED_JS, 'listing')
+        for _ in range(page_number - 1):
+            if not await self.go_to_next_listing_page(page):
+                break
+
+    async def go_to_next_listing_page(self, page):
+        """Click the pagination Next control; False once there is no further page"""
+        next_links = page.locator(f"xpath={NEXT_PAGE_XPATH}")
+        if not await next_links.count():
+            return False
+        previous_text = await page.evaluate(FIRST_CARD_TEXT_JS)
+        await next_links.first.evaluate("element => element.click()")
+        if not await self.wait_for(page, LISTING_CHANGED_JS, 'listing', previous_text, 'next listing page'):
+            return False
+        return await self.wait_for(page, CARDS_RENDERED_JS, 'listing', description='listing cards')
+
+    async def scrape_project_detail(self, page, stub):
+        """Open a project's detail page in the given tab and extract its information"""
+        project_data = record_from_stub(stub)
+        if not stub.get('detail_url'):
+            print("   ⚠️ No detail URL for this project")
+            return project_data
+
+        with self.metrics.stage('detail_load'):
+            loaded = await self.load(page, stub['detail_url'], DETAIL_HEADING_JS, 'detail')
+        if not loaded:
+            print("   ⚠️ Detail page did not become ready")
+            return project_data
+
+        project_data['Project URL'] = page.url
+        # The cache, archive and document index are SQLite and files: keep them off the event loop
+        cached_promoter = await asyncio.to_thread(self.promoter_cache.get, stub) if self.promoter_cache else None
+        details, page_sources = await self.extract_detailed_information(page, cached_promoter)
+        if self.promoter_cache and not cached_promoter:
+            await asyncio.to_thread(self.promoter_cache.put, stub, details)
+        for key, value in details.items():
+            if value and value != NOT_AVAILABLE:
+                project_data[key] = value
+        if self.archive and project_data['RERA Regd. No']:
+            await asyncio.to_thread(
+                self.archive.store_detail, project_data['RERA Regd. No'], project_data['Project URL'], page_sources,
+                cached_promoter
+            )
+        if self.documents and project_data['RERA Regd. No']:
+            links = collect_document_links(page_sources, self.base_url)
+            if links:
+                cookies = await self.context.cookies()
+                await asyncio.to_thread(self.documents.submit, project_data['RERA Regd. No'], links, cookies)
+        return project_data
+
+    async def snapshot(self, page, parser, field, stage, retry_event, max_retries=3):
+        """Parse a tab's HTML, re-taking the snapshot while the key field has not rendered yet"""
+        for attempt in range(1, max_retries + 1):
+            with self.metrics.stage(stage):
+                page_source = await page.content()
+                details = await asyncio.to_thread(parser, page_source)
+            if details[field] != NOT_AVAILABLE or attempt == max_retries:
+                return details, page_source
+            print(f"   ⚠️ {field} not rendered yet (attempt {attempt})")
+            self.metrics.increment('retries', retry_event)
+            await self.wait_for_network_idle(page)
+
+    async def extract_detailed_information(self, page, cached_promoter=None):
+        """Project and promoter tab fields plus the snapshots they came from, skipping the promoter tab if cached"""
+        details = {
+            'RERA Regd. No': NOT_AVAILABLE,
+            'Project Name': NOT_AVAILABLE,
+            'Promoter Name': NOT_AVAILABLE,
+            'Promoter Address': NOT_AVAILABLE,
+            'GST No': NOT_AVAILABLE,
+        }
+        page_sources = {'project': '', 'promoter': ''}
+        try:
+            project_details, page_sources['project'] = await self.snapshot(
+                page, parse_project_tab, 'RERA Regd. No', 'project_tab_parse', 'rera_snapshot'
+            )
+            details.update(project_details)
+            if cached_promoter:
+                print("   ♻️ Promoter details from cache, skipping the Promoter Details tab")
+                details.update(cached_promoter)
+                return details, page_sources
+
+            with self.metrics.stage('promoter_click'):
+                tab = page.locator(f"xpath={PROMOTER_TAB_XPATH}").first
+                for attempt in range(1, 4):
+                    if attempt > 1:
+                        self.metrics.increment('retries', 'promoter_click')
+                    try:
+                        await tab.wait_for(state='visible', timeout=self.stage_timeouts['promoter'] * 1000)
+                        await tab.evaluate("element => { element.scrollIntoView(true); element.click(); }")
+                        print("   ✅ Clicked Promoter Details tab")
+                        if await self.wait_for(page, PROMOTER_TABLE_JS, 'promoter', list(PROMOTER_TABLE_LABELS),
+                                               'promoter details table'):
+                            break
+                    except PlaywrightError as e:
+                        print(f"   ⚠️ Promoter Details tab not found or not clickable (attempt {attempt}): {str(e)}")
+                        await self.wait_for_network_idle(page)
+
+            promoter_details, page_sources['promoter'] = await self.snapshot(
+                page, parse_promoter_tab, 'GST No', 'promoter_tab_parse', 'gst_snapshot'
+            )
+            details.update(promoter_details)
+        except Exception as e:
+            print(f"   ❌ Error extracting detailed information: {str(e)}")
+            self.metrics.increment('errors', 'extract')
+        return details, page_sources
+
+    async def crawl(self, stubs):
+        """Stream stubs (an async iterable) through the tab workers, yielding (stub, record) as they finish"""
+        jobs = asyncio.Queue(maxsize=self.tabs * 2)
+        done = asyncio.Queue()
+        feeder = asyncio.create_task(self.feed(stubs, jobs))
+        workers = [asyncio.create_task(self.tab_worker(tab_id, jobs, done)) for tab_id in range(1, self.tabs + 1)]
+
+        running = len(workers)
+        while running:
+            item = await done.get()
+            if item is None:
+                running -= 1
+                continue
+            yield item
+        await feeder
+
+    async def feed(self, stubs, jobs):
+        """Push stubs onto the job queue, then one stop marker per tab"""
+        try:
+            async for stub in stubs:
+                await jobs.put(stub)
+        except Exception as e:
+            print(f"   ❌ Stopped reading project stubs: {str(e)}")
+        finally:
+            for _ in range(self.tabs):
+                await jobs.put(None)
+
+    async def tab_worker(self, tab_id, jobs, done):
+        """Scrape jobs in one tab until a stop marker, replacing the tab every recycle_after pages"""
+        page = None
+        pages = 0
+        try:
+            while True:
+                stub = await jobs.get()
+                if stub is None:
+                    break
+                try:
+                    if page is not None and self.recycle_after and pages >= self.recycle_after:
+                        print(f"   ♻️ Tab {tab_id}: recycling after {pages} pages")
+                        await page.close()
+                        self.metrics.increment('recycles')
+                        page = None
+                    if page is None:
+                        page = await self.new_tab()
+                        pages = 0
+                    print(f"   🔍 Tab {tab_id}: {stub.get('project_name') or stub.get('detail_url')}")
+                    with self.metrics.stage('project'):
+                        record = await self.scrape_project_detail(page, stub)
+                except Exception as e:
+                    print(f"   ❌ Tab {tab_id}: error processing {stub.get('detail_url')}: {str(e)}")
+                    self.metrics.increment('errors', 'project')
+                    record = record_from_stub(stub)
+                await done.put((stub, record))
+                pages += 1
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except PlaywrightError:
+                    pass
+            await done.put(None)
+
+    async def scrape_one(self, stub):
+        """Scrape a single project in a throwaway tab"""
+        page = await self.new_tab()
+        try:
+            return await self.scrape_project_detail(page, stub)
+        finally:
+            await page.close()
+
+    async def close(self):
+        """Close our context and, unless attached to a shared browser, the browser itself"""
+        if self.context:
+            await self.context.close()
+        if self.browser and not self.attach_to:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+import psutil
+
+from metrics import RunMetrics
+from ratelimit import HostRateController, NO_RATE_LIMIT
+from fastpath import RERAApiClient
+from parallel import ParallelRERAScraper
+from mock_portal import MockPortal, ReplayPortal, synthetic_projects, projects_from_records
+from scrap import EnhancedOdishaRERAProjectScraper, FastPathRERAScraper, AsyncTabRERAScraper
+
+MODES = ('selenium', 'fast', 'async')
+SYNTHETIC_WARNING = (
+    "⚠️ Data source '{source}': pages are rendered from the mock's own templates, so complete records and field hit "
+    "rates only show the scraper parsing markup written to match it, not the live portal's. "
+    "Use --replay-archive with a `scrap.py --archive` directory to measure against real recorded pages."
+)
+
+
+class ResourceSampler:
+    """Background sampler of peak RSS and Chrome process count for this process and everything it started"""
+
+    def __init__(self, interval=0.25):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_chrome = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stopped.is_set():
+            self.sample()
+            self.stopped.wait(self.interval)
+
+    def sample(self):
+        root = psutil.Process()
+        rss = 0
+        chrome = 0
+        for proc in [root] + root.children(recursive=True):
+            try:
+                rss += proc.memory_info().rss
+                name = proc.name().lower()
+            except psutil.Error:
+                continue
+            # chromedriver itself is not a browser process
+            if ('chrome' in name or 'chromium' in name) and 'driver' not in name:
+                chrome += 1
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_chrome = max(self.peak_chrome, chrome)
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.sample()
+
+
+def point_at_portal(scraper, portal):
+    """Send the scraper to the mock portal instead of rera.odisha.gov.in"""
+    scraper.base_url = portal.url
+    scraper.projects_url = f"{portal.url}/projects/project-list"
+    if hasattr(scraper, 'engine'):
+        scraper.engine.base_url = scraper.base_url
+        scraper.engine.projects_url = scraper.projects_url
+    return scraper
+
+
+def run_scenario(portal, mode='selenium', projects=None, workers=1, rate_control=False, blocking='media'):
+    """Scrape the mock portal end to end once and measure throughput, latency and resource use"""
+    metrics = RunMetrics()
+    rate_controller = HostRateController(max_concurrent=max(workers, 1), min_interval=0, metrics=metrics) \
+        if rate_control else NO_RATE_LIMIT
+    requests_before = portal.requests
+    errors_before = portal.errors
+    sampler = ResourceSampler().start()
+    started = time.perf_counter()
+    scraper = None
+    try:
+        if mode == 'fast':
+            api = RERAApiClient(portal.api_base, metrics=metrics, rate_controller=rate_controller)
+            scraper = FastPathRERAScraper(api, headless=True, metrics=metrics, rate_controller=rate_controller,
+                                          blocking=blocking)
+        elif mode == 'async':
+            scraper = AsyncTabRERAScraper(tabs=workers, headless=True, metrics=metrics, blocking=blocking,
+                                          per_host_limit=workers, min_interval=0, rate_controller=rate_controller)
+        else:
+            scraper = EnhancedOdishaRERAProjectScraper(headless=True, metrics=metrics, rate_controller=rate_controller,
+                                                       blocking=blocking)
+        point_at_portal(scraper, portal)
+
+        stubs = list(scraper.iter_project_stubs(limit=projects))
+        if mode == 'fast':
+            # The API stubs carry the live portal's detail URLs; keep any Selenium fallback on the mock
+            stubs = [dict(stub, detail_url=portal.detail_url(stub['project_id'])) for stub in stubs]
+
+        if mode == 'selenium' and workers > 1:
+            pool = ParallelRERAScraper(
+                lambda: point_at_portal(EnhancedOdishaRERAProjectScraper(
+                    headless=True, metrics=metrics, rate_controller=rate_controller, blocking=blocking
+                ), portal),
+                workers=workers, metrics=metrics,
+            )
+            results = pool.iter_scrape(stubs)
+        else:
+            results = scraper.scrape_stubs(stubs, total=len(stubs))
+        records = [record for _, record in results]
+    finally:
+        if scraper:
+            scraper.cleanup()
+        sampler.stop()
+    wall_s = time.perf_counter() - started
+
+    for record in records:
+        metrics.add_record(record)
+    project_stage = metrics.stage_summary().get('project', {})
+    complete = sum(1 for record in records if record['RERA Regd. No'] and record['GST No'])
+    return {
+        'mode': mode,
+        'workers': workers,
+        'rate_control': rate_control,
+        'projects': len(records),
+        'complete_records': complete,
+        'wall_s': round(wall_s, 3),
+        'projects_per_min': round(len(records) / wall_s * 60, 2) if wall_s else 0.0,
+        'project_p50_s': project_stage.get('p50_s', 0.0),
+        'project_p95_s': project_stage.get('p95_s', 0.0),
+        'peak_rss_mb': round(sampler.peak_rss / 1024 / 1024, 1),
+        'peak_chrome_processes': sampler.peak_chrome,
+        'portal_requests': portal.requests - requests_before,
+        'portal_errors': portal.errors - errors_before,
+        'metrics': metrics.as_dict(),
+    }
+
+
+def print_report(results, baseline=None):
+    """One line per scenario, with the change against a baseline report when given"""
+    print("\n" + "=" * 100)
+    print("🏁 BENCHMARK RESULTS")
+    print("=" * 100)
+    print(f"{'scenario':24} {'projects':>8} {'complete':>8} {'proj/min':>9} {'p50 s':>7} {'p95 s':>7} "
+          f"{'peak RSS MB':>11} {'chrome':>6} {'errors':>6}")
+    previous = {scenario_name(result): result for result in (baseline or [])}
+    for result in results:
+        name = scenario_name(result)
+        print(f"{name:24} {result['projects']:>8} {result['complete_records']:>8} {result['projects_per_min']:>9} "
+              f"{result['project_p50_s']:>7} {result['project_p95_s']:>7} {result['peak_rss_mb']:>11} "
+              f"{result['peak_chrome_processes']:>6} {result['portal_errors']:>6}")
+        before = previous.get(name)
+        if before and before['projects_per_min']:
+            change = (result['projects_per_min'] - before['projects_per_min']) / before['projects_per_min'] * 100
+            print(f"{'':24} vs baseline: {change:+.1f}% proj/min, p95 {before['project_p95_s']}s -> "
+                  f"{result['project_p95_s']}s, peak RSS {before['peak_rss_mb']} -> {result['peak_rss_mb']} MB")
+
+
+def scenario_name(result):
+    name = f"{result['mode']} x{result['workers']}"
+    return name + ' +rate' if result['rate_control'] else name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper end to end against a local mock portal")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=['selenium'],
+                        help="Scraper modes to run (default: selenium)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1],
+                        help="Worker (or tab) counts to run each mode with")
+    parser.add_argument('--projects', type=int, default=30, help="Projects on the mock portal (default: 30)")
+    parser.add_argument('--records', help="Serve these scraped records (.json or .jsonl) instead of synthetic ones")
+    parser.add_argument('--replay-archive', metavar='DIR',
+                        help="Replay the raw pages and API responses archived by scrap.py --archive")
+    parser.add_argument('--page-size', type=int, default=9, help="Cards per listing page (default: 9)")
+    parser.add_argument('--latency-ms', type=float, default=150, help="Delay added to every response (default: 150)")
+    parser.add_argument('--jitter-ms', type=float, default=100, help="Random extra delay of up to this much")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--rate-control', action='store_true', help="Route requests through the adaptive rate controller")
+    parser.add_argument('--blocking', default='media', help="Resource blocking profile (default: media)")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per scenario")
+    parser.add_argument('--baseline', help="Earlier benchmark report to compare against")
+    parser.add_argument('--output', default='benchmark_results.json', help="Where to write the report")
+    args = parser.parse_args()
+
+    if args.replay_archive:
+        source = 'replay'
+        portal = ReplayPortal(args.replay_archive, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                              error_rate=args.error_rate).start()
+    else:
+        source = 'records' if args.records else 'synthetic'
+        projects = projects_from_records(args.records) if args.records else synthetic_projects(args.projects)
+        portal = MockPortal(projects, page_size=args.page_size, latency=args.latency_ms / 1000,
+                            jitter=args.jitter_ms / 1000, error_rate=args.error_rate).start()
+    print(f"🏗️ Mock portal ({source}) with {len(portal.projects)} projects at {portal.url}")
+    if source != 'replay':
+        print(SYNTHETIC_WARNING.format(source=source))
+
+    results = []
+    try:
+        for mode in args.modes:
+            for workers in args.workers:
+                for run in range(1, args.repeat + 1):
+                    print(f"\n🚀 Benchmark: {mode} with {workers} worker(s), run {run}/{args.repeat}")
+                    result = run_scenario(portal, mode, workers=workers, rate_control=args.rate_control,
+                                          blocking=args.blocking)
+                    result['run'] = run
+                    results.append(result)
+    finally:
+        portal.stop()
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_report(results, baseline)
+    if source != 'replay':
+        print(SYNTHETIC_WARNING.format(source=source))
+
+    report = {
+        'config': {key: value for key, value in vars(args).items() if key not in ('baseline', 'output')},
+        'data_source': source,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Benchmark report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from fnmatch import fnmatchcase
+
+# Page-level settings shared by the Selenium scraper and the asyncio tab engine
+
+# Seconds each stage may wait for its readiness condition before giving up
+DEFAULT_STAGE_TIMEOUTS = {
+    'page': 30,       # document body present after driver.get()
+    'idle': 15,       # XHR/fetch queue and Angular zone settled
+    'listing': 30,    # project cards rendered on the listing page
+    'detail': 30,     # detail page heading populated
+    'promoter': 20,   # promoter pane shows its label/value table
+}
+
+# Requests the scraper never needs. Patterns go to CDP Network.setBlockedURLs
+# ('*' wildcard); prefs are Chrome content settings (2 = block).
+MEDIA_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3',
+]
+THIRD_PARTY_URL_PATTERNS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*maps.googleapis.com*', '*maps.gstatic.com*', '*fonts.googleapis.com*', '*fonts.gstatic.com*',
+    '*facebook.net*', '*facebook.com*', '*twitter.com*', '*youtube.com*', '*ytimg.com*',
+    '*cdnjs.cloudflare.com*', '*cdn.jsdelivr.net*', '*unpkg.com*',
+]
+# What the Angular app needs to render the listing cards and detail tables: its
+# bundles, stylesheet and API. A profile pattern matching any of these is dropped.
+REQUIRED_RESOURCE_URLS = [
+    'https://rera.odisha.gov.in/main.js',
+    'https://rera.odisha.gov.in/polyfills.js',
+    'https://rera.odisha.gov.in/runtime.js',
+    'https://rera.odisha.gov.in/styles.css',
+    'https://rera.odisha.gov.in/api/projects/project-list',
+]
+BLOCKING_PROFILES = {
+    'off': {'urls': [], 'prefs': {}},
+    'media': {
+        'urls': MEDIA_URL_PATTERNS,
+        'prefs': {'profile.managed_default_content_settings.images': 2},
+    },
+    'strict': {
+        'urls': MEDIA_URL_PATTERNS + THIRD_PARTY_URL_PATTERNS,
+        'prefs': {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+            'profile.default_content_setting_values.geolocation': 2,
+            'profile.default_content_setting_values.media_stream': 2,
+            'profile.default_content_setting_values.plugins': 2,
+            'profile.default_content_setting_values.popups': 2,
+        },
+    },
+}
+
+# Bytes transferred and load timings for the current page, from the Resource Timing API
+PAGE_WEIGHT_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource');
+var bytes = (nav.transferSize || 0) + resources.reduce(function (sum, r) { return sum + (r.transferSize || 0); }, 0);
+return {
+    bytes: bytes,
+    requests: resources.length + 1,
+    load_ms: nav.loadEventEnd || 0,
+    js_heap_bytes: (performance.memory && performance.memory.usedJSHeapSize) || 0
+};
+"""
+
+# Milliseconds without any XHR/fetch activity before the page counts as idle
+NETWORK_QUIET_MS = 500
+
+# Injected before any page script runs so we can count in-flight XHR/fetch calls
+PENDING_REQUESTS_HOOK = """
+(function () {
+    if (window.__reraPendingRequests !== undefined) { return; }
+    window.__reraPendingRequests = 0;
+    window.__reraLastActivity = Date.now();
+    function started() { window.__reraPendingRequests++; window.__reraLastActivity = Date.now(); }
+    function finished() {
+        window.__reraPendingRequests = Math.max(0, window.__reraPendingRequests - 1);
+        window.__reraLastActivity = Date.now();
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        started();
+        this.addEventListener('loadend', finished);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var nativeFetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return nativeFetch.apply(this, arguments).finally(finished);
+        };
+    }
+})();
+"""
+
+NETWORK_IDLE_SCRIPT = """
+if (document.readyState !== 'complete') { return false; }
+var pending = window.__reraPendingRequests || 0;
+var quiet = Date.now() - (window.__reraLastActivity || 0) >= arguments[0];
+if (pending > 0 || !quiet) { return false; }
+if (window.getAllAngularTestabilities) {
+    return window.getAllAngularTestabilities().every(function (t) { return t.isStable(); });
+}
+return true;
+"""
+
+
+PROJECT_CARD_SELECTOR = "div.project-card"
+NEXT_PAGE_XPATH = (
+    "//ul[contains(@class, 'pagination')]//li[not(contains(@class, 'disabled'))]"
+    "/a[contains(., 'Next') or contains(., '»') or @aria-label='Next']"
+    " | //button[(contains(., 'Next') or @aria-label='Next') and not(@disabled)]"
+)
+PROMOTER_TAB_XPATH = "//a[contains(text(), 'Promoter Details') or contains(text(), 'Promoter') or contains(@href, 'promoter')]"
+PROMOTER_TABLE_LABELS = ('GST', 'PAN', 'Promoter')
+
+
+def blocked_url_patterns(profile):
+    """The profile's URL patterns, minus any that would block a resource the app needs"""
+    return [
+        pattern for pattern in profile['urls']
+        if not any(fnmatchcase(url, pattern) for url in REQUIRED_RESOURCE_URLS)
+    ]
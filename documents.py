@@ -0,0 +1,277 @@
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import RunMetrics
+from ratelimit import NO_RATE_LIMIT, backoff_delay
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    rera_no TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    sha256 TEXT,
+    size INTEGER,
+    content_type TEXT,
+    path TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (rera_no, url)
+);
+CREATE INDEX IF NOT EXISTS documents_url ON documents (url, status);
+"""
+
+DONE = 'done'
+FAILED = 'failed'
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CHUNK_SIZE = 256 * 1024
+
+
+class IncompleteDownload(Exception):
+    """The connection closed before the whole body arrived; the partial file is kept for a ranged retry"""
+
+
+def safe_name(value):
+    return re.sub(r'[^\w.-]+', '_', value).strip('_')
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentFetcher:
+    """Downloads project documents on its own thread pool and session, so the browsers never wait on them"""
+
+    def __init__(self, root='rera_documents', workers=4, timeout=60, max_attempts=4, rate_controller=None,
+                 metrics=None):
+        self.root = root
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.rate_controller = rate_controller or NO_RATE_LIMIT
+        self.metrics = metrics or RunMetrics()
+        for folder in ('blobs', 'partial', 'manifests'):
+            os.makedirs(os.path.join(root, folder), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, 'index.sqlite3'), check_same_thread=False,
+                                    isolation_level=None, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'})
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='documents')
+        self.outstanding = {}
+        self.url_locks = {}
+
+    def import_cookies(self, cookies):
+        """Copy the browser's cookies (WebDriver or Playwright dicts) into the download session"""
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''),
+                                     path=cookie.get('path', '/'))
+
+    def submit(self, rera_no, documents, cookies=()):
+        """Queue a project's documents for download and return at once with how many were queued"""
+        if cookies:
+            self.import_cookies(cookies)
+        with self.lock:
+            fresh = [
+                document for document in documents
+                if not self.conn.execute("SELECT 1 FROM documents WHERE rera_no = ? AND url = ? AND status = ?",
+                                         (rera_no, document['url'], DONE)).fetchone()
+            ]
+            if fresh:
+                self.outstanding[rera_no] = self.outstanding.get(rera_no, 0) + len(fresh)
+        if len(fresh) < len(documents):
+            self.metrics.increment('documents', 'already_indexed', len(documents) - len(fresh))
+        for document in fresh:
+            self.pool.submit(self.fetch, rera_no, document)
+        if fresh:
+            print(f"   📎 Queued {len(fresh)} documents for {rera_no}")
+        return len(fresh)
+
+    def fetch(self, rera_no, document):
+        """Pool task for one document; the project's manifest is rewritten after its last one"""
+        url = document['url']
+        try:
+            with self.url_slot(url):
+                self.fetch_once(rera_no, document)
+        except Exception as e:
+            print(f"   ❌ Error storing document {url}: {str(e)}")
+            self.metrics.increment('errors', 'document')
+        finally:
+            self.finish(rera_no)
+
+    @contextmanager
+    def url_slot(self, url):
+        """One download per URL at a time, since they would share the partial file; the lock is dropped with its
+        last user so the table does not grow with every URL seen"""
+        with self.lock:
+            url_lock, users = self.url_locks.get(url, (None, 0))
+            url_lock = url_lock or threading.Lock()
+            self.url_locks[url] = (url_lock, users + 1)
+        try:
+            with url_lock:
+                yield
+        finally:
+            with self.lock:
+                url_lock, users = self.url_locks[url]
+                if users == 1:
+                    del self.url_locks[url]
+                else:
+                    self.url_locks[url] = (url_lock, users - 1)
+
+    def fetch_once(self, rera_no, document):
+        """Index one document, downloading it unless its URL is already stored, with retries"""
+        url = document['url']
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT sha256, size, content_type, path FROM documents WHERE url = ? AND status = ? LIMIT 1",
+                (url, DONE)
+            ).fetchone()
+        if row and os.path.exists(os.path.join(self.root, row[3])):
+            # Another project links the same file; index it without fetching it again
+            self.metrics.increment('documents', 'deduplicated')
+            self.record(rera_no, document, DONE, *row)
+            return
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with self.metrics.stage('document_download'):
+                    stored = self.download(url)
+                self.record(rera_no, document, DONE, *stored)
+                return
+            except (requests.RequestException, IncompleteDownload) as e:
+                if attempt == self.max_attempts:
+                    print(f"   ❌ Document download failed after {attempt} attempts: {url} ({str(e)})")
+                    self.metrics.increment('documents', 'failed')
+                    self.record(rera_no, document, FAILED)
+                    return
+                self.metrics.increment('retries', 'document')
+                time.sleep(backoff_delay(attempt))
+
+    def download(self, url):
+        """Stream the URL into a partial file, resuming it with a Range request, then store it by content hash"""
+        part = os.path.join(self.root, 'partial', hashlib.sha1(url.encode('utf-8')).hexdigest() + '.part')
+        validator_file = part + '.validator'
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {}
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+            if os.path.exists(validator_file):
+                # If the file changed since the partial download, the server sends all of it again
+                with open(validator_file, encoding='utf-8') as f:
+                    headers['If-Range'] = f.read()
+
+        with self.rate_controller.slot(url) as request:
+            response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+            if response.status_code in RETRY_STATUSES:
+                request.fail()
+        with response:
+            if response.status_code == 416 and offset:
+                # Nothing left to send: the partial file already holds the whole document
+                total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                if total != str(offset):
+                    os.remove(part)
+                    raise IncompleteDownload(f"stale partial download of {url}")
+            else:
+                response.raise_for_status()
+                resumed = response.status_code == 206
+                if resumed:
+                    self.metrics.increment('documents', 'resumed')
+                else:
+                    offset = 0
+                    validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                    if validator:
+                        with open(validator_file, 'w', encoding='utf-8') as f:
+                            f.write(validator)
+                expected = response.headers.get('Content-Length')
+                received = 0
+                with open(part, 'ab' if resumed else 'wb') as f:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        received += len(chunk)
+                self.metrics.increment('document_bytes', amount=received)
+                if expected and expected.isdigit() and received < int(expected):
+                    raise IncompleteDownload(f"got {received} of {expected} bytes")
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+
+        sha256 = file_sha256(part)
+        size = os.path.getsize(part)
+        extension = os.path.splitext(urlsplit(url).path)[1].lower() or mimetypes.guess_extension(content_type) or ''
+        path = os.path.join('blobs', sha256[:2], sha256 + extension)
+        target = os.path.join(self.root, path)
+        if os.path.exists(target):
+            # Same bytes under a different URL
+            self.metrics.increment('documents', 'deduplicated')
+            os.remove(part)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(part, target)
+            self.metrics.increment('documents', 'downloaded')
+        if os.path.exists(validator_file):
+            os.remove(validator_file)
+        return sha256, size, content_type, path
+
+    def record(self, rera_no, document, status, sha256=None, size=None, content_type=None, path=None):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(rera_no, url, title, kind, status, sha256, size, content_type, path, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (rera_no, document['url'], document.get('title', ''), document.get('kind', 'other'), status,
+                 sha256, size, content_type, path, time.time())
+            )
+
+    def finish(self, rera_no):
+        """Rewrite the project's manifest once its last queued document is done"""
+        with self.lock:
+            self.outstanding[rera_no] -= 1
+            if self.outstanding[rera_no]:
+                return
+            del self.outstanding[rera_no]
+        self.write_manifest(rera_no)
+
+    def manifest(self, rera_no):
+        """Every document indexed for a RERA number"""
+        columns = ('url', 'title', 'kind', 'status', 'sha256', 'size', 'content_type', 'path', 'fetched_at')
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(columns)} FROM documents WHERE rera_no = ? ORDER BY kind, title", (rera_no,)
+            ).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def write_manifest(self, rera_no):
+        filename = os.path.join(self.root, 'manifests', safe_name(rera_no) + '.json')
+        temp_name = filename + '.tmp'
+        with open(temp_name, 'w', encoding='utf-8') as f:
+            json.dump({'rera_no': rera_no, 'documents': self.manifest(rera_no)}, f, indent=2, ensure_ascii=False)
+        os.replace(temp_name, filename)
+        return filename
+
+    def counts(self):
+        with self.lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM documents GROUP BY status").fetchall())
+
+    def close(self):
+        """Wait for the queued downloads, then release the session and the index"""
+        self.pool.shutdown(wait=True)
+        print(f"   📎 Documents in {self.root}: {self.counts()}")
+        self.session.close()
+        self.conn.close()
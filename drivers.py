@@ -0,0 +1,168 @@
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'odisha-rera-scraper')
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+
+_resolved = {}
+_resolve_lock = threading.Lock()
+_chrome_major = None
+
+
+def _manifest_path(cache_dir):
+    return os.path.join(cache_dir, 'chromedriver.json')
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(_manifest_path(cache_dir), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(cache_dir, manifest):
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = _manifest_path(cache_dir) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, _manifest_path(cache_dir))
+
+
+def _download_chromedriver(version, cache_dir):
+    """One-off webdriver-manager download into our own cache directory"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    from webdriver_manager.core.driver_cache import DriverCacheManager
+
+    manager = ChromeDriverManager(driver_version=version, cache_manager=DriverCacheManager(root_dir=cache_dir))
+    return manager.install()
+
+
+def installed_chrome_major():
+    """Major version of the Chrome on PATH ('' if unknown), read once per process"""
+    global _chrome_major
+    if _chrome_major is None:
+        try:
+            output = subprocess.run([find_chrome_binary(), '--version'], capture_output=True, text=True,
+                                    timeout=10).stdout
+            match = re.search(r'(\d+)\.\d+', output)
+            _chrome_major = match.group(1) if match else ''
+        except (OSError, subprocess.SubprocessError):
+            _chrome_major = ''
+    return _chrome_major
+
+
+def _manifest_key(version):
+    """Pinned versions are cached as given; unpinned ones per installed Chrome major, so an update re-resolves"""
+    if version:
+        return version
+    major = installed_chrome_major()
+    return f"chrome-{major}" if major else 'default'
+
+
+def resolve_chromedriver(explicit_path=None, version=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Path to a chromedriver binary, touching the network only when Chrome's major version is new to the cache"""
+    explicit_path = explicit_path or os.environ.get('CHROMEDRIVER_PATH')
+    if explicit_path:
+        return explicit_path
+
+    key = (version, cache_dir)
+    with _resolve_lock:
+        if key in _resolved:
+            return _resolved[key]
+
+        manifest = _read_manifest(cache_dir)
+        manifest_key = _manifest_key(version)
+        cached = manifest.get(manifest_key)
+        if cached and os.path.isfile(cached):
+            _resolved[key] = cached
+            return cached
+
+        try:
+            print(f"⬇️ Caching chromedriver {version or '(matching installed Chrome)'} in {cache_dir}...")
+            path = _download_chromedriver(version, cache_dir)
+        except Exception as e:
+            # Offline host with nothing cached: use a chromedriver already on PATH, or
+            # return None to let Selenium Manager find one.
+            print(f"   ⚠️ Could not download chromedriver: {str(e)}")
+            path = shutil.which('chromedriver')
+            if not path:
+                return None
+        manifest[manifest_key] = path
+        _write_manifest(cache_dir, manifest)
+        _resolved[key] = path
+        return path
+
+
+def forget_chromedriver(version=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Drop a cached chromedriver that no longer matches Chrome (it updated mid-run), so the next resolve fetches one"""
+    global _chrome_major
+    with _resolve_lock:
+        _resolved.pop((version, cache_dir), None)
+        manifest = _read_manifest(cache_dir)
+        if manifest.pop(_manifest_key(version), None):
+            _write_manifest(cache_dir, manifest)
+        _chrome_major = None
+
+
+def is_version_mismatch(error):
+    """Whether session creation failed because chromedriver and Chrome are different major versions"""
+    return 'only supports chrome version' in str(error).lower()
+
+
+def find_chrome_binary(explicit_path=None):
+    """Chrome/Chromium executable to launch warm browsers with"""
+    if explicit_path:
+        return explicit_path
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError("No Chrome or Chromium binary found on PATH")
+
+
+def debugger_ready(address, timeout=0.2):
+    """Whether something is listening on a host:port remote-debugging address"""
+    host, port = address.rsplit(':', 1)
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def launch_warm_browser(port=9222, headless=True, chrome_binary=None, user_data_dir=None, extra_args=()):
+    """Start a long-lived Chrome with remote debugging that scrapers attach to instead of launching their own"""
+    address = f"127.0.0.1:{port}"
+    if debugger_ready(address):
+        print(f"♨️ Reusing warm browser at {address}")
+        return None, address
+
+    args = [
+        find_chrome_binary(chrome_binary),
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir or tempfile.mkdtemp(prefix='rera-chrome-')}",
+        '--no-first-run', '--no-default-browser-check', '--no-sandbox',
+        '--disable-dev-shm-usage', '--disable-gpu', '--window-size=1920,1080',
+        '--disable-blink-features=AutomationControlled',
+    ]
+    if headless:
+        args.append('--headless=new')
+    args.extend(extra_args)
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 15
+    while not debugger_ready(address):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError(f"Chrome did not open its debugging port {port}")
+        time.sleep(0.05)
+    print(f"♨️ Warm browser listening at {address} (pid {process.pid})")
+    return process, address
@@ -0,0 +1,358 @@
+import re
+from datetime import datetime
+from urllib.parse import urljoin, urlsplit
+
+from lxml import etree, html
+
+NOT_AVAILABLE = 'Not Available'
+
+RERA_PATTERN = re.compile(r'(RP|PS)/\d{1,2}/\d{4}/\d{5}')
+GST_PATTERN = re.compile(r'[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[0-9]{1}[Z]{1}[0-9A-Z]{1}')
+
+# Compiled once per process; each is evaluated against a parsed page snapshot
+PROJECT_NAME_XPATH = etree.XPath(
+    "//h1 | //h2 | //h3 | //div[contains(@class, 'project-title')]"
+    " | //div[contains(@class, 'title')] | //div[contains(@class, 'name')]"
+)
+DETAILS_SECTION_XPATH = etree.XPath(
+    "//div[contains(@class, 'project-details')] | //div[contains(@class, 'container')] | //table"
+    " | //div[contains(@class, 'card-body')] | //div[contains(@class, 'details')]"
+)
+PROMOTER_SECTION_XPATH = etree.XPath(
+    "//div[contains(@class, 'promoter-details')] | //table | //div[contains(@class, 'container')]"
+    " | //div[contains(@class, 'promoter')]"
+)
+TABLE_ROWS_XPATH = etree.XPath("//tr[count(td) > 1]")
+PROMOTER_NAME_XPATH = etree.XPath(
+    "//*[contains(text(), 'Name') or contains(text(), 'Proprietor') or contains(text(), 'Individual')"
+    " or contains(text(), 'M/S')]/following-sibling::* | //*[contains(text(), 'M/S')]"
+    " | //*[contains(@class, 'promoter-name')]"
+)
+ADDRESS_XPATH = etree.XPath(
+    "//*[contains(text(), 'Address')]/following-sibling::* | //*[contains(text(), 'Address')]/..//*"
+    " | //*[contains(@class, 'address')]"
+)
+
+# Listing card rules, mirroring EnhancedOdishaRERAProjectScraper.extract_card_info
+LISTING_CARD_XPATH = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' project-card ')]")
+CARD_NAME_XPATH = etree.XPath(
+    ".//h1 | .//h2 | .//h3 | .//h4 | .//h5 | .//div[contains(concat(' ', normalize-space(@class), ' '), ' card-title ')]"
+    " | .//div[contains(@class, 'title')] | .//div[contains(@class, 'name')]"
+)
+CARD_PROMOTER_XPATH = etree.XPath(
+    ".//*[contains(text(), 'by ') or contains(text(), 'Promoter') or contains(text(), 'Developer')]"
+    " | .//*[contains(@class, 'promoter')]"
+)
+CARD_DETAILS_LINK_XPATH = etree.XPath(
+    ".//a[contains(text(), 'View Details') or contains(text(), 'Details') or contains(@class, 'view-details')"
+    " or contains(@href, 'details')]"
+)
+CARD_STATUS_PATTERN = re.compile(r'Status\s*:?\s*([^\n]+)')
+DETAIL_LINK_ATTRIBUTES = ('href', 'ng-reflect-router-link', 'routerlink')
+
+# Label/value pairs however the tab lays them out: table rows, definition lists, or a label and its sibling
+LABELLED_VALUE_XPATH = etree.XPath("//tr[count(td) > 1] | //tr[th and td] | //dt | //label")
+
+# Further detail-page fields, declared instead of hand-coded. Each is read from one tab's snapshot: the value
+# of the first row whose label mentions one of `labels`, else the first match of `selector`, else (when only a
+# regex is given) the tab's whole text. `regex` then narrows the value (to its first group, if it has one) and
+# `post` names the normalizer from POST_PROCESSORS. `api_keys` are the JSON keys the fast path reads instead.
+# A new field is one entry here plus its column in records.RECORD_FIELDS.
+FIELD_SPEC = {
+    'Project Type': {
+        'tab': 'project', 'labels': ('Project Type', 'Type of Project'), 'post': 'title',
+        'api_keys': ('projectType', 'project_type', 'typeOfProject'),
+    },
+    'Project Status': {
+        'tab': 'project', 'labels': ('Project Status', 'Status of Project', 'Current Status'), 'post': 'title',
+        'api_keys': ('projectStatus', 'project_status'),
+    },
+    'District': {
+        'tab': 'project', 'labels': ('District',), 'post': 'title',
+        'api_keys': ('district', 'districtName'),
+    },
+    'Land Area': {
+        'tab': 'project', 'labels': ('Land Area', 'Total Area of Land', 'Plot Area'),
+        'regex': r'\d[\d,]*(?:\.\d+)?\s*(?:sq\.?\s*(?:mtrs?|meters?|metres?|m|ft|feet)\b|acres?\b|hectares?\b|decimals?\b)?',
+        'post': 'text', 'api_keys': ('landArea', 'totalLandArea', 'plotArea'),
+    },
+    'Completion Date': {
+        'tab': 'project', 'labels': ('Completion Date', 'Date of Completion'),
+        'regex': r'\d{1,2}[-/.]\d{1,2}[-/.]\d{4}|\d{1,2}[- ][A-Za-z]{3,9}[- ]\d{4}|\d{4}-\d{2}-\d{2}',
+        'post': 'date', 'api_keys': ('completionDate', 'proposedCompletionDate', 'dateOfCompletion'),
+    },
+    'Total Units': {
+        'tab': 'project', 'labels': ('Total Units', 'Number of Units', 'No. of Units', 'No. of Apartments'),
+        'regex': r'\d[\d,]*', 'post': 'integer', 'api_keys': ('totalUnits', 'noOfUnits', 'numberOfUnits'),
+    },
+    'Bank Account': {
+        'tab': 'project', 'labels': ('Bank Account', 'Account No', 'Account Number', 'A/C No'),
+        'regex': r'\d[\dX*]{8,19}', 'post': 'text', 'api_keys': ('bankAccountNo', 'accountNo', 'accountNumber'),
+    },
+}
+# Links to registration certificates, approved plans, progress reports and other uploaded documents
+DOCUMENT_LINK_XPATH = etree.XPath(
+    "//a[@href][contains(translate(@href, 'PDFOCXJGN', 'pdfocxjgn'), '.pdf') or contains(@href, '.doc')"
+    " or contains(@href, '.jpg') or contains(@href, '.png') or contains(@href, 'download')"
+    " or contains(@href, 'document') or contains(@href, 'uploads') or @download]"
+)
+DOCUMENT_KINDS = [
+    ('registration_certificate', ('registration certificate', 'rera certificate', 'certificate of registration')),
+    ('approved_plan', ('approved plan', 'building plan', 'layout plan', 'sanction', 'site plan', 'floor plan')),
+    ('progress_report', ('quarterly', 'progress report', 'qpr')),
+    ('completion_certificate', ('completion certificate', 'occupancy')),
+]
+DATE_FORMATS = ('%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y', '%d %b %Y', '%d-%b-%Y', '%d %B %Y', '%d-%B-%Y', '%Y-%m-%d')
+
+
+def element_text(element):
+    """Whitespace-collapsed text of an element, like WebElement.text"""
+    return ' '.join(''.join(element.itertext()).split())
+
+
+def parse_page(page_source):
+    """Parse a page_source snapshot into an lxml tree"""
+    return html.fromstring(page_source) if page_source and page_source.strip() else None
+
+
+def table_value(tree, *labels):
+    """Second cell of the first label/value row whose label mentions any of the labels"""
+    for row in TABLE_ROWS_XPATH(tree):
+        cells = row.findall('td')
+        label = element_text(cells[0])
+        if any(key in label for key in labels):
+            value = element_text(cells[1])
+            if value:
+                return value
+    return ''
+
+
+def first_text(elements, accept=lambda text: bool(text)):
+    for element in elements:
+        text = element_text(element)
+        if accept(text):
+            return text
+    return ''
+
+
+def iso_date(value):
+    """Dates in the portal's usual spellings as YYYY-MM-DD; anything unrecognized is kept as it is"""
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return value
+
+
+POST_PROCESSORS = {
+    'text': lambda value: value.strip(' :-'),
+    'title': lambda value: value.strip(' :-').title(),
+    'integer': lambda value: re.sub(r'\D', '', value),
+    'date': iso_date,
+}
+
+
+class FieldRule:
+    """One FIELD_SPEC entry, compiled once per process"""
+
+    def __init__(self, name, tab, labels=(), selector=None, regex=None, post='text', api_keys=()):
+        self.name = name
+        self.tab = tab
+        self.labels = [label.casefold() for label in labels]
+        self.selector = etree.XPath(selector) if selector else None
+        self.regex = re.compile(regex, re.IGNORECASE) if regex else None
+        self.post = POST_PROCESSORS[post]
+        self.api_keys = api_keys
+
+    def clean(self, value):
+        """Narrow a raw value with the regex and normalize it; '' if nothing usable is left"""
+        value = ' '.join(str(value or '').split())
+        if value and self.regex:
+            match = self.regex.search(value)
+            value = match.group(1 if self.regex.groups else 0) if match else ''
+        return self.post(value) if value else ''
+
+    def extract(self, snapshot):
+        value = snapshot.labelled_value(self.labels) if self.labels else ''
+        if not value and self.selector is not None and snapshot.tree is not None:
+            value = first_text(self.selector(snapshot.tree))
+        if not value and self.regex and not self.labels and self.selector is None:
+            value = snapshot.text
+        return self.clean(value)
+
+
+FIELD_RULES = [FieldRule(name, **rule) for name, rule in FIELD_SPEC.items()]
+
+
+class TabSnapshot:
+    """One tab's page_source, parsed once and scanned for label/value pairs once, however many fields read it"""
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+        self.tree = parse_page(page_source)
+        self._pairs = None
+        self._text = None
+
+    @property
+    def pairs(self):
+        """(casefolded label, value) for every labelled value, in document order"""
+        if self._pairs is None:
+            self._pairs = []
+            for element in LABELLED_VALUE_XPATH(self.tree) if self.tree is not None else []:
+                if element.tag == 'tr':
+                    cells = element.xpath('th | td')
+                    label, value = cells[0], cells[1]
+                else:
+                    label, value = element, element.getnext()
+                if value is not None:
+                    self._pairs.append((element_text(label).casefold(), element_text(value)))
+        return self._pairs
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = element_text(self.tree) if self.tree is not None else ''
+        return self._text
+
+    def labelled_value(self, labels):
+        """Value of the first pair whose label mentions any of the (casefolded) labels"""
+        for label, value in self.pairs:
+            if value and any(key in label for key in labels):
+                return value
+        return ''
+
+    def fields(self, tab):
+        """Every FIELD_SPEC field that lives on this tab"""
+        return {rule.name: rule.extract(self) or NOT_AVAILABLE for rule in FIELD_RULES if rule.tab == tab}
+
+
+def parse_project_tab(page_source):
+    """Project name, RERA number and the project tab's FIELD_SPEC fields from the project tab snapshot"""
+    snapshot = TabSnapshot(page_source)
+    details = {'RERA Regd. No': NOT_AVAILABLE, 'Project Name': NOT_AVAILABLE}
+    details.update(snapshot.fields('project'))
+    tree = snapshot.tree
+    if tree is None:
+        return details
+
+    name = first_text(PROJECT_NAME_XPATH(tree))
+    if name:
+        details['Project Name'] = name
+
+    match = RERA_PATTERN.search(page_source)
+    if not match:
+        match = RERA_PATTERN.search(first_text(DETAILS_SECTION_XPATH(tree)))
+    if match:
+        details['RERA Regd. No'] = match.group(0)
+    return details
+
+
+def parse_promoter_tab(page_source):
+    """Promoter name, address, GST number and the promoter tab's FIELD_SPEC fields from the promoter tab snapshot"""
+    snapshot = TabSnapshot(page_source)
+    details = {'Promoter Name': NOT_AVAILABLE, 'Promoter Address': NOT_AVAILABLE, 'GST No': NOT_AVAILABLE}
+    details.update(snapshot.fields('promoter'))
+    tree = snapshot.tree
+    if tree is None:
+        return details
+
+    name = table_value(tree, 'Name', 'Proprietor') or first_text(
+        PROMOTER_NAME_XPATH(tree), lambda text: len(text) > 3 and 'Name' not in text
+    )
+    if name:
+        details['Promoter Name'] = name
+
+    address = table_value(tree, 'Address')
+    if len(address) <= 10:
+        address = first_text(ADDRESS_XPATH(tree), lambda text: len(text) > 10 and 'Address' not in text)
+    if address:
+        details['Promoter Address'] = address
+
+    match = GST_PATTERN.search(first_text(PROMOTER_SECTION_XPATH(tree)))
+    if not match:
+        match = GST_PATTERN.search(table_value(tree, 'GST', 'Tax'))
+    if not match:
+        match = GST_PATTERN.search(page_source)
+    if match:
+        details['GST No'] = match.group(0)
+    return details
+
+
+def extract_details(project_source, promoter_source):
+    """All detail-page fields from the two tab snapshots"""
+    details = parse_project_tab(project_source)
+    details.update(parse_promoter_tab(promoter_source))
+    return details
+
+
+def document_kind(text):
+    """Coarse document category from a link's text, title and URL"""
+    text = text.casefold()
+    for kind, keywords in DOCUMENT_KINDS:
+        if any(keyword in text for keyword in keywords):
+            return kind
+    return 'other'
+
+
+def parse_document_links(page_source, base_url):
+    """Absolute URL, title and kind of every document linked from a detail tab snapshot"""
+    tree = parse_page(page_source)
+    if tree is None:
+        return []
+    documents = {}
+    for link in DOCUMENT_LINK_XPATH(tree):
+        url = urljoin(base_url + '/', link.get('href').strip())
+        if urlsplit(url).scheme not in ('http', 'https') or url in documents:
+            continue
+        # The link text is often just "View"; the row it sits in usually names the document
+        link_text = element_text(link)
+        row = next(link.iterancestors('tr', 'li'), None)
+        row_text = ' '.join(text.strip() for text in row.itertext() if text.strip()) if row is not None else ''
+        title = row_text.replace(link_text, '').strip() or link_text or link.get('title', '')
+        documents[url] = {'url': url, 'title': title, 'kind': document_kind(f"{title} {link.get('title', '')} {url}")}
+    return list(documents.values())
+
+
+def collect_document_links(page_sources, base_url):
+    """Document links across a project's tab snapshots, each URL once"""
+    documents = {}
+    for page_source in page_sources.values():
+        for document in parse_document_links(page_source, base_url):
+            documents.setdefault(document['url'], document)
+    return list(documents.values())
+
+
+def card_lines(card):
+    """Card text with one line per text node, close to how the browser renders it"""
+    return '\n'.join(text.strip() for text in card.itertext() if text.strip())
+
+
+def parse_listing_cards(page_source, base_url):
+    """Project stubs for every card in a listing page snapshot"""
+    tree = parse_page(page_source)
+    if tree is None:
+        return []
+    stubs = []
+    for card in LISTING_CARD_XPATH(tree):
+        text = card_lines(card)
+        names = CARD_NAME_XPATH(card)
+        promoters = CARD_PROMOTER_XPATH(card)
+        rera_match = RERA_PATTERN.search(text)
+        status_match = CARD_STATUS_PATTERN.search(text)
+        detail_url = ''
+        for link in CARD_DETAILS_LINK_XPATH(card)[:1]:
+            for attribute in DETAIL_LINK_ATTRIBUTES:
+                target = link.get(attribute)
+                if target and not target.startswith(('javascript:', '#')):
+                    detail_url = urljoin(base_url + '/', target)
+                    break
+        stubs.append({
+            'project_name': element_text(names[0]) if names else '',
+            'rera_no': rera_match.group(0) if rera_match else '',
+            'promoter_name': element_text(promoters[0]).replace('by ', '').strip() if promoters else '',
+            'project_status': status_match.group(1).strip() if status_match else '',
+            'detail_url': detail_url,
+            'search_text': text,
+        })
+    return stubs
@@ -0,0 +1,218 @@
+import json
+import os
+import time
+from urllib.parse import quote, urlencode, urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from records import empty_record
+from metrics import RunMetrics
+from ratelimit import NO_RATE_LIMIT, backoff_delay
+from supervisor import hang_clock_paused
+from extractors import RERA_PATTERN, GST_PATTERN, FIELD_RULES
+
+# The portal's Angular app fills the listing and the Promoter Details tab from
+# these JSON endpoints. Check them against the browser's network tab and
+# override with --api-base / the *_ENDPOINT attributes if the portal changes.
+DEFAULT_API_BASE = "https://rera.odisha.gov.in/api/"
+LISTING_ENDPOINT = "projects/project-list"
+PROJECT_ENDPOINT = "projects/project-details/{project_id}"
+PROMOTER_ENDPOINT = "projects/promoter-details/{project_id}"
+DETAIL_PAGE_URL = "https://rera.odisha.gov.in/projects/project-details/{project_id}"
+
+# Responses that mean the portal is overloaded rather than that the request was wrong
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Candidate JSON keys for each field, compared case-insensitively
+PROJECT_ID_KEYS = ('projectId', 'project_id', 'encProjectId', 'id')
+PROJECT_NAME_KEYS = ('projectName', 'project_name')
+RERA_NO_KEYS = ('reraRegdNo', 'regdNo', 'registrationNo', 'rera_no', 'regNo')
+PROMOTER_ID_KEYS = ('promoterId', 'promoter_id', 'encPromoterId')
+PROMOTER_NAME_KEYS = ('promoterName', 'promoter_name', 'companyName', 'name')
+PROMOTER_ADDRESS_KEYS = ('promoterAddress', 'registeredAddress', 'officeAddress', 'address')
+GST_KEYS = ('gstNo', 'gstin', 'gst_no', 'gstNumber')
+PROJECT_STATUS_KEYS = ('projectStatus', 'project_status', 'status')
+
+
+def unwrap(payload):
+    """Strip the usual {"data": ...} / {"result": ...} envelopes"""
+    while isinstance(payload, dict):
+        for key in ('data', 'result', 'results', 'items'):
+            if key in payload and isinstance(payload[key], (dict, list)):
+                payload = payload[key]
+                break
+        else:
+            return payload
+    return payload
+
+
+def find_value(payload, keys):
+    """Breadth-first search for the first non-empty scalar under any of the keys"""
+    wanted = [key.lower() for key in keys]
+    stack = [payload]
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, dict):
+            lowered = {str(key).lower(): value for key, value in node.items()}
+            for key in wanted:
+                value = lowered.get(key)
+                if value not in (None, '') and not isinstance(value, (dict, list)):
+                    return str(value).strip()
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(node)
+    return ''
+
+
+def find_pattern(payload, pattern):
+    """Search the serialized payload for a regex, for fields stored under unexpected keys"""
+    match = pattern.search(json.dumps(payload, ensure_ascii=False))
+    return match.group(0) if match else ''
+
+
+def parse_listing_item(item):
+    """Turn one listing entry into a project stub"""
+    project_id = find_value(item, PROJECT_ID_KEYS)
+    return {
+        'project_id': project_id,
+        'project_name': find_value(item, PROJECT_NAME_KEYS),
+        'rera_no': find_value(item, RERA_NO_KEYS) or find_pattern(item, RERA_PATTERN),
+        'promoter_name': find_value(item, PROMOTER_NAME_KEYS),
+        'promoter_id': find_value(item, PROMOTER_ID_KEYS),
+        'project_status': find_value(item, PROJECT_STATUS_KEYS),
+        'detail_url': DETAIL_PAGE_URL.format(project_id=project_id) if project_id else '',
+        'search_text': ' '.join(str(value) for value in item.values() if not isinstance(value, (dict, list))),
+    }
+
+
+def parse_project_record(project, promoter, detail_url=''):
+    """Map the project and promoter payloads onto the output record"""
+    record = empty_record(detail_url)
+    record['Project Name'] = find_value(project, PROJECT_NAME_KEYS)
+    record['RERA Regd. No'] = find_value(project, RERA_NO_KEYS) or find_pattern(project, RERA_PATTERN)
+    record['Promoter Name'] = find_value(promoter, PROMOTER_NAME_KEYS)
+    record['Promoter Address'] = find_value(promoter, PROMOTER_ADDRESS_KEYS)
+    record['GST No'] = find_value(promoter, GST_KEYS) or find_pattern(promoter, GST_PATTERN)
+    for rule in FIELD_RULES:
+        payload = promoter if rule.tab == 'promoter' else project
+        record[rule.name] = rule.clean(find_value(payload, rule.api_keys))
+    return record
+
+
+def project_id_from_url(url):
+    """The encrypted project id is the last path segment of the detail URL"""
+    return url.rstrip('/').rsplit('/', 1)[-1] if url else ''
+
+
+def fixture_name(endpoint, params=None):
+    """File name a response is recorded under, shared with fixture_server"""
+    key = endpoint.lstrip('/')
+    if params:
+        key += '?' + urlencode(sorted(params.items()))
+    return quote(key, safe='') + '.json'
+
+
+class RERAApiClient:
+    """Pooled keep-alive HTTP client for the portal's JSON endpoints"""
+
+    def __init__(self, api_base=DEFAULT_API_BASE, timeout=15, pool_size=8, record_dir=None, metrics=None,
+                 rate_controller=None, max_attempts=4):
+        self.api_base = api_base if api_base.endswith('/') else api_base + '/'
+        self.timeout = timeout
+        self.record_dir = record_dir
+        self.metrics = metrics or RunMetrics()
+        self.rate_controller = rate_controller or NO_RATE_LIMIT
+        self.max_attempts = max_attempts
+        self.last_response_text = ''
+        self.last_payloads = {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json, text/plain, */*',
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Referer': 'https://rera.odisha.gov.in/projects/project-list',
+        })
+
+    def get(self, url, params=None):
+        """GET through the rate controller, retrying overload responses with jittered exponential backoff"""
+        for attempt in range(1, self.max_attempts + 1):
+            retry_after = None
+            with self.rate_controller.slot(url, waiting=hang_clock_paused) as request:
+                try:
+                    with self.metrics.stage('api_request'):
+                        response = self.session.get(url, params=params, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout):
+                    request.fail()
+                    self.metrics.increment('errors', 'api')
+                    if attempt == self.max_attempts:
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUSES:
+                        return response
+                    request.fail()
+                    self.metrics.increment('errors', 'api')
+                    if attempt == self.max_attempts:
+                        return response
+                    retry_after = response.headers.get('Retry-After')
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else backoff_delay(attempt)
+            self.metrics.increment('retries', 'api')
+            with hang_clock_paused():
+                time.sleep(delay)
+
+    def get_json(self, endpoint, params=None):
+        """GET an endpoint and decode its JSON, recording the response if asked to"""
+        response = self.get(urljoin(self.api_base, endpoint), params)
+        response.raise_for_status()
+        self.last_response_text = response.text
+        payload = response.json()
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+            with open(os.path.join(self.record_dir, fixture_name(endpoint, params)), 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+        return payload
+
+    def fetch_listing(self, page=1):
+        """Project stubs from one listing page"""
+        items = unwrap(self.get_json(LISTING_ENDPOINT, {'page': page}))
+        if not isinstance(items, list):
+            return []
+        return [parse_listing_item(item) for item in items]
+
+    def iter_listing(self, start_page=1, previous_ids=None):
+        """Yield each listing page's stubs until the endpoint returns an empty page"""
+        page = start_page
+        while True:
+            stubs = self.fetch_listing(page)
+            page_ids = [stub['project_id'] for stub in stubs]
+            # Some APIs ignore an out-of-range page and return the last one again
+            if not stubs or page_ids == previous_ids:
+                return
+            print(f"   ⚡ Fast path: listing page {page} ({len(stubs)} projects)")
+            yield stubs
+            previous_ids = page_ids
+            page += 1
+
+    def fetch_project(self, project_id, detail_url='', cached_promoter=None):
+        """Full output record for one project from its project and promoter endpoints, skipping the promoter
+        endpoint when its fields come from the promoter cache"""
+        project = unwrap(self.get_json(PROJECT_ENDPOINT.format(project_id=project_id)))
+        self.last_payloads = {'api-project': self.last_response_text}
+        promoter = {}
+        if not cached_promoter:
+            promoter = unwrap(self.get_json(PROMOTER_ENDPOINT.format(project_id=project_id)))
+            self.last_payloads['api-promoter'] = self.last_response_text
+        record = parse_project_record(project, promoter, detail_url or DETAIL_PAGE_URL.format(project_id=project_id))
+        if cached_promoter:
+            record.update(cached_promoter)
+        return record
+
+    def clone(self):
+        """A client with the same settings and its own session, for another worker thread"""
+        return RERAApiClient(self.api_base, timeout=self.timeout, record_dir=self.record_dir, metrics=self.metrics,
+                             rate_controller=self.rate_controller, max_attempts=self.max_attempts)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from fastpath import fixture_name
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Replay recorded JSON responses keyed by request path and query"""
+
+    fixture_dir = '.'
+    prefix = '/api/'
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        endpoint = unquote(parts.path)
+        if endpoint.startswith(self.prefix):
+            endpoint = endpoint[len(self.prefix):]
+        params = dict(parse_qsl(parts.query))
+        path = os.path.join(self.fixture_dir, fixture_name(endpoint, params))
+        if not os.path.isfile(path):
+            self.send_error(404, f"No fixture for {self.path}")
+            return
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(fixture_dir, host='127.0.0.1', port=0):
+    """Start a replay server in a background thread; its API base is http://host:port/api/"""
+    handler = type('BoundFixtureHandler', (FixtureHandler,), {'fixture_dir': fixture_dir})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded Odisha RERA API responses")
+    parser.add_argument('fixture_dir', help="Directory written by scrap.py --record-fixtures")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    server = serve_fixtures(args.fixture_dir, port=args.port)
+    print(f"📼 Replaying {args.fixture_dir} at http://127.0.0.1:{server.server_address[1]}/api/")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
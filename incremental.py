@@ -0,0 +1,158 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from records import stub_key, has_detail_fields
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    card TEXT NOT NULL,
+    record TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_scraped REAL
+);
+CREATE INDEX IF NOT EXISTS snapshot_last_seen ON snapshot (last_seen);
+"""
+
+# Listing card fields whose change means the detail page must be scraped again
+FINGERPRINT_FIELDS = ('project_name', 'promoter_name', 'project_status')
+
+
+def normalize(value):
+    return ' '.join(str(value or '').split()).casefold()
+
+
+def card_fingerprint(stub):
+    """Hash of the listing card fields that signal a changed registration"""
+    values = [normalize(stub.get(field)) for field in FINGERPRINT_FIELDS]
+    return hashlib.sha1(json.dumps(values).encode('utf-8')).hexdigest()
+
+
+class SnapshotStore:
+    """Last known listing card and record for every project, keyed by RERA registration number"""
+
+    def __init__(self, path='rera_snapshot.sqlite3'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self.run_started = time.time()
+
+    def classify(self, stub):
+        """Mark the project as seen in this run and return (status, previous card)"""
+        key = stub_key(stub)
+        fingerprint = card_fingerprint(stub)
+        card = json.dumps({field: stub.get(field, '') for field in FINGERPRINT_FIELDS}, ensure_ascii=False)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT fingerprint, card, record FROM snapshot WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.conn.execute(
+                    "INSERT INTO snapshot (key, seq, fingerprint, card, first_seen, last_seen) "
+                    "VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM snapshot), ?, ?, ?, ?)",
+                    (key, fingerprint, card, self.run_started, self.run_started)
+                )
+                return 'new', None
+            self.conn.execute("UPDATE snapshot SET last_seen = ? WHERE key = ?", (self.run_started, key))
+
+        previous_fingerprint, previous_card, record = row
+        if previous_fingerprint != fingerprint:
+            return 'changed', json.loads(previous_card)
+        if record is None:
+            # Seen before but its detail page was never scraped successfully
+            return 'new', None
+        return 'unchanged', None
+
+    def update(self, stub, record):
+        """Store the fresh card fingerprint and record after a detail scrape that reached the detail page"""
+        if not has_detail_fields(record):
+            # Leave the row as it was, so the next run classifies the project as new or changed again
+            return False
+        card = json.dumps({field: stub.get(field, '') for field in FINGERPRINT_FIELDS}, ensure_ascii=False)
+        with self.lock:
+            self.conn.execute(
+                "UPDATE snapshot SET fingerprint = ?, card = ?, record = ?, last_scraped = ? WHERE key = ?",
+                (card_fingerprint(stub), card, json.dumps(record, ensure_ascii=False), time.time(), stub_key(stub))
+            )
+        return True
+
+    def records_seen(self):
+        """Records of every project listed in this run, in first-seen order"""
+        rows = self.conn.execute(
+            "SELECT record FROM snapshot WHERE last_seen = ? AND record IS NOT NULL ORDER BY seq",
+            (self.run_started,)
+        )
+        for (record,) in rows:
+            yield json.loads(record)
+
+    def keys_not_seen(self):
+        """Projects in the snapshot that this run's listing no longer shows"""
+        rows = self.conn.execute("SELECT key FROM snapshot WHERE last_seen < ? ORDER BY seq", (self.run_started,))
+        return [key for (key,) in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+class IncrementalRefresh:
+    """Pass only new or changed projects on to detail extraction and build a change-set report"""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.new = []
+        self.changed = []
+        self.unchanged = 0
+
+    def filter_stubs(self, stubs):
+        """Yield stubs whose listing card is new or differs from the last snapshot"""
+        for stub in stubs:
+            status, previous_card = self.snapshot.classify(stub)
+            key = stub_key(stub)
+            if status == 'unchanged':
+                self.unchanged += 1
+                continue
+            if status == 'new':
+                self.new.append(key)
+            else:
+                self.changed.append({
+                    'rera_no': key,
+                    'fields': {
+                        field: [previous_card.get(field, ''), stub.get(field, '')]
+                        for field in FINGERPRINT_FIELDS
+                        if normalize(previous_card.get(field)) != normalize(stub.get(field))
+                    },
+                })
+            yield stub
+
+    def record_results(self, results):
+        """Save each freshly scraped (stub, record) pair into the snapshot"""
+        for stub, record in results:
+            self.snapshot.update(stub, record)
+            yield stub, record
+
+    def report(self, full_listing):
+        """Change-set since the previous snapshot; removals only make sense after a full listing walk"""
+        return {
+            'generated_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'new': self.new,
+            'changed': self.changed,
+            'unchanged': self.unchanged,
+            'removed': self.snapshot.keys_not_seen() if full_listing else [],
+        }
+
+    def save_report(self, filename, full_listing):
+        report = self.report(full_listing)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n🔄 Incremental refresh: {len(report['new'])} new, {len(report['changed'])} changed, "
+              f"{report['unchanged']} unchanged, {len(report['removed'])} removed")
+        print(f"   📄 {filename}")
+        return report
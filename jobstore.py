@@ -0,0 +1,125 @@
+import json
+import sqlite3
+import threading
+import time
+
+from records import stub_key, has_detail_fields
+
+PENDING = 'pending'
+IN_PROGRESS = 'in_progress'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    stub TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    record TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_status ON projects (status);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class JobStore:
+    """SQLite (WAL) checkpoint of every project's stub, status, attempts and extracted record"""
+
+    def __init__(self, path='rera_jobs.sqlite3'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        # Anything still in progress was interrupted by a crash; run it again
+        self.conn.execute("UPDATE projects SET status = ? WHERE status = ?", (PENDING, IN_PROGRESS))
+
+    def get_meta(self, name, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, name, value):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def add_stub(self, stub):
+        """Register a project (no-op if already known) and return its key and current status"""
+        key = stub_key(stub)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO projects (key, seq, stub, updated_at) "
+                "VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM projects), ?, ?)",
+                (key, json.dumps(stub, ensure_ascii=False), time.time())
+            )
+            row = self.conn.execute("SELECT status, attempts FROM projects WHERE key = ?", (key,)).fetchone()
+        return key, row[0], row[1]
+
+    def mark_in_progress(self, key):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE projects SET status = ?, attempts = attempts + 1, updated_at = ? WHERE key = ?",
+                (IN_PROGRESS, time.time(), key)
+            )
+
+    def mark_result(self, key, record, error=None):
+        """Store the record as done, or as failed if the detail page gave nothing"""
+        status = DONE if error is None and has_detail_fields(record) else FAILED
+        with self.lock:
+            self.conn.execute(
+                "UPDATE projects SET status = ?, record = ?, error = ?, updated_at = ? WHERE key = ?",
+                (status, json.dumps(record, ensure_ascii=False), error, time.time(), key)
+            )
+        return status
+
+    def pending_stubs(self, max_attempts=3):
+        """Stubs that still need a (re)try, in listing order"""
+        rows = self.conn.execute(
+            "SELECT stub FROM projects WHERE status IN (?, ?) AND attempts < ? ORDER BY seq",
+            (PENDING, FAILED, max_attempts)
+        )
+        for (stub,) in rows.fetchall():
+            yield json.loads(stub)
+
+    def records(self):
+        """Every stored record in listing order"""
+        rows = self.conn.execute("SELECT record FROM projects WHERE record IS NOT NULL ORDER BY seq")
+        for (record,) in rows:
+            yield json.loads(record)
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM projects GROUP BY status").fetchall())
+
+    def reset(self):
+        """Forget every project so the next run starts from scratch"""
+        with self.lock:
+            self.conn.execute("DELETE FROM projects")
+            self.conn.execute("DELETE FROM meta")
+
+    def close(self):
+        self.conn.close()
+
+
+def checkpoint_stubs(stubs, store, max_attempts=3):
+    """Register stubs as they stream past, passing on only those not yet done"""
+    for stub in stubs:
+        key, status, attempts = store.add_stub(stub)
+        if status == DONE or attempts >= max_attempts:
+            continue
+        store.mark_in_progress(key)
+        yield stub
+    store.set_meta('listing_complete', '1')
+
+
+def checkpoint_results(results, store):
+    """Persist each (stub, record) pair the moment it is produced"""
+    for stub, record in results:
+        store.mark_result(stub_key(stub), record)
+        yield stub, record
@@ -0,0 +1,209 @@
+import json
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from records import RECORD_FIELDS
+
+# Fields whose extraction hit rate is reported ('Project URL' is always set)
+TRACKED_FIELDS = [field for field in RECORD_FIELDS if field != 'Project URL']
+PROMETHEUS_PREFIX = 'rera_scraper'
+# Timing samples kept per stage for percentiles; count, total and max stay exact however long the run
+RESERVOIR_SIZE = 2048
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def field_found(value):
+    return bool(value) and value != 'Not Available'
+
+
+class StageTimings:
+    """Exact count, total and max of a stage's durations, plus a fixed-size uniform sample for percentiles"""
+
+    def __init__(self, rng, size=RESERVOIR_SIZE):
+        self.rng = rng
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:
+            # Reservoir sampling: every duration so far is equally likely to be in the sample
+            index = self.rng.randrange(self.count)
+            if index < self.size:
+                self.samples[index] = seconds
+
+
+class RunMetrics:
+    """Thread-safe stage timers, event counters and per-field hit rates for one run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.rng = random.Random()
+        self.counters = {}
+        self.projects = 0
+        self.fields_found = {field: 0 for field in TRACKED_FIELDS}
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block under a stage name (stages may nest, so their totals overlap)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def observe(self, name, seconds):
+        with self.lock:
+            timings = self.durations.get(name)
+            if timings is None:
+                timings = self.durations[name] = StageTimings(self.rng)
+            timings.add(seconds)
+
+    def increment(self, event, stage='', amount=1):
+        """Count an event such as a timeout, retry or stale element, optionally per stage"""
+        with self.lock:
+            key = (event, stage)
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def add_record(self, record):
+        """Count which fields a finished record has real values for"""
+        with self.lock:
+            self.projects += 1
+            for field in TRACKED_FIELDS:
+                if field_found(record.get(field)):
+                    self.fields_found[field] += 1
+
+    def track(self, records):
+        for record in records:
+            self.add_record(record)
+            yield record
+
+    def stage_summary(self):
+        """Count, total, mean, p50, p95 and max seconds per stage"""
+        with self.lock:
+            stages = {
+                name: (timings.count, timings.total, timings.max, sorted(timings.samples))
+                for name, timings in self.durations.items()
+            }
+        return {
+            name: {
+                'count': count,
+                'total_s': round(total, 3),
+                'mean_s': round(total / count, 3),
+                'p50_s': round(percentile(samples, 0.50), 3),
+                'p95_s': round(percentile(samples, 0.95), 3),
+                'max_s': round(longest, 3),
+            }
+            for name, (count, total, longest, samples) in sorted(stages.items())
+        }
+
+    def as_dict(self):
+        """Everything measured so far, in the layout of the JSON metrics file"""
+        wall_s = time.perf_counter() - self.started
+        with self.lock:
+            counters = {}
+            for (event, stage), value in sorted(self.counters.items()):
+                counters.setdefault(event, {})[stage or 'total'] = value
+            fields = {
+                field: {
+                    'found': found,
+                    'missing': self.projects - found,
+                    'hit_rate': round(found / self.projects, 3) if self.projects else 0.0,
+                }
+                for field, found in self.fields_found.items()
+            }
+            projects = self.projects
+        return {
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'wall_s': round(wall_s, 3),
+            'projects': projects,
+            'projects_per_min': round(projects / wall_s * 60, 2) if wall_s else 0.0,
+            'stages': self.stage_summary(),
+            'counters': counters,
+            'fields': fields,
+        }
+
+    def write_json(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
+        return filename
+
+    def prometheus_lines(self):
+        """Metrics in the Prometheus text exposition format"""
+        report = self.as_dict()
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {p}_run_wall_seconds Wall-clock duration of the run",
+            f"# TYPE {p}_run_wall_seconds gauge",
+            f"{p}_run_wall_seconds {report['wall_s']}",
+            f"# HELP {p}_run_started_timestamp_seconds Unix time the run started",
+            f"# TYPE {p}_run_started_timestamp_seconds gauge",
+            f"{p}_run_started_timestamp_seconds {int(self.started_at)}",
+            f"# HELP {p}_projects Projects processed in the run",
+            f"# TYPE {p}_projects gauge",
+            f"{p}_projects {report['projects']}",
+            f"# HELP {p}_stage_seconds Time spent per scraping stage",
+            f"# TYPE {p}_stage_seconds summary",
+        ]
+        for name, stats in report['stages'].items():
+            lines.append(f'{p}_stage_seconds{{stage="{name}",quantile="0.5"}} {stats["p50_s"]}')
+            lines.append(f'{p}_stage_seconds{{stage="{name}",quantile="0.95"}} {stats["p95_s"]}')
+            lines.append(f'{p}_stage_seconds_sum{{stage="{name}"}} {stats["total_s"]}')
+            lines.append(f'{p}_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+        lines += [
+            f"# HELP {p}_events Retries, timeouts, stale elements, errors and fallbacks during the run",
+            f"# TYPE {p}_events gauge",
+        ]
+        for event, stages in report['counters'].items():
+            for stage, value in stages.items():
+                lines.append(f'{p}_events{{event="{event}",stage="{stage}"}} {value}')
+        lines += [
+            f"# HELP {p}_field_found Projects whose field was extracted (not 'Not Available')",
+            f"# TYPE {p}_field_found gauge",
+        ]
+        for field, stats in report['fields'].items():
+            lines.append(f'{p}_field_found{{field="{field}"}} {stats["found"]}')
+        return lines
+
+    def write_prometheus(self, filename):
+        """Write a node_exporter textfile atomically so a scrape never sees half a file"""
+        tmp_path = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.prometheus_lines()) + '\n')
+        os.replace(tmp_path, filename)
+        return filename
+
+    def print_summary(self, top=8):
+        """Slowest stages by total time and the field hit rates"""
+        report = self.as_dict()
+        stages = sorted(report['stages'].items(), key=lambda item: item[1]['total_s'], reverse=True)[:top]
+        if stages:
+            print(f"\n⏱️ {'Stage':22} {'Count':>6} {'Total s':>9} {'p50 s':>8} {'p95 s':>8}")
+            for name, stats in stages:
+                print(f"   {name:22} {stats['count']:>6} {stats['total_s']:>9} {stats['p50_s']:>8} {stats['p95_s']:>8}")
+        if report['projects']:
+            rates = ', '.join(f"{field} {stats['hit_rate']:.0%}" for field, stats in report['fields'].items())
+            print(f"   🎯 Field hit rates: {rates}")
+        for event, stages in report['counters'].items():
+            print(f"   🔢 {event}: {sum(stages.values())} ({', '.join(f'{stage} {value}' for stage, value in stages.items())})")
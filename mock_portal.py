@@ -0,0 +1,471 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from archive import PageArchive
+from browser_config import NEXT_PAGE_XPATH, PROJECT_CARD_SELECTOR, PROMOTER_TAB_XPATH
+from fastpath import project_id_from_url
+from postprocess import gstin_check_character, DISTRICT_ALIASES
+
+LISTING_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>Registered Projects</title></head>
+<body><div class="container">
+<h2>Registered Projects</h2>
+{cards}
+<ul class="pagination"><li class="{next_state}"><a href="/projects/project-list?page={next_page}">Next</a></li></ul>
+</div></body></html>
+"""
+
+LISTING_CARD = """<div class="project-card">
+    <h3>{name}</h3>
+    <p>Regd. No: {rera_no}</p>
+    <p>by {promoter}</p>
+    <p>Status: {status}</p>
+    <p>{district}</p>
+    <a class="view-details" href="/projects/project-details/{project_id}">View Details</a>
+</div>
+"""
+
+# The promoter pane is filled in only after its tab's XHR succeeds, like the portal's Angular tabs
+DETAIL_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>{name}</title></head>
+<body><div class="container">
+<h1>{name}</h1>
+<ul class="nav nav-tabs">
+    <li><a href="#project">Project Details</a></li>
+    <li><a id="promoter-tab" href="#promoter">Promoter Details</a></li>
+</ul>
+<table class="project-details">
+    <tr><td>RERA Regd. No</td><td>{rera_no}</td></tr>
+    <tr><td>Project Status</td><td>{status}</td></tr>
+    <tr><td>District</td><td>{district}</td></tr>
+    <tr><td>Project Type</td><td>{project_type}</td></tr>
+    <tr><td>Total Land Area</td><td>{land_area}</td></tr>
+    <tr><td>Proposed Date of Completion</td><td>{completion_date}</td></tr>
+    <tr><td>Total No. of Apartments</td><td>{units}</td></tr>
+    <tr><td>Project Bank Account No</td><td>{bank_account}</td></tr>
+</table>
+<table class="documents">
+    <tr><td>Registration Certificate</td><td><a href="/documents/{project_id}/registration-certificate.pdf">View</a></td></tr>
+    <tr><td>Approved Building Plan</td><td><a href="/documents/{project_id}/approved-plan.pdf">View</a></td></tr>
+    <tr><td>Promoter's Undertaking (common format)</td><td><a href="/documents/common/undertaking.pdf">View</a></td></tr>
+</table>
+<div class="promoter-details promoter" style="display: none">
+    <table>
+        <tr><td>Promoter Name</td><td>{promoter}</td></tr>
+        <tr><td>Registered Address</td><td>{address}</td></tr>
+        <tr><td>GST No</td><td>{gst_no}</td></tr>
+    </table>
+</div>
+</div>
+<script>
+document.getElementById('promoter-tab').addEventListener('click', function (event) {{
+    event.preventDefault();
+    fetch('/api/projects/promoter-details/{project_id}').then(function (response) {{
+        if (response.ok) {{ document.querySelector('.promoter').style.display = 'block'; }}
+    }});
+}});
+</script>
+</body></html>
+"""
+
+PORTAL_URL = "https://rera.odisha.gov.in"
+SCRIPT_TAG = re.compile(r'<script\b.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+# Archived pages lose the portal's Angular app, so replays wire up the few interactions the scraper relies on
+REPLAY_LISTING_SCRIPT = """<script>
+(function () {{
+    var details = {details}, nextPage = {next_page};
+    document.querySelectorAll({card_selector}).forEach(function (card) {{
+        var reraNo = Object.keys(details).filter(function (no) {{ return card.textContent.indexOf(no) !== -1; }})[0];
+        if (!reraNo) {{ return; }}
+        card.querySelectorAll('a').forEach(function (link) {{
+            if (/details/i.test(link.textContent + ' ' + link.className + ' ' + (link.getAttribute('href') || ''))) {{
+                link.setAttribute('href', details[reraNo]);
+            }}
+        }});
+    }});
+    var next = document.evaluate({next_xpath}, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (next && nextPage) {{
+        next.addEventListener('click', function (event) {{ event.preventDefault(); location.href = nextPage; }});
+    }} else if (next) {{
+        next.remove();
+    }}
+}})();
+</script>
+"""
+
+REPLAY_DETAIL_SCRIPT = """<script>
+(function () {{
+    var tab = document.evaluate({tab_xpath}, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!tab) {{ return; }}
+    tab.addEventListener('click', function (event) {{
+        event.preventDefault();
+        fetch({promoter_url}).then(function (response) {{ return response.ok ? response.text() : null; }}).then(function (html) {{
+            if (html) {{ document.body.innerHTML = new DOMParser().parseFromString(html, 'text/html').body.innerHTML; }}
+        }});
+    }});
+}})();
+</script>
+"""
+
+SURNAMES = ['Sahoo', 'Mohanty', 'Das', 'Patnaik', 'Mishra', 'Behera', 'Nayak', 'Panda', 'Swain', 'Rout']
+COMPANY_WORDS = ['Neelachal', 'Kalinga', 'Utkal', 'Konark', 'Mahanadi', 'Jagannath', 'Chilika', 'Subham']
+PROJECT_WORDS = ['Enclave', 'Residency', 'Heights', 'Vihar', 'Towers', 'Greens', 'Apartment', 'Nagar']
+STATUSES = ['Ongoing', 'Completed', 'New']
+PIN_PREFIXES = {'Khordha': '751', 'Cuttack': '753', 'Ganjam': '760', 'Sundargarh': '769', 'Angul': '759'}
+
+
+def pan_for(name, kind):
+    """A PAN shaped like the real thing: entity type at position 4, name initial at position 5"""
+    initial = name.split()[-1][0] if kind == 'P' else name[0]
+    return f"AA{chr(65 + len(name) % 26)}{kind}{initial.upper()}{len(name) * 37 % 10000:04d}K"
+
+
+def synthetic_projects(count, seed=7):
+    """Deterministic projects with realistic RERA numbers, promoters, addresses and valid GSTINs"""
+    rng = random.Random(seed)
+    districts = list(DISTRICT_ALIASES)
+    projects = []
+    for index in range(1, count + 1):
+        district = rng.choice(districts)
+        if rng.random() < 0.7:
+            promoter = f"{rng.choice(COMPANY_WORDS)} {rng.choice(['Infra', 'Builders', 'Developers'])} Private Limited"
+            pan = pan_for(promoter, 'C')
+        else:
+            promoter = f"{rng.choice(['Ramesh', 'Sunita', 'Prakash', 'Anita'])} {rng.choice(SURNAMES)}"
+            pan = pan_for(promoter, 'P')
+        gst_no = f"21{pan}1Z"
+        gst_no += gstin_check_character(gst_no)
+        pin = PIN_PREFIXES.get(district, '76' + str(rng.randint(0, 9))) + f"{rng.randint(1, 99):03d}"
+        projects.append({
+            'project_id': f"P{index:05d}",
+            'name': f"{rng.choice(COMPANY_WORDS)} {rng.choice(PROJECT_WORDS)} {index}",
+            'rera_no': f"RP/{rng.randint(1, 30):02d}/{rng.randint(2017, 2025)}/{index:05d}",
+            'promoter': promoter,
+            'status': rng.choice(STATUSES),
+            'district': district,
+            'address': f"Plot No-{rng.randint(1, 999)}, {rng.choice(['Near Bus Stand', 'Main Road', 'Sector 3'])}, "
+                       f"{district}, Odisha - {pin}",
+            'gst_no': gst_no,
+            'project_type': rng.choice(['Residential', 'Commercial', 'Mixed Development']),
+            'land_area': f"{rng.randint(800, 40000):,} Sq. Mtrs",
+            'completion_date': f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(2025, 2030)}",
+            'units': str(rng.randint(8, 600)),
+            'bank_account': str(rng.randint(10 ** 11, 10 ** 12 - 1)),
+        })
+    return projects
+
+
+def projects_from_records(filename):
+    """Serve previously scraped records (the JSON array or JSON Lines output) instead of synthetic data"""
+    with open(filename, encoding='utf-8') as f:
+        records = json.load(f) if filename.endswith('.json') else [json.loads(line) for line in f if line.strip()]
+    return [
+        {
+            'project_id': f"R{index:05d}",
+            'name': record.get('Project Name', ''),
+            'rera_no': record.get('RERA Regd. No', ''),
+            'promoter': record.get('Promoter Name', ''),
+            'status': record.get('Project Status') or 'Ongoing',
+            'district': record.get('District', ''),
+            'address': record.get('Promoter Address', ''),
+            'gst_no': record.get('GST No', ''),
+            'project_type': record.get('Project Type', ''),
+            'land_area': record.get('Land Area', ''),
+            'completion_date': record.get('Completion Date', ''),
+            'units': record.get('Total Units', ''),
+            'bank_account': record.get('Bank Account', ''),
+        }
+        for index, record in enumerate(records, 1)
+    ]
+
+
+class MockPortalHandler(BaseHTTPRequestHandler):
+    """Listing, detail and API endpoints shaped like the portal's, with injected latency and errors"""
+
+    portal = None
+
+    def do_GET(self):
+        portal = self.portal
+        delay = portal.latency + random.uniform(0, portal.jitter)
+        if delay:
+            time.sleep(delay)
+        with portal.lock:
+            portal.requests += 1
+            failed = random.random() < portal.error_rate
+            if failed:
+                portal.errors += 1
+        if failed:
+            self.send_error(503, "Injected failure")
+            return
+        if self.path.startswith('/documents/'):
+            self.send_document(portal.document(self.path))
+            return
+
+        parts = urlsplit(self.path)
+        page = int(parse_qs(parts.query).get('page', ['1'])[0])
+        path = parts.path.rstrip('/')
+        project_id = path.rsplit('/', 1)[-1]
+        if path == '/projects/project-list':
+            self.respond(portal.listing_page(page), 'text/html')
+        elif path == '/api/projects/project-list':
+            self.respond(portal.listing_payload(page), 'application/json')
+        elif path.startswith('/projects/project-details/'):
+            self.respond(portal.detail_html(project_id), 'text/html')
+        elif path.startswith('/api/projects/project-details/'):
+            self.respond(portal.project_payload(project_id), 'application/json')
+        elif path.startswith('/api/projects/promoter-details/'):
+            self.respond(portal.promoter_payload(project_id), 'application/json')
+        elif path.startswith('/replay/promoter/'):
+            self.respond(portal.promoter_html(project_id), 'text/html')
+        else:
+            self.send_error(404, f"Not part of the mock portal: {self.path}")
+
+    def send_document(self, data):
+        """Serve a document's bytes, honouring single Range requests like a typical file server"""
+        start = 0
+        match = re.fullmatch(r'bytes=(\d+)-', self.headers.get('Range', ''))
+        if match:
+            start = int(match.group(1))
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+        body = data[start:]
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', f'"{hashlib.md5(data).hexdigest()}"')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond(self, body, content_type):
+        """Send a page or payload, or a 404 when the portal has nothing under that path"""
+        if body is None:
+            self.send_error(404, f"Unknown project or page: {self.path}")
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockPortal:
+    """Local stand-in for rera.odisha.gov.in serving a fixed set of projects"""
+
+    def __init__(self, projects, page_size=9, latency=0.0, jitter=0.0, error_rate=0.0):
+        self.projects = projects
+        self.by_id = {project['project_id']: project for project in projects}
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.server = None
+
+    def start(self, host='127.0.0.1', port=0):
+        handler = type('BoundMockPortalHandler', (MockPortalHandler,), {'portal': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_base(self):
+        return f"{self.url}/api/"
+
+    def detail_url(self, project_id):
+        return f"{self.url}/projects/project-details/{project_id}"
+
+    def page_projects(self, page):
+        start = (page - 1) * self.page_size
+        return self.projects[start:start + self.page_size] if page >= 1 else []
+
+    def listing_page(self, page):
+        cards = ''.join(
+            LISTING_CARD.format(**{key: escape(str(value)) for key, value in project.items()})
+            for project in self.page_projects(page)
+        )
+        has_next = page * self.page_size < len(self.projects)
+        return LISTING_PAGE.format(cards=cards, next_page=page + 1, next_state='' if has_next else 'disabled')
+
+    def listing_payload(self, page):
+        items = [
+            {'projectId': project['project_id'], 'projectName': project['name'], 'regdNo': project['rera_no'],
+             'promoterName': project['promoter'], 'projectStatus': project['status'], 'district': project['district']}
+            for project in self.page_projects(page)
+        ]
+        return json.dumps({'data': items})
+
+    def project(self, project_id):
+        return self.by_id.get(project_id)
+
+    def document(self, path):
+        """Deterministic PDF-like bytes for a document path, a few hundred KB each"""
+        seed = hashlib.sha256(path.encode('utf-8')).digest()
+        return b'%PDF-1.4\n' + seed * (4096 + seed[0] * 32)
+
+    def detail_html(self, project_id):
+        project = self.project(project_id)
+        return DETAIL_PAGE.format(**{key: escape(str(value)) for key, value in project.items()}) if project else None
+
+    def project_payload(self, project_id):
+        project = self.project(project_id)
+        if project is None:
+            return None
+        payload = {'projectId': project['project_id'], 'projectName': project['name'],
+                   'regdNo': project['rera_no'], 'projectStatus': project['status'],
+                   'district': project['district'], 'projectType': project['project_type'],
+                   'landArea': project['land_area'], 'completionDate': project['completion_date'],
+                   'totalUnits': project['units'], 'bankAccountNo': project['bank_account']}
+        return json.dumps({'data': payload})
+
+    def promoter_payload(self, project_id):
+        project = self.project(project_id)
+        if project is None:
+            return None
+        payload = {'promoter': {'name': project['promoter'], 'address': project['address'],
+                                'gstin': project['gst_no']}}
+        return json.dumps({'data': payload})
+
+    def promoter_html(self, project_id):
+        """Only archive replays have a separate promoter tab snapshot to serve"""
+        return None
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+def js_literal(value):
+    """A value as a JavaScript literal that is safe inside a <script> element"""
+    return json.dumps(value).replace('</', '<\\/')
+
+
+def page_number(url):
+    """Listing page number from an archived URL ending in #page=N"""
+    match = re.search(r'#page=(\d+)$', url)
+    return int(match.group(1)) if match else 1
+
+
+class ReplayPortal(MockPortal):
+    """Serves the raw listing, detail and API responses recorded by `scrap.py --archive` instead of templates"""
+
+    def __init__(self, archive_root, latency=0.0, jitter=0.0, error_rate=0.0):
+        self.listing_pages = {}
+        self.listing_payloads = {}
+        self.pages = {}
+        self.payloads = {}
+        self.rera_ids = {}
+        archive = PageArchive(archive_root)
+        try:
+            for rera_no, kind, url, content in archive.latest_pages(
+                    ('listing', 'api-listing', 'project', 'promoter', 'api-project', 'api-promoter')):
+                if kind == 'listing':
+                    self.listing_pages[page_number(url)] = content
+                elif kind == 'api-listing':
+                    self.listing_payloads[page_number(url)] = content
+                else:
+                    project_id = project_id_from_url(url)
+                    target = self.payloads if kind.startswith('api-') else self.pages
+                    target[(kind.replace('api-', ''), project_id)] = content
+                    if rera_no:
+                        self.rera_ids[rera_no] = project_id
+        finally:
+            archive.close()
+        super().__init__([], latency=latency, jitter=jitter, error_rate=error_rate)
+        # Only ids here, for counting; every page and payload comes from the archive
+        self.projects = sorted({project_id for _, project_id in list(self.pages) + list(self.payloads)})
+
+    def rewrite(self, html):
+        """Drop the portal's scripts and point absolute portal links at this server"""
+        return SCRIPT_TAG.sub('', html).replace(PORTAL_URL, self.url)
+
+    def inject(self, html, script):
+        html = self.rewrite(html)
+        index = html.lower().rfind('</body>')
+        return html[:index] + script + html[index:] if index != -1 else html + script
+
+    def listing_page(self, page):
+        html = self.listing_pages.get(page)
+        if html is None:
+            return None
+        details = {rera_no: self.detail_url(project_id) for rera_no, project_id in self.rera_ids.items()}
+        next_page = f"{self.url}/projects/project-list?page={page + 1}" if page + 1 in self.listing_pages else None
+        return self.inject(html, REPLAY_LISTING_SCRIPT.format(
+            details=js_literal(details), next_page=js_literal(next_page),
+            card_selector=js_literal(PROJECT_CARD_SELECTOR), next_xpath=js_literal(NEXT_PAGE_XPATH),
+        ))
+
+    def listing_payload(self, page):
+        # Past the last recorded page, answer with an empty page so the API client stops
+        return self.listing_payloads.get(page, json.dumps({'data': []}))
+
+    def detail_html(self, project_id):
+        html = self.pages.get(('project', project_id))
+        if html is None:
+            return None
+        return self.inject(html, REPLAY_DETAIL_SCRIPT.format(
+            tab_xpath=js_literal(PROMOTER_TAB_XPATH), promoter_url=js_literal(f"/replay/promoter/{project_id}"),
+        ))
+
+    def project_payload(self, project_id):
+        return self.payloads.get(('project', project_id))
+
+    def promoter_payload(self, project_id):
+        return self.payloads.get(('promoter', project_id))
+
+    def promoter_html(self, project_id):
+        html = self.pages.get(('promoter', project_id))
+        return self.rewrite(html) if html is not None else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local mock of the Odisha RERA portal")
+    parser.add_argument('--projects', type=int, default=60, help="Number of synthetic projects")
+    parser.add_argument('--records', help="Serve these scraped records (.json or .jsonl) instead of synthetic ones")
+    parser.add_argument('--replay-archive', metavar='DIR',
+                        help="Replay the raw pages and API responses archived by scrap.py --archive")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency-ms', type=float, default=0, help="Delay added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Random extra delay of up to this much")
+    parser.add_argument('--error-rate', type=float, default=0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+    if args.replay_archive:
+        portal = ReplayPortal(args.replay_archive, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                              error_rate=args.error_rate).start(port=args.port)
+    else:
+        projects = projects_from_records(args.records) if args.records else synthetic_projects(args.projects)
+        portal = MockPortal(projects, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                            error_rate=args.error_rate).start(port=args.port)
+    print(f"🏗️ Mock portal with {len(portal.projects)} projects at {portal.url}/projects/project-list "
+          f"(API {portal.api_base})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        portal.stop()
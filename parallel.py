@@ -0,0 +1,114 @@
+import queue
+import threading
+
+from records import record_from_stub
+from metrics import RunMetrics
+from supervisor import NO_WATCHDOG, scrape_supervised
+
+
+class ParallelRERAScraper:
+    """Run project detail jobs across a pool of WebDriver workers fed from a shared queue"""
+
+    def __init__(self, scraper_factory, workers=4, recycle_after=50, metrics=None, watchdog=None, max_attempts=3):
+        self.scraper_factory = scraper_factory
+        self.metrics = metrics or RunMetrics()
+        self.workers = workers
+        self.recycle_after = recycle_after
+        self.watchdog = watchdog or NO_WATCHDOG
+        self.max_attempts = max_attempts
+
+    def iter_scrape(self, stubs):
+        """Stream stubs (any iterable, e.g. a paginated generator) through the pool, yielding (stub, record) as they finish"""
+        for _, stub, record in self._run(stubs):
+            yield stub, record
+
+    def _run(self, stubs):
+        """Feed the workers and yield (index, stub, record) in completion order"""
+        # A bounded job queue keeps only a few stubs in memory however long the stream is
+        jobs = queue.Queue(maxsize=self.workers * 2)
+        done = queue.Queue()
+
+        feeder = threading.Thread(target=self._feed, args=(stubs, jobs), daemon=True)
+        threads = [
+            threading.Thread(target=self._worker, args=(worker_id, jobs, done), daemon=True)
+            for worker_id in range(1, self.workers + 1)
+        ]
+        print(f"🧵 Scraping with {len(threads)} workers...")
+        feeder.start()
+        for thread in threads:
+            thread.start()
+
+        running = len(threads)
+        while running:
+            item = done.get()
+            if item is None:
+                running -= 1
+                continue
+            yield item
+
+        feeder.join()
+
+    def _feed(self, stubs, jobs):
+        """Push stubs onto the job queue, then one stop marker per worker"""
+        try:
+            for index, stub in enumerate(stubs):
+                jobs.put((index, stub))
+        except Exception as e:
+            print(f"   ❌ Stopped reading project stubs: {str(e)}")
+        finally:
+            for _ in range(self.workers):
+                jobs.put(None)
+
+    def _worker(self, worker_id, jobs, done):
+        """Pull jobs until a stop marker, recycling the driver every recycle_after pages"""
+        scraper = None
+        pages = 0
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    break
+                index, stub = job
+
+                if scraper is None:
+                    try:
+                        scraper = self.scraper_factory()
+                    except Exception as e:
+                        # Keep the card data and try to start a browser again on the next job
+                        print(f"   ❌ Worker {worker_id}: could not start browser: {str(e)}")
+                        self.metrics.increment('errors', 'browser_start')
+                        done.put((index, stub, record_from_stub(stub)))
+                        continue
+                elif self.recycle_after and pages >= self.recycle_after:
+                    print(f"   ♻️ Worker {worker_id}: recycling driver after {pages} pages")
+                    pages = 0
+                    try:
+                        scraper.restart_driver()
+                        self.metrics.increment('recycles')
+                    except Exception as e:
+                        # Keep the card data; the next job starts a browser from scratch
+                        print(f"   ❌ Worker {worker_id}: could not recycle browser: {str(e)}")
+                        self.metrics.increment('errors', 'browser_recycle')
+                        done.put((index, stub, record_from_stub(stub)))
+                        scraper.cleanup()
+                        scraper = None
+                        continue
+
+                print(f"   🔍 Worker {worker_id}: {stub.get('project_name') or stub.get('detail_url')}")
+                try:
+                    # Each page load and API request waits for the shared rate controller itself
+                    record = scrape_supervised(scraper, stub, self.watchdog, self.metrics, self.max_attempts)
+                except Exception as e:
+                    # Only a browser that could not be restarted gets here; start one afresh for the next job
+                    print(f"   ❌ Worker {worker_id}: error processing {stub.get('detail_url')}: {str(e)}")
+                    self.metrics.increment('errors', 'project')
+                    record = record_from_stub(stub)
+                    scraper.cleanup()
+                    scraper = None
+                    pages = 0
+                done.put((index, stub, record))
+                pages += 1
+        finally:
+            if scraper:
+                scraper.cleanup()
+            done.put(None)
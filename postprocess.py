@@ -0,0 +1,273 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from records import RECORD_FIELDS, NAME_REPLACEMENTS
+
+GSTIN_FORMAT = r'\d{2}[A-Z]{5}\d{4}[A-Z][1-9A-Z]Z[0-9A-Z]'
+RERA_FORMAT = r'(?:RP|PS)/\d{1,2}/\d{4}/\d{5}'
+PIN_PATTERN = r'(?<!\d)([1-9]\d{2})\s?(\d{3})(?!\d)'
+GSTIN_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+MAX_GST_STATE_CODE = 38
+ODISHA_GST_STATE_CODE = '21'
+
+# Odisha districts, with the spellings and major towns the portal's addresses use for each
+DISTRICT_ALIASES = {
+    'Angul': ('Angul', 'Anugul'),
+    'Balangir': ('Balangir', 'Bolangir'),
+    'Balasore': ('Balasore', 'Baleswar', 'Baleshwar'),
+    'Bargarh': ('Bargarh',),
+    'Bhadrak': ('Bhadrak',),
+    'Boudh': ('Boudh', 'Baudh'),
+    'Cuttack': ('Cuttack',),
+    'Deogarh': ('Deogarh', 'Debagarh'),
+    'Dhenkanal': ('Dhenkanal',),
+    'Gajapati': ('Gajapati', 'Paralakhemundi'),
+    'Ganjam': ('Ganjam', 'Berhampur', 'Brahmapur'),
+    'Jagatsinghpur': ('Jagatsinghpur', 'Jagatsinghapur', 'Paradip'),
+    'Jajpur': ('Jajpur', 'Jajapur'),
+    'Jharsuguda': ('Jharsuguda',),
+    'Kalahandi': ('Kalahandi', 'Bhawanipatna'),
+    'Kandhamal': ('Kandhamal', 'Phulbani'),
+    'Kendrapara': ('Kendrapara', 'Kendrapada'),
+    'Keonjhar': ('Keonjhar', 'Kendujhar'),
+    'Khordha': ('Khordha', 'Khurda', 'Khurdha', 'Bhubaneswar', 'Bhubaneshwar'),
+    'Koraput': ('Koraput',),
+    'Malkangiri': ('Malkangiri',),
+    'Mayurbhanj': ('Mayurbhanj', 'Baripada'),
+    'Nabarangpur': ('Nabarangpur', 'Nawarangpur'),
+    'Nayagarh': ('Nayagarh',),
+    'Nuapada': ('Nuapada',),
+    'Puri': ('Puri',),
+    'Rayagada': ('Rayagada',),
+    'Sambalpur': ('Sambalpur',),
+    'Subarnapur': ('Subarnapur', 'Sonepur', 'Sonapur'),
+    'Sundargarh': ('Sundargarh', 'Rourkela'),
+}
+DISTRICT_BY_ALIAS = {alias.lower(): district for district, aliases in DISTRICT_ALIASES.items() for alias in aliases}
+# Longest alias first so "Bhubaneshwar" wins over a shorter overlapping name
+DISTRICT_PATTERN = r'\b(' + '|'.join(sorted(DISTRICT_BY_ALIAS, key=len, reverse=True)) + r')\b'
+
+# 4th PAN character: C company, F firm / LLP, P individual
+COMPANY_NAME_PATTERN = r'\b(?:LIMITED|CORPORATION|COMPANY)\b'
+FIRM_NAME_PATTERN = r'\b(?:LLP|ASSOCIATES|ENTERPRISES|BUILDERS|DEVELOPERS|CONSTRUCTIONS?|INFRA\w*|HOMES|ESTATES?)\b'
+
+
+def load_records(filename):
+    """Read scraper output (csv, json, jsonl or parquet) as an all-string DataFrame"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        frame = pd.read_csv(filename, dtype=str, keep_default_na=False)
+    elif extension in ('.json', '.jsonl'):
+        frame = pd.read_json(filename, dtype=False, lines=extension == '.jsonl')
+    elif extension == '.parquet':
+        frame = pd.read_parquet(filename)
+    else:
+        raise ValueError(f"Unsupported input format: {filename}")
+    for field in RECORD_FIELDS:
+        if field not in frame:
+            frame[field] = ''
+    return frame.fillna('').astype(str)
+
+
+def save_records(frame, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        frame.to_csv(filename, index=False, encoding='utf-8')
+    elif extension == '.json':
+        frame.to_json(filename, orient='records', indent=2, force_ascii=False)
+    elif extension == '.jsonl':
+        frame.to_json(filename, orient='records', lines=True, force_ascii=False)
+    elif extension == '.parquet':
+        frame.to_parquet(filename, index=False)
+    else:
+        raise ValueError(f"Unsupported output format: {filename}")
+    return filename
+
+
+def clean_text(series):
+    """Collapse whitespace and blank out 'Not Available' placeholders"""
+    series = series.fillna('').astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+    return series.mask(series.str.casefold() == 'not available', '')
+
+
+def normalize_promoter_names(names):
+    """Upper-case, drop the M/S prefix and spell company forms one way (PVT LTD -> PRIVATE LIMITED)"""
+    names = names.str.upper()
+    for pattern, replacement in NAME_REPLACEMENTS:
+        names = names.str.replace(pattern, replacement, regex=True)
+    return names.str.strip()
+
+
+def normalize_addresses(addresses):
+    """Tidy separators: one space after each comma, no doubled or trailing commas"""
+    addresses = addresses.str.replace(r'\s*,[\s,]*', ', ', regex=True)
+    addresses = addresses.str.replace(r'\s*-\s*', '-', regex=True)
+    return addresses.str.strip(' ,')
+
+
+def extract_pin_codes(addresses):
+    """Last six-digit PIN code in each address ('751 012' and '751012' both count)"""
+    # The greedy prefix makes a single extract land on the last match, with no extractall/groupby
+    found = addresses.str.extract(r'.*' + PIN_PATTERN)
+    return found[0].fillna('') + found[1].fillna('')
+
+
+def extract_districts(addresses):
+    """Canonical Odisha district named (or implied by a major town) in each address"""
+    found = addresses.str.lower().str.extract(DISTRICT_PATTERN, expand=False)
+    return found.map(DISTRICT_BY_ALIAS).fillna('')
+
+
+def gstin_checksum_valid(gstins):
+    """Verify the GSTIN mod-36 check character, vectorized over well-formed 15-character GSTINs"""
+    if gstins.empty:
+        return pd.Series(dtype=bool)
+    codes = np.frombuffer(''.join(gstins).encode('ascii'), dtype=np.uint8).reshape(-1, 15).astype(np.int64)
+    # '0'-'9' -> 0-9, 'A'-'Z' -> 10-35
+    values = np.where(codes >= ord('A'), codes - ord('A') + 10, codes - ord('0'))
+    factors = np.tile([1, 2], 7)
+    products = values[:, :14] * factors
+    total = (products // 36 + products % 36).sum(axis=1)
+    expected = (36 - total % 36) % 36
+    return pd.Series(expected == values[:, 14], index=gstins.index)
+
+
+def gstin_check_character(gstin):
+    """Check character for the first 14 characters of a GSTIN (handy for building test data)"""
+    total = 0
+    for position, char in enumerate(gstin[:14]):
+        product = GSTIN_ALPHABET.index(char) * (2 if position % 2 else 1)
+        total += product // 36 + product % 36
+    return GSTIN_ALPHABET[(36 - total % 36) % 36]
+
+
+def expected_pan_type(names):
+    """PAN holder type implied by the promoter name: C company, F firm, P individual"""
+    kinds = pd.Series('P', index=names.index)
+    kinds = kinds.mask(names.str.contains(FIRM_NAME_PATTERN, regex=True), 'F')
+    kinds = kinds.mask(names.str.contains(COMPANY_NAME_PATTERN, regex=True), 'C')
+    return kinds.mask(names == '', '')
+
+
+def validate_gstins(frame):
+    """Format, state code, checksum and embedded-PAN cross-check columns for the GST numbers"""
+    gstins = frame['GST No'].str.upper().str.replace(' ', '', regex=False)
+    present = gstins != ''
+    well_formed = gstins.str.fullmatch(GSTIN_FORMAT)
+    state_codes = gstins.str[:2]
+    numeric_state = pd.to_numeric(state_codes.where(well_formed), errors='coerce')
+    state_valid = numeric_state.between(1, MAX_GST_STATE_CODE)
+
+    checksum = pd.Series(False, index=frame.index)
+    checksum.loc[well_formed] = gstin_checksum_valid(gstins[well_formed])
+
+    pan = gstins.str[2:12].where(well_formed, '')
+    names = frame['promoter_name_normalized']
+    pan_type = expected_pan_type(names)
+    # 5th PAN character: first letter of the entity's name, or of an individual's surname
+    # In a batch without any promoter names every surname is NaN, which the .str accessor rejects
+    surname_initial = names.str.split().str[-1].fillna('').str[:1]
+    name_initial = names.str[:1].where(pan_type != 'P', surname_initial)
+    comparable = well_formed & (names != '')
+    pan_matches = (pan.str[3] == pan_type) & (pan.str[4] == name_initial)
+
+    frame['GST No'] = gstins
+    frame['gst_present'] = present
+    frame['gst_format_valid'] = well_formed
+    frame['gst_state_code'] = state_codes.where(well_formed, '')
+    frame['gst_state_valid'] = state_valid
+    frame['gst_odisha'] = state_codes.eq(ODISHA_GST_STATE_CODE) & well_formed
+    frame['gst_checksum_valid'] = checksum
+    frame['gst_valid'] = well_formed & state_valid & checksum
+    frame['pan'] = pan
+    frame['pan_matches_promoter'] = pan_matches.where(comparable, pd.NA).astype('boolean')
+    return frame
+
+
+def postprocess(frame):
+    """Normalize and validate a DataFrame of scraped records, adding derived and flag columns"""
+    frame = frame.copy()
+    for field in RECORD_FIELDS:
+        frame[field] = clean_text(frame[field]) if field in frame else ''
+
+    frame['RERA Regd. No'] = frame['RERA Regd. No'].str.upper().str.replace(r'\s*/\s*', '/', regex=True)
+    frame['rera_valid'] = frame['RERA Regd. No'].str.fullmatch(RERA_FORMAT)
+    frame['registration_year'] = frame['RERA Regd. No'].str.extract(r'^\w+/\d{1,2}/(\d{4})/', expand=False).fillna('')
+
+    frame['promoter_name_normalized'] = normalize_promoter_names(frame['Promoter Name'])
+    frame['Promoter Address'] = normalize_addresses(frame['Promoter Address'])
+    # The old per-page check treated anything of 10 characters or fewer as a label, not an address
+    frame['address_valid'] = frame['Promoter Address'].str.len() > 10
+    frame['pin_code'] = extract_pin_codes(frame['Promoter Address'])
+    frame['district'] = extract_districts(frame['Promoter Address'])
+
+    frame = validate_gstins(frame)
+
+    has_rera = frame['RERA Regd. No'] != ''
+    frame['duplicate_rera'] = frame.duplicated('RERA Regd. No', keep=False) & has_rera
+    frame['duplicate_rank'] = frame.groupby('RERA Regd. No').cumcount().where(has_rera, 0)
+    return frame
+
+
+def validation_report(frame):
+    """Counts of every flag, for a quick look at data quality"""
+    total = len(frame)
+    gst_present = int(frame['gst_present'].sum())
+
+    def count(mask):
+        return int(mask.sum())
+
+    return {
+        'records': total,
+        'rera_invalid': count(~frame['rera_valid']),
+        'duplicate_rera_records': count(frame['duplicate_rera']),
+        'duplicate_rera_numbers': int(frame.loc[frame['duplicate_rera'], 'RERA Regd. No'].nunique()),
+        'address_missing_or_short': count(~frame['address_valid']),
+        'pin_code_found': count(frame['pin_code'] != ''),
+        'district_found': count(frame['district'] != ''),
+        'gst_present': gst_present,
+        'gst_format_invalid': count(frame['gst_present'] & ~frame['gst_format_valid']),
+        'gst_checksum_invalid': count(frame['gst_format_valid'] & ~frame['gst_checksum_valid']),
+        'gst_state_invalid': count(frame['gst_format_valid'] & ~frame['gst_state_valid']),
+        'gst_outside_odisha': count(frame['gst_format_valid'] & ~frame['gst_odisha']),
+        'pan_promoter_mismatch': count(frame['pan_matches_promoter'].eq(False)),
+        'districts': frame.loc[frame['district'] != '', 'district'].value_counts().to_dict(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize and validate scraped Odisha RERA records")
+    parser.add_argument('input', help="Scraper output file (.csv, .json, .jsonl or .parquet)")
+    parser.add_argument('--output', help="Where to write the cleaned records (default: <input>_clean.<ext>)")
+    parser.add_argument('--report', default='rera_validation.json', help="Where to write the validation counts")
+    parser.add_argument('--drop-duplicates', action='store_true',
+                        help="Keep only the first record for each RERA number")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    frame = postprocess(load_records(args.input))
+    report = validation_report(frame)
+    if args.drop_duplicates:
+        frame = frame[frame['duplicate_rank'] == 0]
+    base, extension = os.path.splitext(args.input)
+    output = save_records(frame, args.output or f"{base}_clean{extension}")
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"🧹 Post-processed {report['records']} records in {time.perf_counter() - started:.2f}s")
+    print(f"   ✅ Valid GSTINs: {int(frame['gst_valid'].sum())}/{report['gst_present']}"
+          f" (checksum failures: {report['gst_checksum_invalid']}, PAN mismatches: {report['pan_promoter_mismatch']})")
+    print(f"   📍 PIN codes: {report['pin_code_found']}, districts: {report['district_found']}")
+    print(f"   🔁 Duplicate RERA numbers: {report['duplicate_rera_numbers']}")
+    print(f"   📄 {output}")
+    print(f"   📄 {args.report}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import sqlite3
+import threading
+import time
+
+from metrics import RunMetrics
+from records import normalize_promoter_name
+
+PROMOTER_FIELDS = ('Promoter Name', 'Promoter Address', 'GST No')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS promoters (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    address TEXT NOT NULL,
+    gst_no TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS promoters_last_used ON promoters (last_used);
+"""
+
+
+def promoter_identity(stub):
+    """Cache key for a project's promoter: the portal's promoter id if known, else the card's normalized name"""
+    if stub.get('promoter_id'):
+        return f"id:{stub['promoter_id']}"
+    name = normalize_promoter_name(stub.get('promoter_name'))
+    return f"name:{name}" if name else ''
+
+
+class PromoterCache:
+    """Promoter tab details shared by a developer's projects, persisted between runs with a TTL and LRU eviction"""
+
+    def __init__(self, path='rera_promoters.sqlite3', ttl=30 * 86400, max_entries=20000, metrics=None):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.metrics = metrics or RunMetrics()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        with self.lock:
+            self.conn.execute("DELETE FROM promoters WHERE stored_at < ?", (time.time() - self.ttl,))
+            self.size = self.conn.execute("SELECT COUNT(*) FROM promoters").fetchone()[0]
+
+    def get(self, stub):
+        """Cached promoter fields for the stub's promoter, or None on a miss or an expired entry"""
+        key = promoter_identity(stub)
+        if not key:
+            return None
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT name, address, gst_no FROM promoters WHERE key = ? AND stored_at >= ?", (key, now - self.ttl)
+            ).fetchone()
+            if row:
+                self.conn.execute("UPDATE promoters SET last_used = ? WHERE key = ?", (now, key))
+        self.metrics.increment('promoter_cache', 'hit' if row else 'miss')
+        return dict(zip(PROMOTER_FIELDS, row)) if row else None
+
+    def put(self, stub, details):
+        """Remember the promoter tab's fields, if the tab gave us a complete set"""
+        key = promoter_identity(stub)
+        values = [details.get(field, '') for field in PROMOTER_FIELDS]
+        if not key or not all(value and value != 'Not Available' for value in values):
+            return False
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO promoters (key, name, address, gst_no, stored_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (key, *values, now, now)
+            )
+            if cursor.rowcount:
+                self.size += 1
+            else:
+                self.conn.execute(
+                    "UPDATE promoters SET name = ?, address = ?, gst_no = ?, stored_at = ?, last_used = ? WHERE key = ?",
+                    (*values, now, now, key)
+                )
+            if self.size > self.max_entries:
+                self.evict()
+        return True
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones beyond max_entries"""
+        self.conn.execute("DELETE FROM promoters WHERE stored_at < ?", (time.time() - self.ttl,))
+        # Trim an extra tenth so eviction runs once per batch of inserts rather than on every one
+        keep = int(self.max_entries * 0.9)
+        self.conn.execute(
+            "DELETE FROM promoters WHERE key NOT IN (SELECT key FROM promoters ORDER BY last_used DESC LIMIT ?)", (keep,)
+        )
+        self.size = self.conn.execute("SELECT COUNT(*) FROM promoters").fetchone()[0]
+        self.metrics.increment('promoter_cache', 'eviction')
+
+    def close(self):
+        self.conn.close()
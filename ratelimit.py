@@ -0,0 +1,226 @@
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from urllib.parse import urlparse
+
+from metrics import RunMetrics
+
+
+def backoff_delay(attempt, base=0.5, cap=30):
+    """Exponential backoff with full jitter: a random wait in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Refills rate tokens per second up to burst; take() blocks until a token is available"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Reserve one token and return how long to wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now so concurrent callers queue up behind each other
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+    def take(self):
+        """Take one token, returning how long we had to wait for it"""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class Request:
+    """Handle for one request through a slot; call fail() if the server misbehaved"""
+
+    def __init__(self):
+        self.ok = True
+
+    def fail(self):
+        self.ok = False
+
+
+class HostState:
+    """AIMD concurrency limit, token bucket and circuit breaker for one host"""
+
+    def __init__(self, controller):
+        self.limit = 1.0
+        self.in_flight = 0
+        self.bucket = TokenBucket(1 / controller.min_interval if controller.min_interval else 1000, controller.max_concurrent)
+        self.condition = threading.Condition()
+        self.latency = None
+        self.last_decrease = 0
+        self.consecutive_failures = 0
+        self.open_until = 0
+        self.cooldown = controller.breaker_cooldown
+        self.probing = False
+
+
+class HostRateController:
+    """Shared per-host rate control: token bucket, AIMD concurrency and a circuit breaker"""
+
+    def __init__(self, max_concurrent=2, min_interval=0.5, target_latency=10, breaker_threshold=5,
+                 breaker_cooldown=60, max_cooldown=600, metrics=None):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self.target_latency = target_latency
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.max_cooldown = max_cooldown
+        self.metrics = metrics or RunMetrics()
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def _host(self, host):
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostState(self)
+            return self.hosts[host]
+
+    @contextmanager
+    def slot(self, url, waiting=nullcontext):
+        """Hold one of the host's request slots; the outcome and latency tune the limits.
+        `waiting` is entered while blocked on the breaker, a free slot or a token"""
+        state = self._host(urlparse(url).netloc)
+        waited = time.perf_counter()
+        with waiting():
+            probe = self._acquire(state)
+            state.bucket.take()
+        self.metrics.observe('rate_limit_wait', time.perf_counter() - waited)
+
+        request = Request()
+        started = time.perf_counter()
+        try:
+            yield request
+        except Exception:
+            request.fail()
+            raise
+        finally:
+            self._release(state, request.ok, time.perf_counter() - started, probe)
+
+    @asynccontextmanager
+    async def async_slot(self, url):
+        """slot() for coroutines: waits for the breaker, a free slot and a token without blocking the event loop"""
+        state = self._host(urlparse(url).netloc)
+        waited = time.perf_counter()
+        while True:
+            with state.condition:
+                acquired, probe, wait = self._try_acquire(state)
+            if acquired:
+                break
+            # Releases only notify threads, so coroutines poll
+            await asyncio.sleep(min(wait, 0.1))
+
+        request = Request()
+        started = time.perf_counter()
+        try:
+            await asyncio.sleep(state.bucket.reserve())
+            self.metrics.observe('rate_limit_wait', time.perf_counter() - waited)
+            started = time.perf_counter()
+            yield request
+        except Exception:
+            request.fail()
+            raise
+        finally:
+            self._release(state, request.ok, time.perf_counter() - started, probe)
+
+    def _try_acquire(self, state):
+        """One attempt at a slot, with state.condition held: (acquired, probe, seconds before trying again)"""
+        now = time.monotonic()
+        if now < state.open_until:
+            return False, False, state.open_until - now
+        if state.open_until and not state.probing:
+            # Half-open: let a single probe request through to test the portal
+            if state.in_flight == 0:
+                state.probing = True
+                state.in_flight += 1
+                return True, True, 0
+        elif not state.open_until and state.in_flight < int(state.limit):
+            state.in_flight += 1
+            return True, False, 0
+        return False, False, 1
+
+    def _acquire(self, state):
+        """Wait for the breaker to allow traffic and for a free slot under the current limit"""
+        with state.condition:
+            while True:
+                acquired, probe, wait = self._try_acquire(state)
+                if acquired:
+                    return probe
+                state.condition.wait(wait)
+
+    def _release(self, state, ok, latency, probe):
+        with state.condition:
+            state.in_flight -= 1
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+            if probe:
+                state.probing = False
+            if ok and latency <= self.target_latency:
+                state.consecutive_failures = 0
+                if probe:
+                    print("   🟢 Portal responding again, resuming crawl")
+                    state.open_until = 0
+                    state.cooldown = self.breaker_cooldown
+                # Additive increase: about one more slot per limit's worth of good responses
+                state.limit = min(self.max_concurrent, state.limit + 1 / state.limit)
+            else:
+                if not ok:
+                    state.consecutive_failures += 1
+                self._decrease(state)
+                if probe or state.consecutive_failures >= self.breaker_threshold:
+                    self._open(state, latency)
+            state.condition.notify_all()
+
+    def _decrease(self, state):
+        """Multiplicative decrease, at most once per target_latency so one bad burst halves the limit once"""
+        now = time.monotonic()
+        if now - state.last_decrease < self.target_latency:
+            return
+        state.last_decrease = now
+        state.limit = max(1.0, state.limit / 2)
+        self.metrics.increment('rate_decreases')
+
+    def _open(self, state, latency):
+        if state.open_until > time.monotonic():
+            return
+        if state.open_until:
+            # The half-open probe failed as well: back off for longer each time
+            state.cooldown = min(self.max_cooldown, state.cooldown * 2)
+        print(f"   🛑 Portal struggling ({state.consecutive_failures} failures, last {latency:.1f}s): "
+              f"pausing for {state.cooldown:.0f}s")
+        state.open_until = time.monotonic() + state.cooldown
+        self.metrics.increment('circuit_open')
+
+    def snapshot(self):
+        """Current concurrency limit and smoothed latency per host"""
+        with self.lock:
+            return {
+                host: {'limit': round(state.limit, 2), 'latency_s': round(state.latency or 0, 3)}
+                for host, state in self.hosts.items()
+            }
+
+
+class NoRateLimit:
+    """Stand-in controller that lets every request straight through"""
+
+    @contextmanager
+    def slot(self, url, waiting=nullcontext):
+        yield Request()
+
+    @asynccontextmanager
+    async def async_slot(self, url):
+        yield Request()
+
+
+NO_RATE_LIMIT = NoRateLimit()
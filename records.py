@@ -0,0 +1,112 @@
+import re
+
+# Output record schema shared by every scraping backend and writer
+RECORD_FIELDS = [
+    'Project URL',
+    'RERA Regd. No',
+    'Project Name',
+    'Promoter Name',
+    'Promoter Address',
+    'GST No',
+    # Declared in extractors.FIELD_SPEC
+    'Project Type',
+    'Project Status',
+    'District',
+    'Land Area',
+    'Completion Date',
+    'Total Units',
+    'Bank Account',
+]
+
+# Company-form words, in the order they are rewritten to one spelling
+NAME_REPLACEMENTS = [
+    (r'^\s*M\s*/\s*S\.?\s*', ''),
+    (r'\bPVT\b\.?', 'PRIVATE'),
+    (r'\bPRIVATE\s+LTD\b\.?', 'PRIVATE LIMITED'),
+    (r'\bLTD\b\.?', 'LIMITED'),
+    (r'\bCO\b\.', 'COMPANY'),
+    (r'&', ' AND '),
+    (r'[^\w\s]', ' '),
+    (r'\s+', ' '),
+]
+
+
+def empty_record(url=''):
+    """Blank record in the output schema"""
+    record = {field: '' for field in RECORD_FIELDS}
+    record['Project URL'] = url
+    return record
+
+
+def record_from_stub(stub):
+    """Record pre-filled with what the listing card already told us"""
+    record = empty_record(stub.get('detail_url', ''))
+    record['RERA Regd. No'] = stub.get('rera_no', '')
+    record['Project Name'] = stub.get('project_name', '')
+    record['Promoter Name'] = stub.get('promoter_name', '')
+    record['Project Status'] = stub.get('project_status', '')
+    return record
+
+
+def registration_year(rera_no):
+    """Year segment of a registration number like RP/01/2025/01362"""
+    parts = (rera_no or '').split('/')
+    return parts[2] if len(parts) == 4 else ''
+
+
+def stub_matches(stub, district=None, project_type=None, year=None):
+    """Whether a listing stub passes the district / project type / registration year filters"""
+    if year and registration_year(stub.get('rera_no', '')) != str(year):
+        return False
+    search_text = stub.get('search_text', '').lower()
+    if district and district.lower() not in search_text:
+        return False
+    if project_type and project_type.lower() not in search_text:
+        return False
+    return True
+
+
+def normalize_promoter_name(name):
+    """Upper-case, drop the M/S prefix and spell company forms one way (PVT LTD -> PRIVATE LIMITED)"""
+    name = str(name or '').upper()
+    for pattern, replacement in NAME_REPLACEMENTS:
+        name = re.sub(pattern, replacement, name)
+    return name.strip()
+
+
+def stub_key(stub):
+    """Stable identity of a project: its RERA number, else its detail URL"""
+    return stub.get('rera_no') or stub.get('detail_url') or stub.get('project_id', '')
+
+
+def has_detail_fields(record):
+    """Whether the detail page contributed anything beyond the listing card"""
+    return any(record.get(field) and record.get(field) != 'Not Available' for field in ('Promoter Address', 'GST No'))
+
+
+class RunSummary:
+    """Running counts over the records of a run, optionally keeping the records themselves"""
+
+    def __init__(self, keep_records=True):
+        self.keep_records = keep_records
+        self.records = []
+        self.total = 0
+        self.valid = 0
+        self.complete = 0
+        self.with_gst = 0
+
+    def add(self, record):
+        self.total += 1
+        if any(record.get(key) for key in ('RERA Regd. No', 'Project Name', 'Promoter Name')):
+            self.valid += 1
+        if record.get('RERA Regd. No') and record.get('Project Name'):
+            self.complete += 1
+        if record.get('GST No') and record.get('GST No') != 'Not Available':
+            self.with_gst += 1
+        if self.keep_records:
+            self.records.append(record)
+
+    def track(self, records):
+        for record in records:
+            self.add(record)
+            yield record
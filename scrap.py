@@ -1,30 +1,119 @@
-import pandas as pd
 import time
 import re
+import asyncio
+import queue
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import (
     TimeoutException, NoSuchElementException, 
-    WebDriverException, StaleElementReferenceException
+    WebDriverException, StaleElementReferenceException, SessionNotCreatedException
 )
 import json
+import argparse
+import psutil
+from urllib.parse import urljoin
 import warnings
+from itertools import islice
+from records import empty_record, record_from_stub, stub_matches, RunSummary
+from metrics import RunMetrics
+from promoter_cache import PromoterCache
+from documents import DocumentFetcher
+from supervisor import BrowserWatchdog, NO_WATCHDOG, scrape_supervised, hang_clock_paused
+from sinks import open_sinks, HTMLSink, DEFAULT_FORMATS, SINK_TYPES
+from parallel import ParallelRERAScraper
+from jobstore import JobStore, checkpoint_stubs, checkpoint_results
+from incremental import SnapshotStore, IncrementalRefresh
+from extractors import parse_project_tab, parse_promoter_tab, collect_document_links
+from archive import PageArchive, reextract
+from drivers import resolve_chromedriver, forget_chromedriver, is_version_mismatch, launch_warm_browser
+from fastpath import RERAApiClient, DEFAULT_API_BASE, project_id_from_url
+from async_engine import AsyncTabEngine
+from ratelimit import HostRateController, NO_RATE_LIMIT, backoff_delay
+from workqueue import open_work_queue, enqueue_stubs, lease_stubs, post_results, wait_until_drained
+from browser_config import (
+    DEFAULT_STAGE_TIMEOUTS, BLOCKING_PROFILES, PAGE_WEIGHT_SCRIPT, NETWORK_QUIET_MS, PENDING_REQUESTS_HOOK,
+    NETWORK_IDLE_SCRIPT, NEXT_PAGE_XPATH, PROMOTER_TAB_XPATH, PROMOTER_TABLE_LABELS, PROJECT_CARD_SELECTOR,
+    blocked_url_patterns
+)
 warnings.filterwarnings('ignore')
 
+
+def network_idle(driver):
+    """Expected condition: document loaded, no XHR/fetch in flight, Angular stable"""
+    return driver.execute_script(NETWORK_IDLE_SCRIPT, NETWORK_QUIET_MS)
+
+
+def listing_changed(previous_text):
+    """Expected condition factory: first listing card no longer shows previous_text"""
+    def condition(driver):
+        cards = driver.find_elements(By.CSS_SELECTOR, PROJECT_CARD_SELECTOR)
+        return bool(cards) and cards[0].text.strip() != previous_text
+    return condition
+
+
+def cards_rendered(driver):
+    """Expected condition: listing cards present and filled with text"""
+    cards = driver.find_elements(By.CSS_SELECTOR, PROJECT_CARD_SELECTOR)
+    if cards and all(card.text.strip() for card in cards):
+        return cards
+    return False
+
+
+def detail_heading_populated(driver):
+    """Expected condition: detail page heading present with non-empty text"""
+    for heading in driver.find_elements(By.XPATH, "//h1 | //h2 | //h3"):
+        if heading.text.strip():
+            return heading
+    return False
+
+
+def promoter_table_ready(driver):
+    """Expected condition: promoter pane contains a populated label/value table"""
+    for row in driver.find_elements(By.XPATH, "//div[contains(@class, 'promoter')]//tr | //table//tr"):
+        cells = row.find_elements(By.TAG_NAME, "td")
+        if len(cells) > 1 and cells[1].text.strip():
+            label = cells[0].text
+            if any(key in label for key in PROMOTER_TABLE_LABELS):
+                return row
+    return False
+
+
 class EnhancedOdishaRERAProjectScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, stage_timeouts=None, archive=None, start_driver=True, blocking='media',
+                 attach_to=None, chromedriver_path=None, driver_version=None, metrics=None, rate_controller=None,
+                 promoter_cache=None, documents=None, watchdog=None, project_attempts=3):
         self.base_url = "https://rera.odisha.gov.in"
         self.projects_url = "https://rera.odisha.gov.in/projects/project-list"
         self.headless = headless
-        self.setup_driver()
+        self.blocking = blocking
+        self.attach_to = attach_to
+        self.chromedriver_path = chromedriver_path
+        self.driver_version = driver_version
+        self.stage_timeouts = dict(DEFAULT_STAGE_TIMEOUTS, **(stage_timeouts or {}))
+        self.archive = archive
+        self.metrics = metrics or RunMetrics()
+        self.rate_controller = rate_controller or NO_RATE_LIMIT
+        self.promoter_cache = promoter_cache
+        self.documents = documents
+        self.watchdog = watchdog or NO_WATCHDOG
+        self.project_attempts = project_attempts
+        if start_driver:
+            self.setup_driver()
     
     def setup_driver(self):
         """Setup Chrome WebDriver with optimized settings"""
+        with self.metrics.stage('driver_resolve'):
+            service = Service(resolve_chromedriver(self.chromedriver_path, self.driver_version))
+        profile = BLOCKING_PROFILES[self.blocking]
+        if self.attach_to:
+            self.attach_driver(service, profile)
+            return
+        
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument('--headless')
@@ -36,45 +125,219 @@ class EnhancedOdishaRERAProjectScraper:
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        if profile['prefs']:
+            chrome_options.add_experimental_option('prefs', profile['prefs'])
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        with self.metrics.stage('driver_start'):
+            self.driver = self.start_chrome(service, chrome_options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        self.wait = WebDriverWait(self.driver, 30)  # Increased timeout
+        self.prepare_session(profile)
+    
+    def attach_driver(self, service, profile):
+        """Drive a new tab of an already running Chrome instead of launching one"""
+        chrome_options = Options()
+        chrome_options.debugger_address = self.attach_to
+        self.driver = self.start_chrome(service, chrome_options)
+        # Workers sharing the browser each get their own tab
+        self.driver.switch_to.new_window('tab')
+        self.prepare_session(profile)
+    
+    def start_chrome(self, service, chrome_options):
+        """Start a WebDriver session, replacing a cached chromedriver that Chrome has updated past"""
+        try:
+            return webdriver.Chrome(service=service, options=chrome_options)
+        except SessionNotCreatedException as e:
+            if self.chromedriver_path or self.driver_version or not is_version_mismatch(e):
+                raise
+            print("   ⚠️ Cached chromedriver does not match the installed Chrome, fetching a matching one")
+            self.metrics.increment('driver_mismatches')
+            forget_chromedriver()
+            service = Service(resolve_chromedriver())
+            return webdriver.Chrome(service=service, options=chrome_options)
+    
+    def prepare_session(self, profile):
+        """Per-session hooks, blocking and timeouts shared by launched and attached browsers"""
+        self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': PENDING_REQUESTS_HOOK})
+        self.apply_blocking_profile(profile)
         self.driver.set_page_load_timeout(60)  # Increased page load timeout
     
-    def wait_and_load(self, url, wait_time=10):  # Increased wait time
-        """Navigate to URL and wait for page to load"""
+    def apply_blocking_profile(self, profile):
+        """Block the profile's URL patterns for this session through CDP"""
+        blocked = blocked_url_patterns(profile)
+        if not blocked:
+            return
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked})
+    
+    def page_weight(self):
+        """Bytes, request count, load time and JS heap of the page currently loaded"""
+        return self.driver.execute_script(PAGE_WEIGHT_SCRIPT)
+    
+    def browser_rss(self):
+        """Resident memory of chromedriver and every Chrome process it started"""
         try:
-            print(f"Loading: {url}")
-            self.driver.get(url)
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(wait_time)
+            root = psutil.Process(self.driver.service.process.pid)
+            return sum(proc.memory_info().rss for proc in [root] + root.children(recursive=True))
+        except (psutil.Error, AttributeError):
+            return 0
+    
+    def browser_alive(self):
+        """Whether chromedriver is running and its browser still answers (True before any browser is started)"""
+        if not hasattr(self, 'driver'):
             return True
+        try:
+            if self.driver.service.process and self.driver.service.process.poll() is not None:
+                return False
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+    
+    def kill_browser(self):
+        """Kill chromedriver and every browser process it started, so a WebDriver call stuck on them fails"""
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = root.children(recursive=True) + [root]
+        except (psutil.Error, AttributeError):
+            return
+        for proc in processes:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+    
+    def restart_driver(self):
+        """Replace a dead, hung or bloated browser with a fresh one"""
+        with self.metrics.stage('driver_recycle'):
+            self.cleanup()
+            self.setup_driver()
+    
+    def wait_for(self, condition, stage, description=None):
+        """Wait on a readiness condition within the stage's timeout budget"""
+        stage_wait = WebDriverWait(
+            self.driver, self.stage_timeouts[stage], poll_frequency=0.2,
+            ignored_exceptions=(StaleElementReferenceException, NoSuchElementException)
+        )
+        try:
+            with self.metrics.stage(f"wait_{stage}"):
+                return stage_wait.until(condition)
+        except TimeoutException:
+            print(f"   ⏱️ Timed out after {self.stage_timeouts[stage]}s waiting for {description or stage}")
+            self.metrics.increment('timeouts', stage)
+            return False
+    
+    def wait_for_network_idle(self):
+        """Wait until the XHR/fetch queue is empty and Angular is stable"""
+        return self.wait_for(network_idle, 'idle', 'network idle')
+    
+    def wait_and_load(self, url, ready=None, stage='page'):
+        """Navigate to URL and wait for the page (and optional condition) to be ready"""
+        try:
+            print(f"Loading: {url}")
+            with self.rate_controller.slot(url, waiting=hang_clock_paused) as request:
+                with self.metrics.stage('navigate'):
+                    self.driver.get(url)
+                self.wait_for(EC.presence_of_element_located((By.TAG_NAME, "body")), 'page', 'document body')
+                self.wait_for_network_idle()
+                is_ready = ready is None or bool(self.wait_for(ready, stage))
+                if not is_ready:
+                    request.fail()
+            return is_ready
         except Exception as e:
             print(f"Error loading {url}: {str(e)}")
+            self.metrics.increment('errors', 'load')
             return False
     
     def safe_get_text(self, element):
         """Safely extract text from element"""
         try:
             return element.text.strip() if element else ""
-        except (StaleElementReferenceException, WebDriverException):
+        except StaleElementReferenceException:
+            self.metrics.increment('stale_elements', 'text')
+            return ""
+        except WebDriverException:
             return ""
     
-    def find_project_cards(self):
+    def find_project_cards(self, limit=6):
         """Find project cards on the main listing page"""
-        if not self.wait_and_load(self.projects_url):
+        if not self.wait_and_load(self.projects_url, ready=cards_rendered, stage='listing'):
+            print(f"No project cards found with {PROJECT_CARD_SELECTOR}")
             return []
         
-        try:
-            self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.project-card")))
-            cards = self.driver.find_elements(By.CSS_SELECTOR, "div.project-card")
-            print(f"Found {len(cards)} cards using selector: div.project-card")
-            return cards[:6]
-        except TimeoutException:
-            print("No project cards found with div.project-card")
-            return []
+        cards = self.driver.find_elements(By.CSS_SELECTOR, PROJECT_CARD_SELECTOR)
+        print(f"Found {len(cards)} cards using selector: {PROJECT_CARD_SELECTOR}")
+        return cards[:limit] if limit else cards
+    
+    def first_card_text(self):
+        """Text of the first listing card, used to notice when the page has changed"""
+        cards = self.driver.find_elements(By.CSS_SELECTOR, PROJECT_CARD_SELECTOR)
+        return self.safe_get_text(cards[0]) if cards else ''
+    
+    def go_to_next_listing_page(self):
+        """Click the pagination Next control; False once there is no further page"""
+        next_links = self.driver.find_elements(By.XPATH, NEXT_PAGE_XPATH)
+        if not next_links:
+            return False
+        previous_text = self.first_card_text()
+        self.driver.execute_script("arguments[0].click();", next_links[0])
+        if not self.wait_for(listing_changed(previous_text), 'listing', 'next listing page'):
+            return False
+        return bool(self.wait_for(cards_rendered, 'listing', 'listing cards'))
+    
+    def restore_listing_page(self, page_number, expected_text):
+        """Get back to a listing page after a click-through reset the pagination"""
+        if self.first_card_text() == expected_text:
+            return
+        self.find_project_cards(limit=None)
+        for _ in range(page_number - 1):
+            if not self.go_to_next_listing_page():
+                break
+    
+    def stubs_from_current_page(self, page_number):
+        """Project stubs for every card on the listing page currently shown"""
+        cards = self.driver.find_elements(By.CSS_SELECTOR, PROJECT_CARD_SELECTOR)
+        page_text = self.first_card_text()
+        stubs = []
+        for index in range(len(cards)):
+            card = cards[index]
+            card_info = self.extract_card_info(card)
+            card_info['search_text'] = self.safe_get_text(card)
+            if not card_info['detail_url'] and card_info['view_details_btn']:
+                print("   🔗 No href on View Details, intercepting click target...")
+                card_info['detail_url'] = self.intercept_detail_url(card_info['view_details_btn'])
+                self.restore_listing_page(page_number, page_text)
+                # Navigating away and back invalidates the card elements
+                cards = self.driver.find_elements(By.CSS_SELECTOR, PROJECT_CARD_SELECTOR)
+            card_info.pop('view_details_btn')
+            stubs.append(card_info)
+        return stubs
+    
+    def iter_listing_pages(self):
+        """Walk every listing page, yielding the list of project stubs on each"""
+        if not self.find_project_cards(limit=None):
+            return
+        page_number = 1
+        while True:
+            print(f"   📄 Listing page {page_number}")
+            if self.archive:
+                self.archive.store(self.driver.page_source, 'listing', '', f"{self.projects_url}#page={page_number}")
+            with self.metrics.stage('listing_page'):
+                stubs = self.stubs_from_current_page(page_number)
+            yield stubs
+            with self.metrics.stage('next_listing_page'):
+                has_next = self.go_to_next_listing_page()
+            if not has_next:
+                break
+            page_number += 1
+    
+    def iter_project_stubs(self, start=0, limit=None, district=None, project_type=None, year=None):
+        """Lazily yield project stubs across the whole registry, filtered and sliced"""
+        stubs = (
+            stub
+            for page in self.iter_listing_pages()
+            for stub in page
+            if stub_matches(stub, district, project_type, year)
+        )
+        return islice(stubs, start, start + limit if limit else None)
     
     def extract_card_info(self, card):
         """Extract basic info from project card with enhanced selectors"""
@@ -82,6 +345,8 @@ class EnhancedOdishaRERAProjectScraper:
             'project_name': '',
             'rera_no': '',
             'promoter_name': '',
+            'project_status': '',
+            'detail_url': '',
             'view_details_btn': None
         }
         
@@ -96,7 +361,6 @@ class EnhancedOdishaRERAProjectScraper:
             # Extract RERA number with fallback
             try:
                 card_text = card.text
-                print(f"   Debug: Card text for RERA: {card_text[:200]}...")  # Debug output
                 match = re.search(r'(RP|PS)/\d{1,2}/\d{4}/\d{5}', card_text)
                 if match:
                     info['rera_no'] = match.group(0)
@@ -117,10 +381,19 @@ class EnhancedOdishaRERAProjectScraper:
             except Exception as e:
                 print(f"   Error extracting promoter name from card: {str(e)}")
             
+            # Extract project status (e.g. "Status: Ongoing") for change detection
+            try:
+                match = re.search(r'Status\s*:?\s*([^\n]+)', card.text)
+                if match:
+                    info['project_status'] = match.group(1).strip()
+            except Exception as e:
+                print(f"   Error extracting project status from card: {str(e)}")
+            
             # Find View Details button with broader selectors
             try:
                 btn = card.find_element(By.XPATH, ".//a[contains(text(), 'View Details') or contains(text(), 'Details') or contains(@class, 'view-details') or contains(@href, 'details')]")
                 info['view_details_btn'] = btn
+                info['detail_url'] = self.resolve_detail_url(btn)
             except Exception as e:
                 print(f"   Error finding View Details button: {str(e)}")
         
@@ -129,6 +402,82 @@ class EnhancedOdishaRERAProjectScraper:
         
         return info
     
+    def resolve_detail_url(self, button):
+        """Read the detail page URL from the button's href or Angular router link"""
+        for attribute in ('href', 'ng-reflect-router-link', 'routerlink'):
+            try:
+                target = button.get_attribute(attribute)
+            except StaleElementReferenceException:
+                self.metrics.increment('stale_elements', 'detail_url')
+                return ''
+            except WebDriverException:
+                return ''
+            if target and not target.startswith(('javascript:', '#')):
+                return urljoin(self.base_url + '/', target)
+        return ''
+    
+    def intercept_detail_url(self, button):
+        """Click View Details just to learn where it navigates, then return to the listing"""
+        listing_url = self.driver.current_url
+        self.driver.execute_script("arguments[0].click();", button)
+        if not self.wait_for(EC.url_changes(listing_url), 'detail', 'detail page navigation'):
+            return ''
+        detail_url = self.driver.current_url
+        with self.metrics.stage('back'):
+            self.driver.back()
+            self.wait_for(cards_rendered, 'listing', 'listing cards')
+        return detail_url
+    
+    def collect_project_stubs(self, limit=6, **filters):
+        """Walk the listing once and collect card info plus detail URL for each project"""
+        stubs = list(self.iter_project_stubs(limit=limit, **filters))
+        print(f"   🔗 Collected {sum(1 for stub in stubs if stub['detail_url'])}/{len(stubs)} detail URLs")
+        return stubs
+    
+    def empty_project_data(self, url=''):
+        """Blank record in the output schema"""
+        return empty_record(url)
+    
+    def scrape_project_detail(self, stub):
+        """Open a project's detail page by direct URL and extract its information"""
+        project_data = record_from_stub(stub)
+        
+        if not stub.get('detail_url'):
+            print("   ⚠️ No detail URL for this project")
+            return project_data
+        
+        with self.metrics.stage('detail_load'):
+            loaded = self.wait_and_load(stub['detail_url'], ready=detail_heading_populated, stage='detail')
+        if not loaded:
+            print("   ⚠️ Detail page did not become ready")
+            return project_data
+        
+        project_data['Project URL'] = self.driver.current_url
+        cached_promoter = self.promoter_cache.get(stub) if self.promoter_cache else None
+        detailed_info = self.extract_detailed_information(cached_promoter)
+        if self.promoter_cache and not cached_promoter:
+            self.promoter_cache.put(stub, detailed_info)
+        for key, value in detailed_info.items():
+            if value and value != "Not Available":
+                project_data[key] = value
+        self.archive_detail(project_data, cached_promoter)
+        if self.documents and project_data['RERA Regd. No']:
+            self.queue_documents(project_data['RERA Regd. No'])
+        
+        return project_data
+    
+    def queue_documents(self, rera_no):
+        """Hand the detail page's document links to the download pool, along with this browser's cookies"""
+        links = collect_document_links(self.last_page_sources, self.base_url)
+        if links:
+            self.documents.submit(rera_no, links, self.driver.get_cookies())
+    
+    def archive_detail(self, project_data, cached_promoter=None):
+        """Save the tab snapshots behind a record so it can be re-extracted offline"""
+        if self.archive and project_data['RERA Regd. No']:
+            self.archive.store_detail(project_data['RERA Regd. No'], project_data['Project URL'], self.last_page_sources,
+                                      cached_promoter)
+    
     def click_view_details_and_extract(self, card_info):
         """Click View Details button and extract detailed information"""
         project_data = {
@@ -148,31 +497,34 @@ class EnhancedOdishaRERAProjectScraper:
             button = card_info['view_details_btn']
             print(f"   🖱️ Clicking View Details button...")
             
+            listing_url = self.driver.current_url
             self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-            time.sleep(2)  # Increased wait
             self.driver.execute_script("arguments[0].click();", button)
             
-            self.wait.until(EC.presence_of_element_located((By.XPATH, "//h3 | //h2 | //h1")))
-            time.sleep(5)
+            self.wait_for(EC.url_changes(listing_url), 'detail', 'detail page navigation')
+            self.wait_for(detail_heading_populated, 'detail', 'detail heading')
+            self.wait_for_network_idle()
             project_data['Project URL'] = self.driver.current_url  # Capture URL after navigation
             
             detailed_info = self.extract_detailed_information()
             for key, value in detailed_info.items():
                 if value and value != "Not Available":
                     project_data[key] = value
+            self.archive_detail(project_data)
             
             # Navigate back
-            self.driver.back()
-            self.wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.project-card")))
-            time.sleep(5)
+            with self.metrics.stage('back'):
+                self.driver.back()
+                self.wait_for(cards_rendered, 'listing', 'listing cards')
             
         except Exception as e:
             print(f"   ❌ Error clicking View Details: {str(e)}")
+            self.metrics.increment('errors', 'click_through')
         
         return project_data
     
-    def extract_detailed_information(self):
-        """Extract detailed information from the details page with retries"""
+    def extract_detailed_information(self, cached_promoter=None):
+        """Extract detailed information from one page_source snapshot per tab, skipping the promoter tab if cached"""
         details = {
             'RERA Regd. No': 'Not Available',
             'Project Name': 'Not Available',
@@ -180,218 +532,93 @@ class EnhancedOdishaRERAProjectScraper:
             'Promoter Address': 'Not Available',
             'GST No': 'Not Available'
         }
+        self.last_page_sources = {'project': '', 'promoter': ''}
         
         try:
-            # Extract Project Name
-            try:
-                name_element = self.driver.find_element(By.CSS_SELECTOR, "h1, h2, h3, div.project-title, div[class*='title'], div[class*='name']")
-                details['Project Name'] = self.safe_get_text(name_element)
-            except Exception as e:
-                print(f"   Error extracting project name from detail page: {str(e)}")
-            
-            # Extract RERA Number with retry
-            retry_count = 0
+            # Snapshot the project tab, re-taking it only if the RERA number has not rendered yet
             max_retries = 3
-            while retry_count < max_retries:
-                try:
-                    page_source = self.driver.page_source
-                    print(f"   Debug: Searching page source for RERA: {details['Project Name']}")  # Debug output
-                    match = re.search(r'(RP|PS)/\d{1,2}/\d{4}/\d{5}', page_source)
-                    if match:
-                        details['RERA Regd. No'] = match.group(0)
-                        break
-                    else:
-                        details_section = self.driver.find_element(By.CSS_SELECTOR, "div.project-details, div.container, table, div.card-body, div[class*='details']")
-                        details_text = details_section.text
-                        match = re.search(r'(RP|PS)/\d{1,2}/\d{4}/\d{5}', details_text)
-                        if match:
-                            details['RERA Regd. No'] = match.group(0)
-                            break
-                    retry_count += 1
-                    time.sleep(3)
-                except Exception as e:
-                    print(f"   Error extracting RERA number from detail page (attempt {retry_count + 1}): {str(e)}")
-                    retry_count += 1
-                    time.sleep(3)
+            for attempt in range(1, max_retries + 1):
+                with self.metrics.stage('project_tab_parse'):
+                    project_source = self.driver.page_source
+                    project_details = parse_project_tab(project_source)
+                if project_details['RERA Regd. No'] != 'Not Available' or attempt == max_retries:
+                    break
+                print(f"   ⚠️ RERA number not rendered yet (attempt {attempt})")
+                self.metrics.increment('retries', 'rera_snapshot')
+                self.wait_for_network_idle()
+            self.last_page_sources['project'] = project_source
+            details.update(project_details)
+            if cached_promoter:
+                print("   ♻️ Promoter details from cache, skipping the Promoter Details tab")
+                details.update(cached_promoter)
+                return details
             
             # Click Promoter Details tab with retries
             retry_count = 0
             max_retries = 3
+            promoter_click_started = time.perf_counter()
             while retry_count < max_retries:
+                if retry_count:
+                    self.metrics.increment('retries', 'promoter_click')
                 try:
-                    tab = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Promoter Details') or contains(text(), 'Promoter') or contains(@href, 'promoter')]")))
+                    tab = self.wait_for(EC.element_to_be_clickable((By.XPATH, PROMOTER_TAB_XPATH)), 'promoter',
+                                        'Promoter Details tab')
+                    if not tab:
+                        raise TimeoutException("Promoter Details tab not clickable")
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", tab)
-                    time.sleep(2)
                     self.driver.execute_script("arguments[0].click();", tab)
-                    time.sleep(10)  # Increased wait for dynamic content
                     print("   ✅ Clicked Promoter Details tab")
                     
-                    # Wait for promoter details to load
-                    self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.promoter-details, table, div.container, div[class*='promoter']")))
-                    break
-                except Exception as e:
-                    print(f"   ⚠️ Promoter Details tab not found or not clickable (attempt {retry_count + 1}): {str(e)}")
-                    retry_count += 1
-                    time.sleep(3)
-            
-            # Extract Promoter Name
-            try:
-                promoter_element = self.driver.find_element(By.XPATH, "//*[contains(text(), 'Name') or contains(text(), 'Proprietor') or contains(text(), 'Individual') or contains(text(), 'M/S')]/following-sibling::* | //*[contains(text(), 'M/S')] | //*[contains(@class, 'promoter-name')]")
-                promoter_text = self.safe_get_text(promoter_element)
-                if promoter_text and len(promoter_text) > 3 and 'Name' not in promoter_text:
-                    details['Promoter Name'] = promoter_text
-            except Exception as e:
-                print(f"   Error extracting promoter name: {str(e)}")
-            
-            # Extract Promoter Address
-            try:
-                address_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Address')]/following-sibling::* | //*[contains(text(), 'Address')]/..//* | //div[contains(@class, 'address')] | //*[contains(@class, 'address')]")
-                address_text = ""
-                for elem in address_elements:
-                    text = self.safe_get_text(elem)
-                    if len(text) > 10 and 'Address' not in text:
-                        address_text = text
-                        break
-                
-                if not address_text:
-                    try:
-                        table = self.driver.find_element(By.CSS_SELECTOR, "table")
-                        rows = table.find_elements(By.TAG_NAME, "tr")
-                        for row in rows:
-                            if 'Address' in row.text:
-                                cells = row.find_elements(By.TAG_NAME, "td")
-                                if len(cells) > 1:
-                                    address_text = self.safe_get_text(cells[1])
-                                    if len(address_text) > 10:
-                                        break
-                    except:
-                        pass
-                
-                if address_text and len(address_text) > 10:
-                    details['Promoter Address'] = address_text
-            except Exception as e:
-                print(f"   Error extracting promoter address: {str(e)}")
-            
-            # Extract GST Number with retry
-            retry_count = 0
-            max_retries = 3
-            while retry_count < max_retries:
-                try:
-                    promoter_section = self.driver.find_element(By.CSS_SELECTOR, "div.promoter-details, table, div.container, div[class*='promoter']")
-                    promoter_text = promoter_section.text
-                    print(f"   Debug: Promoter section text for GST: {promoter_text[:200]}...")  # Debug output
-                    match = re.search(r'[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[0-9]{1}[Z]{1}[0-9A-Z]{1}', promoter_text)
-                    if match:
-                        details['GST No'] = match.group(0)
+                    # Wait for the promoter pane's label/value table to be filled in
+                    if self.wait_for(promoter_table_ready, 'promoter', 'promoter details table'):
                         break
-                    else:
-                        # Enhanced table parsing
-                        try:
-                            table = promoter_section.find_element(By.CSS_SELECTOR, "table")
-                            rows = table.find_elements(By.TAG_NAME, "tr")
-                            for row in rows:
-                                row_text = row.text
-                                print(f"   Debug: Table row for GST: {row_text}")  # Debug output
-                                if 'GST' in row_text or 'Tax' in row_text:
-                                    cells = row.find_elements(By.TAG_NAME, "td")
-                                    if len(cells) > 1:
-                                        gst_text = self.safe_get_text(cells[1])
-                                        match = re.search(r'[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[0-9]{1}[Z]{1}[0-9A-Z]{1}', gst_text)
-                                        if match:
-                                            details['GST No'] = match.group(0)
-                                            break
-                        except:
-                            pass
-                    
-                    # Fallback: Search entire page source
-                    if details['GST No'] == 'Not Available':
-                        page_source = self.driver.page_source
-                        match = re.search(r'[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[0-9]{1}[Z]{1}[0-9A-Z]{1}', page_source)
-                        if match:
-                            details['GST No'] = match.group(0)
-                            break
-                    
                     retry_count += 1
-                    time.sleep(3)
                 except Exception as e:
-                    print(f"   Error extracting GST number (attempt {retry_count + 1}): {str(e)}")
+                    print(f"   ⚠️ Promoter Details tab not found or not clickable (attempt {retry_count + 1}): {str(e)}")
+                    if isinstance(e, StaleElementReferenceException):
+                        self.metrics.increment('stale_elements', 'promoter_click')
                     retry_count += 1
-                    time.sleep(3)
+                    self.wait_for_network_idle()
+                    time.sleep(backoff_delay(retry_count, base=0.25, cap=4))
+            self.metrics.observe('promoter_click', time.perf_counter() - promoter_click_started)
+            
+            # Snapshot the promoter tab, re-taking it only if the GST number has not rendered yet
+            for attempt in range(1, max_retries + 1):
+                with self.metrics.stage('promoter_tab_parse'):
+                    promoter_source = self.driver.page_source
+                    promoter_details = parse_promoter_tab(promoter_source)
+                if promoter_details['GST No'] != 'Not Available' or attempt == max_retries:
+                    break
+                print(f"   ⚠️ GST number not rendered yet (attempt {attempt})")
+                self.metrics.increment('retries', 'gst_snapshot')
+                self.wait_for_network_idle()
+            self.last_page_sources['promoter'] = promoter_source
+            details.update(promoter_details)
         
         except Exception as e:
             print(f"   ❌ Error extracting detailed information: {str(e)}")
+            self.metrics.increment('errors', 'extract')
         
         return details
     
     def generate_html_table(self, projects_data, filename='enhanced_odisha_rera_top6_projects.html'):
         """Generate an HTML file with a styled table of project data"""
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Odisha RERA Registered Projects</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-</head>
-<body class="bg-gray-100">
-    <div class="container mx-auto py-8 px-4">
-        <h1 class="text-3xl font-bold text-center mb-8">Odisha RERA Registered Projects</h1>
-        <div class="overflow-x-auto">
-            <table class="min-w-full bg-white shadow-md rounded-lg">
-                <thead class="bg-gray-800 text-white">
-                    <tr>
-                        <th class="py-3 px-4 text-left">Project Name</th>
-                        <th class="py-3 px-4 text-left">RERA Regd. No</th>
-                        <th class="py-3 px-4 text-left">Promoter Name</th>
-                        <th class="py-3 px-4 text-left">Promoter Address</th>
-                        <th class="py-3 px-4 text-left">GST No</th>
-                        <th class="py-3 px-4 text-left">Project URL</th>
-                    </tr>
-                </thead>
-                <tbody>
-"""
+        sink = HTMLSink(filename)
         for project in projects_data:
-            html_content += """
-                    <tr class="border-b hover:bg-gray-50">
-                        <td class="py-3 px-4">{}</td>
-                        <td class="py-3 px-4">{}</td>
-                        <td class="py-3 px-4">{}</td>
-                        <td class="py-3 px-4">{}</td>
-                        <td class="py-3 px-4">{}</td>
-                        <td class="py-3 px-4"><a href="{}" class="text-blue-600 hover:underline" target="_blank">{}</a></td>
-                    </tr>
-""".format(
-                project.get('Project Name', 'Not Available'),
-                project.get('RERA Regd. No', 'Not Available'),
-                project.get('Promoter Name', 'Not Available'),
-                project.get('Promoter Address', 'Not Available'),
-                project.get('GST No', 'Not Available'),
-                project.get('Project URL', '#'),
-                project.get('Project URL', 'Not Available')[:50] + "..." if project.get('Project URL') else 'Not Available'
-            )
-        
-        html_content += """
-                </tbody>
-            </table>
-        </div>
-        <p class="text-center mt-4 text-gray-600">Generated on {}</p>
-    </div>
-</body>
-</html>
-""".format(time.strftime("%Y-%m-%d %H:%M:%S"))
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            sink.write(project)
+        sink.close()
         
         print(f"   📄 {filename}")
-        return html_content
+        return filename
     
-    def scrape_top_6_projects(self):
+    def scrape_top_6_projects(self, deep_link=True):
         """Main method to scrape top 6 projects"""
         print("🚀 Starting Enhanced Odisha RERA Top 6 Projects Scraping...")
         print("=" * 70)
         
+        if deep_link:
+            return self.scrape_by_deep_link()
+        
         all_projects = []
         
         for i in range(1, 7):
@@ -399,14 +626,7 @@ class EnhancedOdishaRERAProjectScraper:
             project_cards = self.find_project_cards()
             if not project_cards or i > len(project_cards):
                 print("   ❌ Insufficient project cards found!")
-                all_projects.append({
-                    'Project URL': self.driver.current_url,
-                    'RERA Regd. No': '',
-                    'Project Name': '',
-                    'Promoter Name': '',
-                    'Promoter Address': '',
-                    'GST No': ''
-                })
+                all_projects.append(self.empty_project_data(self.driver.current_url))
                 continue
             
             card = project_cards[i-1]
@@ -421,7 +641,8 @@ class EnhancedOdishaRERAProjectScraper:
                     print(f"   🏷️ RERA: {card_info['rera_no']}")
                     print(f"   🏢 Promoter: {card_info['promoter_name']}")
                     
-                    project_data = self.click_view_details_and_extract(card_info)
+                    with self.metrics.stage('project'):
+                        project_data = self.click_view_details_and_extract(card_info)
                     if any(project_data[key] for key in ['RERA Regd. No', 'Project Name', 'Promoter Name']):
                         print(f"   ✅ Success: {project_data['Project Name']} - {project_data['RERA Regd. No']}")
                         if project_data['GST No'] and project_data['GST No'] != 'Not Available':
@@ -435,7 +656,8 @@ class EnhancedOdishaRERAProjectScraper:
                 except StaleElementReferenceException:
                     retry_count += 1
                     print(f"   Retry {retry_count}/{max_retries} due to stale element")
-                    time.sleep(2)
+                    self.metrics.increment('stale_elements', 'card')
+                    self.metrics.increment('retries', 'card')
                     if retry_count < max_retries:
                         project_cards = self.find_project_cards()
                         if i <= len(project_cards):
@@ -444,51 +666,65 @@ class EnhancedOdishaRERAProjectScraper:
                             break
                 except Exception as e:
                     print(f"   ❌ Error processing project {i}: {str(e)}")
-                    all_projects.append({
-                        'Project URL': self.driver.current_url,
-                        'RERA Regd. No': '',
-                        'Project Name': '',
-                        'Promoter Name': '',
-                        'Promoter Address': '',
-                        'GST No': ''
-                    })
-                    break
+                    if self.browser_alive():
+                        break
+                    # The browser died under us: retry the card in a new one rather than keep a blank row
+                    retry_count += 1
+                    self.metrics.increment('browser_restarts', 'crash')
+                    self.restart_driver()
+                    project_cards = self.find_project_cards()
+                    if i <= len(project_cards):
+                        card = project_cards[i-1]
+                    else:
+                        break
             
             if not project_data:
-                all_projects.append({
-                    'Project URL': self.driver.current_url,
-                    'RERA Regd. No': '',
-                    'Project Name': '',
-                    'Promoter Name': '',
-                    'Promoter Address': '',
-                    'GST No': ''
-                })
+                all_projects.append(self.empty_project_data(
+                    self.driver.current_url if self.browser_alive() else self.projects_url
+                ))
         
         return all_projects
     
-    def save_results(self, projects_data, filename='enhanced_odisha_rera_top6_projects'):
-        """Save results to CSV, JSON, and HTML files"""
+    def scrape_by_deep_link(self, limit=6):
+        """Collect detail URLs from the listing once, then visit each detail page directly"""
+        stubs = self.collect_project_stubs(limit)
+        if not stubs:
+            print("   ❌ No project cards found!")
+            return []
+        return [record for _, record in self.scrape_stubs(stubs, total=len(stubs))]
+    
+    def scrape_stubs(self, stubs, total=None):
+        """Visit each stub's detail page in turn, yielding (stub, record) as they are produced"""
+        for i, stub in enumerate(stubs, 1):
+            print(f"\n🔍 Processing Project {i}/{total or '?'}...")
+            print(f"   📌 Project: {stub['project_name']}")
+            print(f"   🏷️ RERA: {stub['rera_no']}")
+            print(f"   🏢 Promoter: {stub['promoter_name']}")
+            project_data = scrape_supervised(self, stub, self.watchdog, self.metrics, self.project_attempts)
+            
+            if any(project_data[key] for key in ['RERA Regd. No', 'Project Name', 'Promoter Name']):
+                print(f"   ✅ Success: {project_data['Project Name']} - {project_data['RERA Regd. No']}")
+                if project_data['GST No'] and project_data['GST No'] != 'Not Available':
+                    print(f"      💼 GST No: {project_data['GST No']}")
+            else:
+                print(f"   ⚠️ Limited data extracted")
+            yield stub, project_data
+    
+    def save_results(self, projects_data, filename='enhanced_odisha_rera_top6_projects', formats=DEFAULT_FORMATS):
+        """Save results to CSV, JSON, and HTML files (or any other sink formats)"""
         if not projects_data:
             print("❌ No data to save!")
             return
         
-        csv_file = f"{filename}.csv"
-        df = pd.DataFrame(projects_data)
-        df.to_csv(csv_file, index=False, encoding='utf-8')
-        
-        json_file = f"{filename}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(projects_data, f, indent=2, ensure_ascii=False)
-        
-        html_file = f"{filename}.html"
-        self.generate_html_table(projects_data, html_file)
+        with open_sinks(filename, formats) as output:
+            for project in projects_data:
+                output.write(project)
         
         print(f"\n💾 Files saved:")
-        print(f"   📄 {csv_file}")
-        print(f"   📄 {json_file}")
-        print(f"   📄 {html_file}")
+        for output_file in output.filenames:
+            print(f"   📄 {output_file}")
         
-        return df
+        return output.filenames
     
     def display_results(self, projects_data):
         """Display results in a formatted table"""
@@ -513,45 +749,544 @@ class EnhancedOdishaRERAProjectScraper:
         """Close browser and cleanup"""
         try:
             if hasattr(self, 'driver'):
+                if self.attach_to:
+                    # Only close our tab; the warm browser stays up for the next job
+                    self.driver.close()
                 self.driver.quit()
         except:
             pass
 
-def main():
+class FastPathRERAScraper(EnhancedOdishaRERAProjectScraper):
+    """Scrape through the portal's JSON endpoints, starting Chrome only for projects that need the fallback"""
+    def __init__(self, api_client, headless=False, stage_timeouts=None, archive=None, **driver_options):
+        super().__init__(headless, stage_timeouts, archive, start_driver=False, **driver_options)
+        self.api = api_client
+        self.fallbacks = 0
+    
+    def iter_listing_pages(self):
+        """Page through the listing endpoint, falling back to the rendered listing if it fails"""
+        try:
+            first_page = self.api.fetch_listing(page=1)
+        except Exception as e:
+            print(f"   ⚠️ Listing API failed: {str(e)}")
+            first_page = []
+        if not first_page:
+            self.ensure_driver()
+            yield from super().iter_listing_pages()
+            return
+        
+        print(f"   ⚡ Fast path: listing page 1 ({len(first_page)} projects)")
+        self.archive_listing(1)
+        yield first_page
+        more_pages = self.api.iter_listing(start_page=2, previous_ids=[stub['project_id'] for stub in first_page])
+        for page_number, page in enumerate(more_pages, 2):
+            self.archive_listing(page_number)
+            yield page
+    
+    def archive_listing(self, page_number):
+        """Archive the listing response that was just fetched"""
+        if self.archive:
+            self.archive.store(self.api.last_response_text, 'api-listing', '', f"{self.api.api_base}#page={page_number}")
+    
+    def scrape_project_detail(self, stub):
+        """Fetch one project over HTTP, using Selenium only if the fast path fails"""
+        project_id = stub.get('project_id') or project_id_from_url(stub.get('detail_url', ''))
+        try:
+            cached_promoter = self.promoter_cache.get(stub) if self.promoter_cache else None
+            with self.metrics.stage('api_project'):
+                project_data = self.api.fetch_project(project_id, stub.get('detail_url', ''), cached_promoter)
+            if self.promoter_cache and not cached_promoter:
+                self.promoter_cache.put(stub, project_data)
+            if self.archive and project_data['RERA Regd. No']:
+                for kind, payload in self.api.last_payloads.items():
+                    self.archive.store(payload, kind, project_data['RERA Regd. No'], project_data['Project URL'])
+                if cached_promoter:
+                    self.archive.store_cached_promoter(project_data['RERA Regd. No'], project_data['Project URL'],
+                                                       cached_promoter)
+            if project_data['RERA Regd. No'] and project_data['Promoter Name']:
+                for key, value in record_from_stub(stub).items():
+                    if value and not project_data[key]:
+                        project_data[key] = value
+                return project_data
+            print("   ⚠️ Fast path returned incomplete data, falling back to Selenium")
+            self.metrics.increment('fallbacks', 'incomplete')
+        except Exception as e:
+            print(f"   ⚠️ Fast path failed ({str(e)}), falling back to Selenium")
+            self.metrics.increment('fallbacks', 'error')
+        
+        self.fallbacks += 1
+        self.ensure_driver()
+        return super().scrape_project_detail(stub)
+    
+    def ensure_driver(self):
+        """Start Chrome the first time a fallback needs it"""
+        if not hasattr(self, 'driver'):
+            self.setup_driver()
+    
+    def restart_driver(self):
+        """Replace the fallback browser, if one was started; the HTTP session needs no recycling"""
+        if hasattr(self, 'driver'):
+            with self.metrics.stage('driver_recycle'):
+                super().cleanup()
+                self.setup_driver()
+    
+    def cleanup(self):
+        """Close the HTTP session and the fallback browser, if one was started"""
+        self.api.close()
+        super().cleanup()
+
+class AsyncTabRERAScraper(EnhancedOdishaRERAProjectScraper):
+    """Scrape with many tabs of one browser, driven by an asyncio event loop on a background thread"""
+    def __init__(self, tabs=8, headless=False, stage_timeouts=None, archive=None, blocking='media', attach_to=None,
+                 metrics=None, per_host_limit=2, min_interval=0.5, recycle_after=50, promoter_cache=None,
+                 documents=None, rate_controller=None, **driver_options):
+        super().__init__(headless, stage_timeouts, archive, start_driver=False, blocking=blocking,
+                         attach_to=attach_to, metrics=metrics, rate_controller=rate_controller,
+                         promoter_cache=promoter_cache, documents=documents, **driver_options)
+        self.engine = AsyncTabEngine(
+            tabs=tabs, headless=headless, blocked_urls=blocked_url_patterns(BLOCKING_PROFILES[blocking]),
+            stage_timeouts=self.stage_timeouts, archive=archive, metrics=self.metrics, attach_to=attach_to,
+            per_host_limit=per_host_limit, min_interval=min_interval, recycle_after=recycle_after,
+            promoter_cache=promoter_cache, documents=documents, rate_controller=rate_controller,
+        )
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+        self.run(self.engine.start())
+    
+    def run(self, coroutine):
+        """Run a coroutine on the engine's event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+    
+    def iter_listing_pages(self):
+        """Walk every listing page in one tab, yielding the list of project stubs on each"""
+        pages = self.engine.iter_listing_pages()
+        while True:
+            try:
+                yield self.run(pages.__anext__())
+            except StopAsyncIteration:
+                return
+    
+    def scrape_project_detail(self, stub):
+        """Scrape one project in its own tab"""
+        return self.run(self.engine.scrape_one(stub))
+    
+    def scrape_stubs(self, stubs, total=None):
+        """Scrape the stubs concurrently across the engine's tabs, yielding (stub, record) as they finish"""
+        results = queue.Queue()
+        
+        async def stub_source():
+            # The stubs may come from a blocking iterator (the listing, a job store), so read it off the loop
+            stub_iter = iter(stubs)
+            while True:
+                stub = await asyncio.to_thread(next, stub_iter, None)
+                if stub is None:
+                    return
+                yield stub
+        
+        async def pump():
+            try:
+                async for item in self.engine.crawl(stub_source()):
+                    results.put(item)
+            finally:
+                results.put(None)
+        
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        for i, (stub, project_data) in enumerate(iter(results.get, None), 1):
+            print(f"   ✅ {i}/{total or '?'}: {project_data['Project Name']} - {project_data['RERA Regd. No']}")
+            yield stub, project_data
+        future.result()
+    
+    def cleanup(self):
+        """Close the engine's browser and stop its event loop"""
+        try:
+            self.run(self.engine.close())
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=10)
+        self.loop.close()
+
+def compare_blocking_profiles(profiles, pages=3, filename='blocking_comparison.json'):
+    """Load the listing and a few detail pages under each blocking profile and report their cost"""
+    report = {}
+    for name in profiles:
+        print(f"\n🧪 Measuring blocking profile '{name}'...")
+        scraper = EnhancedOdishaRERAProjectScraper(headless=True, blocking=name)
+        try:
+            started = time.perf_counter()
+            stubs = scraper.collect_project_stubs(limit=pages)
+            samples = [dict(scraper.page_weight(), wall_s=time.perf_counter() - started)]
+            for stub in stubs:
+                started = time.perf_counter()
+                if not stub['detail_url'] or not scraper.wait_and_load(stub['detail_url'], ready=detail_heading_populated, stage='detail'):
+                    continue
+                samples.append(dict(scraper.page_weight(), wall_s=time.perf_counter() - started))
+            report[name] = {
+                'pages': len(samples),
+                'avg_wall_s': round(sum(x['wall_s'] for x in samples) / len(samples), 3),
+                'avg_load_ms': round(sum(x['load_ms'] for x in samples) / len(samples), 1),
+                'avg_bytes': int(sum(x['bytes'] for x in samples) / len(samples)),
+                'avg_requests': round(sum(x['requests'] for x in samples) / len(samples), 1),
+                'browser_rss_mb': round(scraper.browser_rss() / 1024 / 1024, 1),
+            }
+        finally:
+            scraper.cleanup()
+    
+    print(f"\n{'Profile':10} {'Wall s':>8} {'Load ms':>9} {'KB/page':>9} {'Requests':>9} {'RSS MB':>8}")
+    for name, row in report.items():
+        print(f"{name:10} {row['avg_wall_s']:>8} {row['avg_load_ms']:>9} {row['avg_bytes'] // 1024:>9} "
+              f"{row['avg_requests']:>9} {row['browser_rss_mb']:>8}")
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"   📄 {filename}")
+    return report
+
+def parse_args(argv=None):
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Scrape registered projects from the Odisha RERA portal")
+    parser.add_argument('--headless', action='store_true', help="Run Chrome without a visible window")
+    parser.add_argument('--blocking', choices=sorted(BLOCKING_PROFILES), default='media',
+                        help="Which page resources Chrome skips downloading (default: images, fonts and media)")
+    parser.add_argument('--chromedriver', metavar='PATH',
+                        help="Use this chromedriver binary (also read from $CHROMEDRIVER_PATH)")
+    parser.add_argument('--driver-version', metavar='VERSION',
+                        help="Pin the chromedriver version; it is downloaded once and then used from the local cache")
+    parser.add_argument('--attach', metavar='HOST:PORT',
+                        help="Attach to a Chrome already running with --remote-debugging-port instead of launching one")
+    parser.add_argument('--warm-browser', type=int, metavar='PORT',
+                        help="Attach to the warm Chrome on PORT, launching it first if needed; it keeps running after the scrape")
+    parser.add_argument('--output', default='enhanced_odisha_rera_top6_projects',
+                        help="Base name of the output files")
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help=f"Comma-separated output formats from: {', '.join(SINK_TYPES)}")
+    parser.add_argument('--flush-every', type=int, default=50,
+                        help="Flush output files after this many records so partial results are usable (0: every 30s only)")
+    parser.add_argument('--metrics', default='rera_metrics.json', metavar='PATH',
+                        help="Where to write per-stage timings, retry/timeout counters and field hit rates")
+    parser.add_argument('--prometheus-textfile', metavar='PATH',
+                        help="Also write the run metrics as a Prometheus textfile (for node_exporter's textfile collector)")
+    parser.add_argument('--compare-blocking', type=int, metavar='PAGES',
+                        help="Measure load time, bytes and browser memory for PAGES detail pages under every blocking profile, then exit")
+    parser.add_argument('--click-through', action='store_true',
+                        help="Click View Details and go back for each project instead of opening detail URLs directly")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of parallel detail-page workers (headless Chrome, or API sessions with --fast)")
+    parser.add_argument('--async-tabs', type=int, metavar='N',
+                        help="Drive N concurrent tabs of one browser from an asyncio event loop instead of Selenium (needs playwright)")
+    parser.add_argument('--recycle-after', type=int, default=50,
+                        help="Restart each worker's browser after this many pages")
+    parser.add_argument('--project-timeout', type=float, default=300,
+                        help="Kill a browser that spends longer than this many seconds on one project, then retry the "
+                             "project in a fresh one; time waiting on rate limits does not count (default: 300)")
+    parser.add_argument('--max-browser-rss', type=int, default=2048, metavar='MB',
+                        help="Recycle a browser whose processes use more memory than this after its current project, "
+                             "or kill it at twice this (default: 2048)")
+    parser.add_argument('--per-host-limit', type=int, default=2,
+                        help="Maximum concurrent requests to the portal across all workers")
+    parser.add_argument('--min-interval', type=float, default=0.5,
+                        help="Minimum seconds between request starts to the portal")
+    parser.add_argument('--target-latency', type=float, default=10,
+                        help="Page loads or API calls slower than this many seconds shrink the adaptive concurrency limit")
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                        help="Pause the crawl after this many consecutive failed loads or API calls")
+    parser.add_argument('--breaker-cooldown', type=float, default=60,
+                        help="Seconds the crawl pauses when the portal is struggling (doubles while it stays down)")
+    parser.add_argument('--fast', action='store_true',
+                        help="Use the portal's JSON endpoints over HTTP, falling back to Selenium per project")
+    parser.add_argument('--api-base', default=DEFAULT_API_BASE,
+                        help="Base URL of the portal's JSON API (point at fixture_server.py for offline runs)")
+    parser.add_argument('--record-fixtures', metavar='DIR',
+                        help="Save every API response under DIR for replay with fixture_server.py")
+    parser.add_argument('--all', action='store_true', help="Crawl every listing page of the registry")
+    parser.add_argument('--start', type=int, default=0, help="Skip this many matching projects")
+    parser.add_argument('--limit', type=int, default=6, help="Stop after this many matching projects (ignored with --all)")
+    parser.add_argument('--district', help="Only projects whose listing card mentions this district")
+    parser.add_argument('--project-type', help="Only projects whose listing card mentions this project type")
+    parser.add_argument('--year', type=int, help="Only projects registered in this year")
+    parser.add_argument('--job-store', metavar='PATH',
+                        help="Checkpoint every project to this SQLite file and resume from it after a crash")
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help="Give up on a project after this many failed attempts across runs, or after this many "
+                             "browsers were lost on it in one run")
+    parser.add_argument('--fresh', action='store_true', help="Discard the job store's previous progress first")
+    parser.add_argument('--incremental', metavar='PATH',
+                        help="Only scrape projects that are new or whose listing card changed since the snapshot in PATH")
+    parser.add_argument('--changes-report', default='rera_changes.json',
+                        help="Where --incremental writes its change-set report")
+    parser.add_argument('--archive', metavar='DIR',
+                        help="Keep a compressed copy of every fetched listing, detail and promoter page in DIR")
+    parser.add_argument('--reextract', metavar='DIR',
+                        help="Rebuild the output files from an archive made with --archive, without any network access")
+    parser.add_argument('--role', choices=('coordinator', 'worker'),
+                        help="Distributed crawl: the coordinator enqueues listing stubs and collects the output, "
+                             "workers on any number of nodes lease and scrape them")
+    parser.add_argument('--queue', default='rera_queue.sqlite3', metavar='URL',
+                        help="Shared work queue for --role: redis://host:6379/0, or a SQLite file path for local runs")
+    parser.add_argument('--lease-seconds', type=int, default=600,
+                        help="A leased project goes back on the queue if its worker has not posted it within this time")
+    parser.add_argument('--poll-interval', type=float, default=5,
+                        help="Seconds between queue polls while waiting for work or for the workers to finish")
+    parser.add_argument('--promoter-cache', metavar='PATH',
+                        help="SQLite file caching promoter details across projects and runs, so a developer's "
+                             "Promoter Details tab is opened once (e.g. rera_promoters.sqlite3)")
+    parser.add_argument('--promoter-ttl-days', type=float, default=30,
+                        help="Re-read cached promoter details older than this (default: 30)")
+    parser.add_argument('--promoter-cache-size', type=int, default=20000,
+                        help="Most promoters kept in the cache, least recently used dropped first (default: 20000)")
+    parser.add_argument('--documents', metavar='DIR',
+                        help="Also download each project's linked documents (certificates, plans, progress reports) "
+                             "into DIR, deduplicated by content hash, with a manifest per RERA number")
+    parser.add_argument('--document-workers', type=int, default=4,
+                        help="Concurrent document downloads, independent of the browsers (default: 4)")
+    parser.add_argument('--reextract-workers', type=int, help="Processes used by --reextract (default: all cores)")
+    args = parser.parse_args(argv)
+    if args.role and (args.job_store or args.incremental):
+        parser.error("--role keeps its progress in the work queue; drop --job-store / --incremental")
+    if args.job_store and args.incremental:
+        # A resumed job store replays only pending stubs, so the snapshot would never see the listing
+        parser.error("--incremental already skips projects scraped in earlier or interrupted runs; drop --job-store")
+    return args
+
+def stub_filters(args):
+    """Listing filters and slice taken from the command line"""
+    return {
+        'start': args.start,
+        'limit': None if args.all else args.limit,
+        'district': args.district,
+        'project_type': args.project_type,
+        'year': args.year,
+    }
+
+def open_job_store(args, filters):
+    """Open the checkpoint store, deciding whether the listing still needs walking"""
+    store = JobStore(args.job_store)
+    if args.fresh:
+        store.reset()
+    filters_key = json.dumps(filters, sort_keys=True)
+    if store.get_meta('filters') != filters_key:
+        store.set_meta('filters', filters_key)
+        store.set_meta('listing_complete', '')
+    counts = store.counts()
+    if counts:
+        print(f"💾 Resuming from {args.job_store}: {counts}")
+    return store
+
+def driver_options(args):
+    """Browser provisioning settings shared by the main scraper and every worker"""
+    return {
+        'blocking': args.blocking,
+        'attach_to': args.attach,
+        'chromedriver_path': args.chromedriver,
+        'driver_version': args.driver_version,
+    }
+
+def worker_scraper(scraper, args):
+    """A detail-page worker set up like the listing scraper; fast-path workers get their own API session,
+    since the client keeps the last responses of the project it is fetching"""
+    options = dict(
+        headless=True, stage_timeouts=scraper.stage_timeouts, archive=scraper.archive,
+        metrics=scraper.metrics, rate_controller=scraper.rate_controller, promoter_cache=scraper.promoter_cache,
+        documents=scraper.documents, **driver_options(args)
+    )
+    if isinstance(scraper, FastPathRERAScraper):
+        return FastPathRERAScraper(scraper.api.clone(), **options)
+    return EnhancedOdishaRERAProjectScraper(**options)
+
+def scrape_in_parallel(scraper, stubs, args):
+    """Stream stubs from the listing scraper to a pool of detail-page workers"""
+    pool = ParallelRERAScraper(
+        lambda: worker_scraper(scraper, args),
+        workers=args.workers,
+        recycle_after=args.recycle_after,
+        metrics=scraper.metrics,
+        watchdog=scraper.watchdog,
+        max_attempts=scraper.project_attempts,
+    )
+    return pool.iter_scrape(stubs)
+
+
+def main(args=None):
     """Main execution function"""
+    if args is None:
+        args = parse_args([])
+    summary = RunSummary()
+    if args.compare_blocking:
+        compare_blocking_profiles(BLOCKING_PROFILES, pages=args.compare_blocking)
+        return summary
+    if args.warm_browser:
+        _, args.attach = launch_warm_browser(args.warm_browser, headless=args.headless)
+    metrics = RunMetrics()
+    rate_controller = HostRateController(
+        args.per_host_limit, args.min_interval, args.target_latency, args.breaker_threshold, args.breaker_cooldown,
+        metrics=metrics,
+    )
+    promoter_cache = None
+    if args.promoter_cache:
+        promoter_cache = PromoterCache(args.promoter_cache, ttl=args.promoter_ttl_days * 86400,
+                                       max_entries=args.promoter_cache_size, metrics=metrics)
+    watchdog = BrowserWatchdog(args.project_timeout, args.max_browser_rss, metrics=metrics).start()
+    documents = None
+    if args.documents:
+        documents = DocumentFetcher(args.documents, args.document_workers, rate_controller=rate_controller,
+                                    metrics=metrics)
     scraper = None
+    store = None
+    snapshot = None
+    refresh = None
+    archive = None
+    output = None
+    work_queue = None
     try:
         print("🔧 Initializing Enhanced Odisha RERA Scraper...")
-        scraper = EnhancedOdishaRERAProjectScraper(headless=False)
-        projects_data = scraper.scrape_top_6_projects()
-        scraper.display_results(projects_data)
-        scraper.save_results(projects_data)
+        if args.archive:
+            archive = PageArchive(args.archive)
+        if args.reextract:
+            scraper = EnhancedOdishaRERAProjectScraper(start_driver=False, metrics=metrics)
+        elif args.async_tabs:
+            scraper = AsyncTabRERAScraper(
+                tabs=args.async_tabs, headless=args.headless, archive=archive, metrics=metrics,
+                per_host_limit=args.per_host_limit, min_interval=args.min_interval, recycle_after=args.recycle_after,
+                rate_controller=rate_controller, promoter_cache=promoter_cache, documents=documents,
+                **driver_options(args)
+            )
+        elif args.fast:
+            api_client = RERAApiClient(args.api_base, record_dir=args.record_fixtures, metrics=metrics,
+                                       rate_controller=rate_controller)
+            scraper = FastPathRERAScraper(api_client, headless=args.headless, archive=archive, metrics=metrics,
+                                          rate_controller=rate_controller, promoter_cache=promoter_cache,
+                                          documents=documents, watchdog=watchdog, project_attempts=args.max_attempts,
+                                          **driver_options(args))
+        else:
+            scraper = EnhancedOdishaRERAProjectScraper(headless=args.headless, archive=archive, metrics=metrics,
+                                                       rate_controller=rate_controller, promoter_cache=promoter_cache,
+                                                       documents=documents, watchdog=watchdog,
+                                                       project_attempts=args.max_attempts, **driver_options(args))
+        filters = stub_filters(args)
+        # Unbounded runs only keep running counts; the records go straight to the output files
+        summary = RunSummary(keep_records=bool(filters['limit']) and not args.reextract and not args.role)
+        output = open_sinks(args.output, args.formats.split(','), flush_every=args.flush_every)
         
-        valid_projects = sum(1 for p in projects_data if any(p[k] for k in ['RERA Regd. No', 'Project Name', 'Promoter Name']))
-        projects_with_gst = sum(1 for p in projects_data if p.get('GST No') and p.get('GST No') != 'Not Available')
+        if args.reextract:
+            records = metrics.track(reextract(args.reextract, workers=args.reextract_workers))
+        elif args.click_through:
+            records = metrics.track(scraper.scrape_top_6_projects(deep_link=False))
+        elif args.role == 'coordinator':
+            work_queue = open_work_queue(args.queue, args.lease_seconds, args.max_attempts)
+            added = enqueue_stubs(scraper.iter_project_stubs(**filters), work_queue)
+            print(f"   🛰️ Enqueued {added} new projects on {args.queue}")
+            # The listing browser is not needed while the workers run
+            scraper.cleanup()
+            scraper = None
+            wait_until_drained(work_queue, args.poll_interval)
+            print(f"   🛰️ Queue drained: {work_queue.counts()}")
+            records = work_queue.records()
+        else:
+            print("🚀 Starting Enhanced Odisha RERA Projects Scraping...")
+            print("=" * 70)
+            if args.job_store:
+                store = open_job_store(args, filters)
+            if args.role == 'worker':
+                work_queue = open_work_queue(args.queue, args.lease_seconds, args.max_attempts)
+                print(f"   🛰️ Worker leasing projects from {args.queue}")
+                stubs = lease_stubs(work_queue, poll_interval=args.poll_interval)
+            elif store and store.get_meta('listing_complete'):
+                print("   💾 Listing already enumerated, scraping pending projects from the job store")
+                stubs = store.pending_stubs(args.max_attempts)
+            else:
+                stubs = scraper.iter_project_stubs(**filters)
+            if args.incremental:
+                snapshot = SnapshotStore(args.incremental)
+                refresh = IncrementalRefresh(snapshot)
+                stubs = refresh.filter_stubs(stubs)
+            if store:
+                stubs = checkpoint_stubs(stubs, store, args.max_attempts)
+            
+            if not args.async_tabs and (args.workers > 1 or (filters['limit'] is None and not args.fast)):
+                # The listing driver keeps paging while workers open detail pages
+                results = scrape_in_parallel(scraper, stubs, args)
+            else:
+                # A bounded run collects its stubs first so the one driver is free for detail pages
+                # (the async engine scrapes its tabs concurrently and walks the listing in a tab of its own)
+                if filters['limit'] is not None and not args.role:
+                    stubs = list(stubs)
+                results = scraper.scrape_stubs(stubs, total=len(stubs) if isinstance(stubs, list) else None)
+            if store:
+                results = checkpoint_results(results, store)
+            if work_queue:
+                results = post_results(results, work_queue)
+            if refresh:
+                results = refresh.record_results(results)
+            # Hit rates cover the projects scraped in this run, not earlier runs' stored records
+            records = metrics.track(record for _, record in results)
+            
+            if store or refresh:
+                # The stores hold the full output, including projects from earlier runs
+                for _ in records:
+                    pass
+                if store:
+                    print(f"   💾 Job store: {store.counts()}")
+                    records = store.records()
+                if refresh:
+                    full_listing = filters['limit'] is None and not (args.start or args.district or args.project_type or args.year)
+                    refresh.save_report(args.changes_report, full_listing)
+                    records = snapshot.records_seen()
+        
+        for record in summary.track(records):
+            output.write(record)
+        output.close()
         
+        if args.fast and not args.reextract:
+            # Counted across every worker, not just the listing scraper
+            fallbacks = sum(metrics.as_dict()['counters'].get('fallbacks', {}).values())
+            print(f"   ⚡ Selenium fallbacks: {fallbacks}")
+        if summary.keep_records:
+            scraper.display_results(summary.records)
+        
+        print(f"\n💾 Files saved:")
+        for output_file in output.filenames:
+            print(f"   📄 {output_file}")
         print(f"\n🎉 ENHANCED SCRAPING COMPLETED!")
-        print(f"   ✅ Successfully extracted {valid_projects} out of {len(projects_data)} projects")
-        print(f"   💼 Projects with GST Numbers: {projects_with_gst}")
-        print(f"   📁 Output files: enhanced_odisha_rera_top6_projects.csv, .json, and .html")
+        print(f"   ✅ Successfully extracted {summary.valid} out of {summary.total} projects")
+        print(f"   💼 Projects with GST Numbers: {summary.with_gst}")
+        metrics.print_summary()
+        if rate_controller.hosts:
+            print(f"   🚦 Adaptive rate control: {rate_controller.snapshot()}")
         
-        return projects_data
+        return summary
         
     except Exception as e:
         print(f"❌ Critical error: {str(e)}")
-        return []
+        if output:
+            output.close()
+        return summary
     
     finally:
         if scraper:
             scraper.cleanup()
+        if store:
+            store.close()
+        if snapshot:
+            snapshot.close()
+        if archive:
+            archive.close()
+        if work_queue:
+            work_queue.close()
+        if promoter_cache:
+            promoter_cache.close()
+        if documents:
+            documents.close()
+        watchdog.stop()
+        # Written even after a crash, since that is when the timings matter most
+        print(f"   📊 Metrics: {metrics.write_json(args.metrics)}")
+        if args.prometheus_textfile:
+            print(f"   📊 Prometheus textfile: {metrics.write_prometheus(args.prometheus_textfile)}")
 
 if __name__ == "__main__":
-    results = main()
-    if results:
-        print(f"\n📋 Final validation: {len(results)} projects processed")
-        complete_projects = [p for p in results if p.get('RERA Regd. No') and p.get('Project Name')]
-        gst_projects = [p for p in results if p.get('GST No') and p.get('GST No') != 'Not Available']
-        print(f"   🔍 {len(complete_projects)} projects have RERA No. and Project Name")
-        print(f"   💼 {len(gst_projects)} projects have GST Numbers")
+    summary = main(parse_args())
+    if summary.total:
+        print(f"\n📋 Final validation: {summary.total} projects processed")
+        print(f"   🔍 {summary.complete} projects have RERA No. and Project Name")
+        print(f"   💼 {summary.with_gst} projects have GST Numbers")
     else:
-        print("\n⚠️ No results obtained. Check your internet connection and try again.")
\ No newline at end of file
+        print("\n⚠️ No results obtained. Check your internet connection and try again.")
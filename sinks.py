@@ -0,0 +1,266 @@
+import csv
+import json
+import os
+import time
+from html import escape
+
+from records import RECORD_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+HTML_HEADER = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Odisha RERA Registered Projects</title>
+    <script src="https://cdn.tailwindcss.com"></script>
+</head>
+<body class="bg-gray-100">
+    <div class="container mx-auto py-8 px-4">
+        <h1 class="text-3xl font-bold text-center mb-8">Odisha RERA Registered Projects</h1>
+        <div class="overflow-x-auto">
+            <table class="min-w-full bg-white shadow-md rounded-lg">
+                <thead class="bg-gray-800 text-white">
+                    <tr>
+                        <th class="py-3 px-4 text-left">Project Name</th>
+                        <th class="py-3 px-4 text-left">RERA Regd. No</th>
+                        <th class="py-3 px-4 text-left">Promoter Name</th>
+                        <th class="py-3 px-4 text-left">Promoter Address</th>
+                        <th class="py-3 px-4 text-left">GST No</th>
+                        <th class="py-3 px-4 text-left">Project URL</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
+
+HTML_ROW = """
+                    <tr class="border-b hover:bg-gray-50">
+                        <td class="py-3 px-4">{}</td>
+                        <td class="py-3 px-4">{}</td>
+                        <td class="py-3 px-4">{}</td>
+                        <td class="py-3 px-4">{}</td>
+                        <td class="py-3 px-4">{}</td>
+                        <td class="py-3 px-4"><a href="{}" class="text-blue-600 hover:underline" target="_blank">{}</a></td>
+                    </tr>
+"""
+
+HTML_FOOTER = """
+                </tbody>
+            </table>
+        </div>
+        <p class="text-center mt-4 text-gray-600">Generated on {}</p>
+    </div>
+</body>
+</html>
+"""
+
+
+class RecordSink:
+    """Writes records to one file as they arrive"""
+
+    extension = ''
+
+    def __init__(self, filename, append=False):
+        self.filename = filename
+        self.append = append
+        self.count = 0
+
+    def write(self, record):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class CSVSink(RecordSink):
+    extension = 'csv'
+
+    def __init__(self, filename, append=False):
+        super().__init__(filename, append)
+        has_rows = append and os.path.exists(filename) and os.path.getsize(filename) > 0
+        self.file = open(filename, 'a' if append else 'w', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=RECORD_FIELDS, extrasaction='ignore')
+        if not has_rows:
+            self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+        self.count += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JSONLinesSink(RecordSink):
+    extension = 'jsonl'
+
+    def __init__(self, filename, append=False):
+        super().__init__(filename, append)
+        self.file = open(filename, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.count += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JSONArraySink(RecordSink):
+    """The original indented JSON array, streamed element by element"""
+
+    extension = 'json'
+
+    def __init__(self, filename, append=False):
+        super().__init__(filename, append)
+        self.file = open(filename, 'w', encoding='utf-8')
+        self.file.write('[')
+
+    def write(self, record):
+        self.file.write(',\n  ' if self.count else '\n  ')
+        self.file.write(json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+        self.count += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.write('\n]' if self.count else ']')
+        self.file.close()
+
+
+class ParquetSink(RecordSink):
+    """Buffers records into pyarrow row groups of batch_size rows"""
+
+    extension = 'parquet'
+
+    def __init__(self, filename, append=False, batch_size=1000):
+        if pa is None:
+            raise RuntimeError("Parquet output needs the pyarrow package (pip install pyarrow)")
+        super().__init__(filename, append)
+        self.batch_size = batch_size
+        self.schema = pa.schema([(field, pa.string()) for field in RECORD_FIELDS])
+        self.writer = pq.ParquetWriter(filename, self.schema)
+        self.buffer = []
+
+    def write(self, record):
+        self.buffer.append(record)
+        self.count += 1
+        if len(self.buffer) >= self.batch_size:
+            self.write_row_group()
+
+    def write_row_group(self):
+        if self.buffer:
+            columns = {field: [str(record.get(field, '')) for record in self.buffer] for field in RECORD_FIELDS}
+            self.writer.write_table(pa.table(columns, schema=self.schema))
+            self.buffer = []
+
+    def flush(self):
+        # A Parquet file is unreadable until its footer is written on close, so
+        # periodic flushes would only shrink the row groups; keep full batches.
+        pass
+
+    def close(self):
+        self.write_row_group()
+        self.writer.close()
+
+
+class HTMLSink(RecordSink):
+    """Styled HTML table; rows are written as they arrive and the footer on close"""
+
+    extension = 'html'
+
+    def __init__(self, filename, append=False):
+        super().__init__(filename, append)
+        self.file = open(filename, 'w', encoding='utf-8')
+        self.file.write(HTML_HEADER)
+
+    def write(self, record):
+        url = record.get('Project URL', '')
+        self.file.write(HTML_ROW.format(
+            escape(record.get('Project Name') or 'Not Available'),
+            escape(record.get('RERA Regd. No') or 'Not Available'),
+            escape(record.get('Promoter Name') or 'Not Available'),
+            escape(record.get('Promoter Address') or 'Not Available'),
+            escape(record.get('GST No') or 'Not Available'),
+            escape(url or '#', quote=True),
+            escape(url[:50] + "...") if url else 'Not Available',
+        ))
+        self.count += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.write(HTML_FOOTER.format(time.strftime("%Y-%m-%d %H:%M:%S")))
+        self.file.close()
+
+
+SINK_TYPES = {sink.extension: sink for sink in (CSVSink, JSONArraySink, JSONLinesSink, ParquetSink, HTMLSink)}
+DEFAULT_FORMATS = ('csv', 'json', 'html')
+
+
+class MultiSink:
+    """Fans each record out to several sinks and flushes them every few records or seconds (0 turns either off)"""
+
+    def __init__(self, sinks, flush_every=50, flush_seconds=30):
+        self.sinks = sinks
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.count = 0
+        self.closed = False
+        self.last_flush = time.monotonic()
+
+    @property
+    def filenames(self):
+        return [sink.filename for sink in self.sinks]
+
+    def write(self, record):
+        for sink in self.sinks:
+            sink.write(record)
+        self.count += 1
+        due_by_count = self.flush_every and self.count % self.flush_every == 0
+        due_by_time = self.flush_seconds and time.monotonic() - self.last_flush >= self.flush_seconds
+        if due_by_count or due_by_time:
+            self.flush()
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_sinks(basename, formats=DEFAULT_FORMATS, append=False, flush_every=50, flush_seconds=30):
+    """One sink per requested format, writing to basename.<extension> (append applies to csv and jsonl)"""
+    unknown = [fmt for fmt in formats if fmt not in SINK_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown output format(s): {', '.join(unknown)}")
+    sinks = [SINK_TYPES[fmt](f"{basename}.{fmt}", append=append) for fmt in formats]
+    return MultiSink(sinks, flush_every, flush_seconds)
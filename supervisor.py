@@ -0,0 +1,185 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from records import record_from_stub
+from metrics import RunMetrics
+
+MB = 1024 * 1024
+
+# The watch over the project each thread is scraping, so waits deep inside the scrape can pause its hang clock
+_current = threading.local()
+
+
+class Watch:
+    """One supervised project: how long the browser has worked on it and whether the watchdog stepped in"""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.started = time.monotonic()
+        self.paused_for = 0.0
+        self.paused_at = None
+        self.killed = False
+        self.reason = ''
+        self.over_memory = False
+
+    @contextmanager
+    def pause(self):
+        """Stop the hang clock while the block runs"""
+        self.paused_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.paused_for += time.monotonic() - self.paused_at
+            self.paused_at = None
+
+    def active_seconds(self):
+        """Time spent on the project, not counting pauses"""
+        now = time.monotonic()
+        paused_at = self.paused_at
+        paused = self.paused_for + (now - paused_at if paused_at is not None else 0)
+        return now - self.started - paused
+
+
+@contextmanager
+def hang_clock_paused():
+    """Pause the hang clock of the project this thread is scraping, e.g. while it queues for a rate-limit slot
+    or sits out a circuit breaker cooldown, which can last longer than the hang timeout"""
+    watch = getattr(_current, 'watch', None)
+    if watch is None:
+        yield
+        return
+    with watch.pause():
+        yield
+
+
+class BrowserWatchdog:
+    """Background thread that kills a browser stuck on one project, or one grown far past its memory limit"""
+
+    def __init__(self, hang_timeout=300, max_rss_mb=2048, interval=5, metrics=None):
+        self.hang_timeout = hang_timeout
+        self.max_rss = max_rss_mb * MB
+        self.interval = interval
+        self.metrics = metrics or RunMetrics()
+        self.lock = threading.Lock()
+        self.watches = set()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    @contextmanager
+    def watch(self, scraper):
+        """Supervise the scraper's browser while the block runs"""
+        watch = Watch(scraper)
+        outer = getattr(_current, 'watch', None)
+        _current.watch = watch
+        with self.lock:
+            self.watches.add(watch)
+        try:
+            yield watch
+        finally:
+            with self.lock:
+                self.watches.discard(watch)
+            _current.watch = outer
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            with self.lock:
+                watches = list(self.watches)
+            for watch in watches:
+                self.check(watch)
+
+    def check(self, watch):
+        if watch.killed:
+            return
+        elapsed = watch.active_seconds()
+        if elapsed > self.hang_timeout:
+            self.kill(watch, 'hang', f"no progress after {elapsed:.0f}s of browser time")
+            return
+        rss = watch.scraper.browser_rss()
+        if rss > self.max_rss:
+            # Over the limit: recycle after this project. Far over it: the project is not worth the host
+            watch.over_memory = True
+            if rss > 2 * self.max_rss:
+                self.kill(watch, 'memory', f"browser using {rss / MB:.0f} MB")
+
+    def needs_recycle(self, watch):
+        """Whether the browser went over the memory limit during the project, or is over it now"""
+        return watch.over_memory or watch.scraper.browser_rss() > self.max_rss
+
+    def kill(self, watch, reason, detail):
+        print(f"   💀 Watchdog: killing browser ({detail})")
+        watch.killed = True
+        watch.reason = reason
+        watch.scraper.kill_browser()
+        self.metrics.increment('browser_kills', reason)
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join()
+
+
+class NoWatchdog:
+    """Stand-in watchdog that never intervenes"""
+
+    @contextmanager
+    def watch(self, scraper):
+        yield Watch(scraper)
+
+    def needs_recycle(self, watch):
+        return False
+
+
+NO_WATCHDOG = NoWatchdog()
+
+
+def restart_browser(scraper, metrics):
+    """Restart the scraper's browser, counting a failed start instead of letting it end the run"""
+    try:
+        scraper.restart_driver()
+        return True
+    except Exception as e:
+        print(f"   ❌ Browser restart failed: {str(e)}")
+        metrics.increment('errors', 'browser_restart')
+        return False
+
+
+def scrape_supervised(scraper, stub, watchdog=NO_WATCHDOG, metrics=None, max_attempts=3):
+    """Scrape one project, restarting a killed or crashed browser and retrying the project on the fresh one
+    instead of keeping the blank record the dead browser produced"""
+    metrics = metrics or scraper.metrics
+    for attempt in range(1, max_attempts + 1):
+        with watchdog.watch(scraper) as watch:
+            try:
+                with metrics.stage('project'):
+                    record = scraper.scrape_project_detail(stub)
+            except Exception as e:
+                print(f"   ❌ Error processing {stub.get('detail_url')}: {str(e)}")
+                metrics.increment('errors', 'project')
+                record = record_from_stub(stub)
+            # Checked inside the watch so a browser that hangs on the check is killed too
+            alive = not watch.killed and scraper.browser_alive()
+
+        if alive:
+            if watchdog.needs_recycle(watch):
+                print(f"   ♻️ Browser over {watchdog.max_rss // MB} MB, recycling it")
+                # The record is already in hand; if the new browser fails to start, the next project retries it
+                if restart_browser(scraper, metrics):
+                    metrics.increment('recycles', 'memory')
+            return record
+
+        reason = watch.reason or 'crash'
+        metrics.increment('browser_restarts', reason)
+        print(f"   🔁 Browser lost ({reason}) on attempt {attempt}/{max_attempts}; restarting it to retry the project")
+        # A failed restart leaves no live browser, so the next attempt fails fast and restarts it again
+        restart_browser(scraper, metrics)
+        if attempt < max_attempts:
+            metrics.increment('requeued', reason)
+
+    print(f"   ❌ Giving up on {stub.get('project_name') or stub.get('detail_url')} after {max_attempts} browsers")
+    metrics.increment('errors', 'abandoned')
+    return record_from_stub(stub)
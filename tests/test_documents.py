@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from documents import DocumentFetcher, DONE
+from metrics import RunMetrics
+from mock_portal import MockPortal
+
+CERTIFICATE = '/documents/P1/registration-certificate.pdf'
+UNDERTAKING = '/documents/common/undertaking.pdf'
+
+
+class SameBytesPortal(MockPortal):
+    """Every document path serves the same file, as when projects upload identical PDFs under their own URLs"""
+
+    def document(self, path):
+        return super().document(UNDERTAKING)
+
+
+@pytest.fixture
+def portal():
+    portal = MockPortal([]).start()
+    yield portal
+    portal.stop()
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    fetcher = DocumentFetcher(str(tmp_path / 'documents'), workers=2, max_attempts=2, metrics=RunMetrics())
+    yield fetcher
+    fetcher.close()
+
+
+def documents(portal, *paths):
+    return [{'url': portal.url + path, 'title': os.path.basename(path), 'kind': 'other'} for path in paths]
+
+
+def partial_file(fetcher, url):
+    return os.path.join(fetcher.root, 'partial', hashlib.sha1(url.encode('utf-8')).hexdigest() + '.part')
+
+
+def stored_bytes(fetcher, path):
+    with open(os.path.join(fetcher.root, path), 'rb') as f:
+        return f.read()
+
+
+def test_interrupted_download_resumes_with_a_range_request(portal, fetcher):
+    url = portal.url + CERTIFICATE
+    data = portal.document(CERTIFICATE)
+    # An earlier attempt got a third of the file before the connection dropped
+    with open(partial_file(fetcher, url), 'wb') as f:
+        f.write(data[:len(data) // 3])
+
+    sha256, size, content_type, path = fetcher.download(url)
+
+    assert (sha256, size, content_type) == (hashlib.sha256(data).hexdigest(), len(data), 'application/pdf')
+    assert stored_bytes(fetcher, path) == data
+    assert not os.path.exists(partial_file(fetcher, url))
+    counters = fetcher.metrics.as_dict()['counters']
+    assert counters['documents'] == {'resumed': 1, 'downloaded': 1}
+    assert counters['document_bytes'] == {'total': len(data) - len(data) // 3}
+
+
+def test_complete_partial_file_is_stored_without_downloading_again(portal, fetcher):
+    url = portal.url + CERTIFICATE
+    data = portal.document(CERTIFICATE)
+    with open(partial_file(fetcher, url), 'wb') as f:
+        f.write(data)
+
+    sha256, size, _, path = fetcher.download(url)
+
+    assert (sha256, size) == (hashlib.sha256(data).hexdigest(), len(data))
+    assert stored_bytes(fetcher, path) == data
+    assert 'document_bytes' not in fetcher.metrics.as_dict()['counters']
+
+
+def test_shared_documents_are_downloaded_once_and_every_project_gets_a_manifest(portal, fetcher):
+    assert fetcher.submit('RP/01/2025/01362', documents(portal, CERTIFICATE, UNDERTAKING)) == 2
+    assert fetcher.submit('PS/28/2025/01360', documents(portal, UNDERTAKING)) == 1
+    fetcher.pool.shutdown(wait=True)
+
+    # The undertaking is linked from both projects but fetched once
+    assert portal.requests == 2
+    counters = fetcher.metrics.as_dict()['counters']['documents']
+    assert (counters['downloaded'], counters['deduplicated']) == (2, 1)
+    assert fetcher.url_locks == {}
+
+    with open(os.path.join(fetcher.root, 'manifests', 'RP_01_2025_01362.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert manifest['rera_no'] == 'RP/01/2025/01362'
+    entries = {entry['url']: entry for entry in manifest['documents']}
+    assert sorted(entries) == [portal.url + CERTIFICATE, portal.url + UNDERTAKING]
+    for path in (CERTIFICATE, UNDERTAKING):
+        entry = entries[portal.url + path]
+        assert entry['status'] == DONE
+        assert entry['sha256'] == hashlib.sha256(portal.document(path)).hexdigest()
+        assert stored_bytes(fetcher, entry['path']) == portal.document(path)
+
+    with open(os.path.join(fetcher.root, 'manifests', 'PS_28_2025_01360.json'), encoding='utf-8') as f:
+        [shared] = json.load(f)['documents']
+    assert shared['path'] == entries[portal.url + UNDERTAKING]['path']
+
+
+def test_identical_bytes_under_different_urls_are_stored_once(fetcher):
+    portal = SameBytesPortal([]).start()
+    try:
+        first = fetcher.download(portal.url + CERTIFICATE)
+        second = fetcher.download(portal.url + UNDERTAKING)
+    finally:
+        portal.stop()
+
+    assert first == second
+    assert len(os.listdir(os.path.dirname(os.path.join(fetcher.root, first[3])))) == 1
+    assert fetcher.metrics.as_dict()['counters']['documents'] == {'downloaded': 1, 'deduplicated': 1}
+
+
+def test_already_indexed_documents_are_not_queued_again(portal, fetcher):
+    fetcher.submit('RP/01/2025/01362', documents(portal, CERTIFICATE))
+    fetcher.pool.shutdown(wait=True)
+
+    assert fetcher.submit('RP/01/2025/01362', documents(portal, CERTIFICATE)) == 0
+    assert fetcher.counts() == {DONE: 1}
+    assert fetcher.metrics.as_dict()['counters']['documents']['already_indexed'] == 1
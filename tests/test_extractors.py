@@ -0,0 +1,27 @@
+from extractors import NOT_AVAILABLE, FIELD_SPEC, extract_details, parse_project_tab, parse_promoter_tab
+
+from conftest import read_fixture
+
+
+def test_partial_page_keeps_what_parses():
+    page = read_fixture('partial_detail.html')
+    details = parse_project_tab(page)
+    assert details['Project Name'] == 'UDYAYEEN'
+    assert details['RERA Regd. No'] == 'RP/19/2025/01361'
+    assert parse_promoter_tab(page)['Promoter Name'] == 'SHYAMCHAND BUILDERS PRIVATE LIMITED'
+
+
+def test_partial_page_marks_missing_and_unusable_values():
+    details = extract_details(read_fixture('partial_detail.html'), read_fixture('partial_detail.html'))
+    # No value cell, an empty one, and values the field's regex rejects
+    for field in ('Project Type', 'District', 'Completion Date', 'Total Units', 'Land Area', 'Bank Account'):
+        assert details[field] == NOT_AVAILABLE, field
+    assert details['GST No'] == NOT_AVAILABLE
+    assert details['Promoter Address'] == NOT_AVAILABLE
+
+
+def test_empty_snapshots_give_every_field_as_not_available():
+    details = extract_details('', '   ')
+    expected = ['RERA Regd. No', 'Project Name', 'Promoter Name', 'Promoter Address', 'GST No', *FIELD_SPEC]
+    assert sorted(details) == sorted(expected)
+    assert set(details.values()) == {NOT_AVAILABLE}
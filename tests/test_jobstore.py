@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import pytest
+
+from jobstore import JobStore, checkpoint_stubs, checkpoint_results, DONE, FAILED, PENDING
+from records import record_from_stub, stub_key
+from scrap import open_job_store
+
+STUBS = [
+    {'rera_no': f'RP/01/2025/0000{index}', 'project_name': f'Project {index}',
+     'detail_url': f'https://rera.odisha.gov.in/projects/project-details/P{index}'}
+    for index in range(1, 4)
+]
+
+
+def scraped(stub):
+    return dict(record_from_stub(stub), **{'Promoter Address': 'Anugul', 'GST No': '21AADCN5439J2ZH'})
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'jobs.sqlite3')
+
+
+def run(store, stubs, scrape, max_attempts=3):
+    results = ((stub, scrape(stub)) for stub in checkpoint_stubs(stubs, store, max_attempts))
+    return [stub['rera_no'] for stub, _ in checkpoint_results(results, store)]
+
+
+def test_resume_skips_done_projects_and_retries_interrupted_ones(store_path):
+    store = JobStore(store_path)
+    stubs = checkpoint_stubs(STUBS, store)
+    first = next(stubs)
+    store.mark_result(stub_key(first), scraped(first))
+    second = next(stubs)
+    # Crash while the second project is in progress, before the listing was fully walked
+    store.close()
+
+    store = JobStore(store_path)
+    try:
+        assert store.counts() == {DONE: 1, PENDING: 1}
+        assert store.get_meta('listing_complete') is None
+        assert [stub['rera_no'] for stub in store.pending_stubs()] == [second['rera_no']]
+        assert run(store, STUBS, scraped) == [second['rera_no'], STUBS[2]['rera_no']]
+        assert store.counts() == {DONE: 3}
+        assert [record['RERA Regd. No'] for record in store.records()] == [stub['rera_no'] for stub in STUBS]
+    finally:
+        store.close()
+
+
+def test_failed_projects_are_retried_until_max_attempts(store_path):
+    store = JobStore(store_path)
+    try:
+        # Card-only records do not count as scraped
+        assert run(store, STUBS[:1], record_from_stub, max_attempts=2) == [STUBS[0]['rera_no']]
+        assert store.counts() == {FAILED: 1}
+        assert [stub['rera_no'] for stub in store.pending_stubs(max_attempts=2)] == [STUBS[0]['rera_no']]
+
+        assert run(store, STUBS[:1], record_from_stub, max_attempts=2) == [STUBS[0]['rera_no']]
+        assert list(store.pending_stubs(max_attempts=2)) == []
+        assert run(store, STUBS[:1], record_from_stub, max_attempts=2) == []
+        # A higher limit on a later run gives it another go
+        assert run(store, STUBS[:1], scraped, max_attempts=3) == [STUBS[0]['rera_no']]
+        assert store.counts() == {DONE: 1}
+    finally:
+        store.close()
+
+
+def test_listing_complete_is_set_only_once_the_listing_is_exhausted(store_path):
+    store = JobStore(store_path)
+    try:
+        stubs = checkpoint_stubs(STUBS, store)
+        list(zip(range(2), stubs))
+        assert store.get_meta('listing_complete') is None
+        list(stubs)
+        assert store.get_meta('listing_complete') == '1'
+    finally:
+        store.close()
+
+
+def job_store_args(store_path, fresh=False):
+    return SimpleNamespace(job_store=store_path, fresh=fresh)
+
+
+def test_changed_filters_require_a_new_listing_walk(store_path):
+    filters = {'limit': None, 'district': None}
+    store = open_job_store(job_store_args(store_path), filters)
+    run(store, STUBS, scraped)
+    store.close()
+
+    store = open_job_store(job_store_args(store_path), filters)
+    assert store.get_meta('listing_complete') == '1'
+    store.close()
+
+    store = open_job_store(job_store_args(store_path), dict(filters, district='Khordha'))
+    try:
+        assert store.get_meta('listing_complete') == ''
+        # Projects already done stay done
+        assert store.counts() == {DONE: 3}
+    finally:
+        store.close()
+
+
+def test_fresh_forgets_every_project(store_path):
+    filters = {'limit': None}
+    store = open_job_store(job_store_args(store_path), filters)
+    run(store, STUBS, scraped)
+    store.close()
+
+    store = open_job_store(job_store_args(store_path, fresh=True), filters)
+    try:
+        assert store.counts() == {}
+        assert store.get_meta('listing_complete') == ''
+        assert run(store, STUBS, scraped) == [stub['rera_no'] for stub in STUBS]
+    finally:
+        store.close()
@@ -0,0 +1,211 @@
+import json
+import os
+
+import pytest
+
+from extractors import parse_listing_cards, parse_project_tab, parse_promoter_tab, collect_document_links
+from archive import PageArchive, reextract
+from fastpath import RERAApiClient
+from fixture_server import serve_fixtures
+from metrics import RunMetrics
+from mock_portal import ReplayPortal
+from promoter_cache import PromoterCache
+from ratelimit import NO_RATE_LIMIT
+from scrap import FastPathRERAScraper, main, parse_args
+
+from conftest import FIXTURES, read_fixture
+
+BASE_URL = "https://rera.odisha.gov.in"
+
+
+def test_listing_cards():
+    stubs = parse_listing_cards(read_fixture('listing_page.html'), BASE_URL)
+    assert [stub['rera_no'] for stub in stubs] == ['RP/01/2025/01362', 'PS/28/2025/01360', '']
+    first, second, unlinked = stubs
+    assert first['project_name'] == 'Basanti Enclave'
+    assert first['promoter_name'] == 'M/S. NEELACHAL INFRA DEVELOPERS PVT. LTD'
+    assert first['project_status'] == 'New Project'
+    assert first['detail_url'] == f"{BASE_URL}/projects/project-details/VTJGc2RHVmtYMS9FcDhW"
+    # Angular router links stand in for a missing href; javascript: links are not detail URLs
+    assert second['detail_url'] == f"{BASE_URL}/projects/project-details/VTJGc2RHVmtYMTly"
+    assert unlinked['detail_url'] == ''
+    assert 'Residential' in first['search_text']
+
+
+def test_project_tab():
+    details = parse_project_tab(read_fixture('project_tab.html'))
+    assert details == {
+        'Project Name': 'Basanti Enclave',
+        'RERA Regd. No': 'RP/01/2025/01362',
+        'Project Type': 'Residential',
+        'Project Status': 'New Project',
+        'District': 'Anugul',
+        'Land Area': '4,046.86 Sq. Mtrs',
+        'Completion Date': '2028-12-31',
+        'Total Units': '120',
+        'Bank Account': '50200098765432',
+    }
+
+
+def test_promoter_tab():
+    assert parse_promoter_tab(read_fixture('promoter_tab.html')) == {
+        'Promoter Name': 'M/S. NEELACHAL INFRA DEVELOPERS PVT. LTD',
+        'Promoter Address': 'At-Gurudwara, PO-South Balanda, Via-Talcher Rural-INR, Anugul, PIN-759116',
+        'GST No': '21AADCN5439J2ZH',
+    }
+
+
+def test_document_links():
+    documents = collect_document_links({'project': read_fixture('project_tab.html')}, BASE_URL)
+    assert [(document['kind'], document['title']) for document in documents] == [
+        ('registration_certificate', 'Registration Certificate'),
+        ('approved_plan', 'Approved Building Plan'),
+    ]
+    assert documents[0]['url'] == f"{BASE_URL}/uploads/certificates/RP-01-2025-01362.pdf"
+
+
+@pytest.fixture
+def api_base():
+    server = serve_fixtures(os.path.join(FIXTURES, 'api'))
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/"
+    server.shutdown()
+    server.server_close()
+
+
+def fast_path_scrape(api_base, promoter_cache=None, archive=None):
+    metrics = RunMetrics()
+    api = RERAApiClient(api_base, rate_controller=NO_RATE_LIMIT, max_attempts=1, metrics=metrics)
+    scraper = FastPathRERAScraper(api, headless=True, promoter_cache=promoter_cache, archive=archive, metrics=metrics)
+    try:
+        stubs = list(scraper.iter_project_stubs())
+        results = list(scraper.scrape_stubs(stubs, total=len(stubs)))
+    finally:
+        scraper.cleanup()
+    return scraper, results
+
+
+def test_fast_path_scrape_through_fixture_server(api_base):
+    scraper, results = fast_path_scrape(api_base)
+
+    assert scraper.fallbacks == 0
+    records = {record['RERA Regd. No']: record for _, record in results}
+    assert sorted(records) == ['PS/28/2025/01360', 'RP/01/2025/01362']
+
+    basanti = records['RP/01/2025/01362']
+    assert basanti['Project URL'] == f"{BASE_URL}/projects/project-details/VTJGc2RHVmtYMS9FcDhW"
+    assert basanti['Promoter Name'] == 'M/S. NEELACHAL INFRA DEVELOPERS PVT. LTD'
+    assert basanti['GST No'] == '21AADCN5439J2ZH'
+    assert basanti['Project Type'] == 'Residential'
+    assert basanti['Completion Date'] == '2028-12-31'
+
+    barsana = records['PS/28/2025/01360']
+    # Stored under an unexpected key, so found by pattern
+    assert barsana['GST No'] == '21AKXPP1234R1ZN'
+    # Not in the payload: blank, unlike the Not Available of a parsed page
+    assert barsana['Land Area'] == ''
+    assert scraper.metrics.as_dict()['counters'].get('errors') is None
+
+
+def test_fast_path_skips_the_promoter_endpoint_for_cached_promoters(api_base, tmp_path):
+    cache = PromoterCache(str(tmp_path / 'promoters.sqlite3'))
+    try:
+        first, first_results = fast_path_scrape(api_base, cache)
+        second, second_results = fast_path_scrape(api_base, cache)
+    finally:
+        cache.close()
+
+    # Listing pages 1 and 2, then the project endpoint, plus the promoter endpoint only on a cache miss
+    assert first.metrics.stage_summary()['api_request']['count'] == 6
+    assert second.metrics.stage_summary()['api_request']['count'] == 4
+    assert [record for _, record in second_results] == [record for _, record in first_results]
+
+
+def test_reextract_fills_cached_promoters_from_the_archive(api_base, tmp_path):
+    cache = PromoterCache(str(tmp_path / 'promoters.sqlite3'))
+    archive = PageArchive(str(tmp_path / 'archive'))
+    try:
+        fast_path_scrape(api_base, cache)
+        # Every promoter is cached now, so this run fetches no promoter payloads at all
+        _, cached = fast_path_scrape(api_base, cache, archive)
+    finally:
+        cache.close()
+        archive.close()
+
+    records = {record['RERA Regd. No']: record for record in reextract(str(tmp_path / 'archive'), workers=1)}
+    assert records == {record['RERA Regd. No']: record for _, record in cached}
+    assert records['RP/01/2025/01362']['GST No'] == '21AADCN5439J2ZH'
+
+
+def test_reextract_fills_a_skipped_promoter_tab_from_the_archive(tmp_path):
+    promoter = parse_promoter_tab(read_fixture('promoter_tab.html'))
+    url = f"{BASE_URL}/projects/project-details/VTJGc2RHVmtYMS9FcDhW"
+    archive = PageArchive(str(tmp_path / 'archive'))
+    try:
+        archive.store_detail('RP/01/2025/01362', url, {'project': read_fixture('project_tab.html'), 'promoter': ''},
+                             promoter)
+    finally:
+        archive.close()
+
+    [record] = reextract(str(tmp_path / 'archive'), workers=1)
+    assert record['Project Name'] == 'Basanti Enclave'
+    assert {field: record[field] for field in promoter} == promoter
+
+
+def test_replay_portal_serves_archived_api_responses(api_base, tmp_path):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    try:
+        _, recorded = fast_path_scrape(api_base, archive=archive)
+    finally:
+        archive.close()
+
+    portal = ReplayPortal(str(tmp_path / 'archive')).start()
+    try:
+        _, replayed = fast_path_scrape(portal.api_base)
+    finally:
+        portal.stop()
+
+    assert len(portal.projects) == 2
+    assert [record for _, record in replayed] == [record for _, record in recorded]
+
+
+def test_fast_path_workers_fetch_over_the_api(api_base, tmp_path):
+    args = parse_args(['--fast', '--api-base', api_base, '--workers', '2', '--all', '--headless', '--min-interval', '0',
+                       '--output', str(tmp_path / 'out'), '--metrics', str(tmp_path / 'metrics.json')])
+    summary = main(args)
+
+    # No Chrome here: every project must have come through the workers' API sessions
+    assert (summary.total, summary.valid, summary.with_gst) == (2, 2, 2)
+
+
+def test_second_incremental_run_keeps_unchanged_records(api_base, tmp_path):
+    argv = ['--fast', '--api-base', api_base, '--all', '--headless', '--min-interval', '0', '--formats', 'jsonl',
+            '--incremental', str(tmp_path / 'snapshot.sqlite3'), '--changes-report', str(tmp_path / 'changes.json'),
+            '--output', str(tmp_path / 'out'), '--metrics', str(tmp_path / 'metrics.json')]
+    first = main(parse_args(argv))
+    second = main(parse_args(argv))
+
+    assert first.total == second.total == 2
+    with open(tmp_path / 'out.jsonl', encoding='utf-8') as f:
+        assert sorted(json.loads(line)['RERA Regd. No'] for line in f) == ['PS/28/2025/01360', 'RP/01/2025/01362']
+    with open(tmp_path / 'changes.json', encoding='utf-8') as f:
+        report = json.load(f)
+    assert (report['new'], report['changed'], report['unchanged'], report['removed']) == ([], [], 2, [])
+
+
+def test_incremental_refuses_a_job_store(tmp_path):
+    with pytest.raises(SystemExit):
+        parse_args(['--incremental', str(tmp_path / 'snapshot.sqlite3'), '--job-store', str(tmp_path / 'jobs.sqlite3')])
+
+
+def test_reextract_ignores_the_fast_flag(api_base, tmp_path, capsys):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    try:
+        fast_path_scrape(api_base, archive=archive)
+    finally:
+        archive.close()
+
+    summary = main(parse_args(['--reextract', str(tmp_path / 'archive'), '--fast', '--reextract-workers', '1',
+                               '--output', str(tmp_path / 'out'), '--metrics', str(tmp_path / 'metrics.json')]))
+
+    assert (summary.total, summary.with_gst) == (2, 2)
+    assert 'Critical error' not in capsys.readouterr().out
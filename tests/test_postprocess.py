@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+from postprocess import (gstin_checksum_valid, gstin_check_character, extract_pin_codes, extract_districts,
+                         postprocess, validation_report)
+from records import empty_record
+
+VALID_GSTINS = ['27AAPFU0939F1ZV', '29AAGCB7383J1Z4', '33AAACH7409R1Z8', '24AAACC1206D1ZM', '21AADCN5439J2ZH']
+
+
+def corrupted(gstin):
+    """A wrong check character, a changed digit and two swapped characters"""
+    wrong_check = gstin[:14] + ('0' if gstin[14] != '0' else '1')
+    changed_digit = gstin[:7] + str((int(gstin[7]) + 1) % 10) + gstin[8:]
+    swapped = gstin[:2] + gstin[3] + gstin[2] + gstin[4:]
+    return [wrong_check, changed_digit, swapped]
+
+
+def test_known_gstins_pass_the_checksum():
+    assert gstin_checksum_valid(pd.Series(VALID_GSTINS)).all()
+    assert all(gstin_check_character(gstin) == gstin[-1] for gstin in VALID_GSTINS)
+
+
+@pytest.mark.parametrize('gstin', VALID_GSTINS)
+def test_corrupted_gstins_fail_the_checksum(gstin):
+    variants = [variant for variant in corrupted(gstin) if variant != gstin]
+    assert not gstin_checksum_valid(pd.Series(variants)).any()
+
+
+def test_empty_series_checks_nothing():
+    assert gstin_checksum_valid(pd.Series([], dtype=str)).empty
+
+
+def test_pin_codes_take_the_last_six_digit_number():
+    addresses = pd.Series(['Plot 12, Unit-3, Bhubaneswar - 751 012', 'Cuttack 753001, near PIN 754001', 'No PIN here',
+                           'Phone 98765432101'])
+    assert extract_pin_codes(addresses).tolist() == ['751012', '754001', '', '']
+
+
+def test_districts_from_names_spellings_and_towns():
+    addresses = pd.Series(['Saheed Nagar, BHUBANESWAR', 'At/Po Anugul', 'Rourkela Steel City', 'Kolkata',
+                           'Berhampur, Ganjam'])
+    assert extract_districts(addresses).tolist() == ['Khordha', 'Angul', 'Sundargarh', '', 'Ganjam']
+
+
+def frame(*rows):
+    return pd.DataFrame([dict(empty_record(), **row) for row in rows])
+
+
+def test_gst_and_pan_flags():
+    result = postprocess(frame(
+        {'Promoter Name': 'M/S. NEELACHAL INFRA DEVELOPERS PVT. LTD', 'GST No': '21 AADCN5439J2ZH'},
+        {'Promoter Name': 'Subham Builders', 'GST No': '27AAPFU0939F1ZV'},
+        {'Promoter Name': 'Ramesh Sahoo', 'GST No': '21AAKPS1234Q1Z' + gstin_check_character('21AAKPS1234Q1Z')},
+        {'Promoter Name': 'Kalinga Homes Private Limited', 'GST No': '99AADCN5439J2ZH'},
+        {'Promoter Name': 'Not Available', 'GST No': 'Not Available'},
+    ))
+    assert result['GST No'].tolist()[0] == '21AADCN5439J2ZH'
+    assert result['gst_format_valid'].tolist() == [True, True, True, True, False]
+    assert result['gst_checksum_valid'].tolist() == [True, True, True, False, False]
+    assert result['gst_state_valid'].tolist() == [True, True, True, False, False]
+    assert result['gst_odisha'].tolist() == [True, False, True, False, False]
+    assert result['gst_valid'].tolist() == [True, True, True, False, False]
+    # Company C/N, firm F but named "U..." (mismatch), individual P/S by surname, company C/K vs PAN's N
+    assert result['pan_matches_promoter'].tolist() == [True, False, True, False, pd.NA]
+    assert result['gst_present'].tolist() == [True, True, True, True, False]
+
+
+def test_duplicate_registrations_are_flagged_and_ranked():
+    result = postprocess(frame(
+        {'RERA Regd. No': 'RP/01/2025/01362'},
+        {'RERA Regd. No': 'rp / 01 / 2025 / 01362'},
+        {'RERA Regd. No': 'PS/28/2025/01360'},
+        {'RERA Regd. No': ''},
+        {'RERA Regd. No': ''},
+    ))
+    assert result['duplicate_rera'].tolist() == [True, True, False, False, False]
+    assert result['duplicate_rank'].tolist() == [0, 1, 0, 0, 0]
+    assert result['rera_valid'].tolist() == [True, True, True, False, False]
+    assert result['registration_year'].tolist() == ['2025', '2025', '2025', '', '']
+
+    report = validation_report(result)
+    assert (report['duplicate_rera_records'], report['duplicate_rera_numbers']) == (2, 1)
@@ -0,0 +1,166 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fastpath
+from fastpath import RERAApiClient
+from metrics import RunMetrics
+from ratelimit import HostRateController, backoff_delay
+
+URL = 'http://portal.test/projects'
+
+
+def request(controller, ok=True, seconds=0.0):
+    with controller.slot(URL) as outcome:
+        if seconds:
+            time.sleep(seconds)
+        if not ok:
+            outcome.fail()
+
+
+def host(controller):
+    return controller.hosts['portal.test']
+
+
+def test_limit_grows_additively_up_to_max_concurrent():
+    controller = HostRateController(max_concurrent=3, min_interval=0, metrics=RunMetrics())
+    request(controller)
+    assert host(controller).limit == 2
+    request(controller)
+    assert host(controller).limit == 2.5
+    for _ in range(10):
+        request(controller)
+    assert host(controller).limit == 3
+
+
+def test_failures_and_slow_responses_halve_the_limit_once_per_window():
+    controller = HostRateController(max_concurrent=8, min_interval=0, target_latency=0.05, breaker_threshold=99,
+                                    metrics=RunMetrics())
+    host_state = controller._host('portal.test')
+    host_state.limit = 8.0
+    request(controller, ok=False)
+    request(controller, ok=False)
+    # A burst of failures within one target_latency window counts once
+    assert host_state.limit == 4
+    time.sleep(0.06)
+    request(controller, seconds=0.06)
+    assert host_state.limit == 2
+    time.sleep(0.06)
+    request(controller, ok=False)
+    request(controller, ok=False)
+    assert host_state.limit == 1
+    assert controller.metrics.as_dict()['counters']['rate_decreases'] == {'total': 3}
+
+
+def test_breaker_opens_probes_and_doubles_its_cooldown():
+    controller = HostRateController(max_concurrent=2, min_interval=0, breaker_threshold=2, breaker_cooldown=0.2,
+                                    max_cooldown=0.5, metrics=RunMetrics())
+    request(controller, ok=False)
+    assert not host(controller).open_until
+    request(controller, ok=False)
+    assert host(controller).open_until
+
+    # The next request waits out the cooldown, then goes through alone as the half-open probe; it fails,
+    # which doubles the cooldown
+    started = time.monotonic()
+    request(controller, ok=False)
+    assert time.monotonic() - started >= 0.19
+    assert host(controller).cooldown == pytest.approx(0.4)
+
+    # Doubling again is capped at max_cooldown
+    started = time.monotonic()
+    request(controller, ok=False)
+    assert time.monotonic() - started >= 0.39
+    assert host(controller).cooldown == pytest.approx(0.5)
+
+    # A good probe closes the breaker and resets the cooldown
+    request(controller)
+    assert host(controller).open_until == 0
+    assert host(controller).cooldown == 0.2
+    started = time.monotonic()
+    request(controller)
+    assert time.monotonic() - started < 0.1
+    assert controller.metrics.as_dict()['counters']['circuit_open'] == {'total': 3}
+
+
+def test_only_the_probe_goes_through_while_half_open():
+    controller = HostRateController(max_concurrent=4, min_interval=0, breaker_threshold=1, breaker_cooldown=0.1,
+                                    metrics=RunMetrics())
+    request(controller, ok=False)
+    time.sleep(0.15)
+    in_probe = threading.Event()
+    release_probe = threading.Event()
+
+    def probe():
+        with controller.slot(URL):
+            in_probe.set()
+            release_probe.wait(5)
+
+    prober = threading.Thread(target=probe)
+    prober.start()
+    assert in_probe.wait(5)
+    follower = threading.Thread(target=request, args=(controller,))
+    follower.start()
+    follower.join(0.2)
+    assert follower.is_alive()
+    release_probe.set()
+    prober.join(5)
+    follower.join(5)
+    assert not follower.is_alive()
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    for attempt in range(1, 12):
+        for _ in range(20):
+            assert 0 <= backoff_delay(attempt, base=0.5, cap=30) <= min(30, 0.5 * 2 ** attempt)
+
+
+class OverloadedHandler(BaseHTTPRequestHandler):
+    """503 with the given Retry-After for the first few requests, then a JSON body"""
+
+    responses = []
+
+    def do_GET(self):
+        retry_after = self.responses.pop(0) if self.responses else None
+        if retry_after is None:
+            body = b'{"data": []}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+        else:
+            body = b''
+            self.send_response(503)
+            if retry_after:
+                self.send_header('Retry-After', retry_after)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def overloaded_api():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OverloadedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_api_client_honours_retry_after_and_backs_off_otherwise(overloaded_api, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(fastpath.time, 'sleep', sleeps.append)
+    monkeypatch.setattr(fastpath, 'backoff_delay', lambda attempt: attempt / 10)
+    OverloadedHandler.responses = ['7', '', 'Wed, 21 Oct 2026 07:28:00 GMT']
+    client = RERAApiClient(overloaded_api, max_attempts=4, metrics=RunMetrics())
+    try:
+        assert client.fetch_listing() == []
+    finally:
+        client.close()
+
+    # Seconds are honoured; a missing or HTTP-date Retry-After falls back to jittered backoff
+    assert sleeps == [7.0, 0.2, 0.3]
+    assert client.metrics.as_dict()['counters']['retries'] == {'api': 3}
@@ -0,0 +1,40 @@
+from records import RECORD_FIELDS, empty_record, has_detail_fields, record_from_stub
+
+STUB = {
+    'project_name': 'Basanti Enclave',
+    'rera_no': 'RP/01/2025/01362',
+    'promoter_name': 'M/S. NEELACHAL INFRA DEVELOPERS PVT. LTD',
+    'project_status': 'New Project',
+    'detail_url': 'https://rera.odisha.gov.in/projects/project-details/VTJGc2RHVmtYMS9FcDhW',
+    'search_text': 'Basanti Enclave by M/S. NEELACHAL INFRA DEVELOPERS PVT. LTD',
+}
+
+
+def test_record_from_stub_keeps_the_card_fields():
+    record = record_from_stub(STUB)
+    assert list(record) == RECORD_FIELDS
+    assert record['Project URL'] == STUB['detail_url']
+    assert record['RERA Regd. No'] == 'RP/01/2025/01362'
+    assert record['Project Name'] == 'Basanti Enclave'
+    assert record['Promoter Name'] == 'M/S. NEELACHAL INFRA DEVELOPERS PVT. LTD'
+    assert record['Project Status'] == 'New Project'
+    assert record['Promoter Address'] == record['GST No'] == ''
+
+
+def test_record_from_stub_tolerates_a_bare_stub():
+    assert record_from_stub({}) == empty_record()
+
+
+def test_card_only_record_has_no_detail_fields():
+    assert not has_detail_fields(record_from_stub(STUB))
+    assert not has_detail_fields(empty_record())
+
+
+def test_not_available_does_not_count_as_detail():
+    record = dict(record_from_stub(STUB), **{'Promoter Address': 'Not Available', 'GST No': 'Not Available'})
+    assert not has_detail_fields(record)
+
+
+def test_either_promoter_field_counts_as_detail():
+    assert has_detail_fields(dict(record_from_stub(STUB), **{'GST No': '21AADCN5439J2ZH'}))
+    assert has_detail_fields(dict(record_from_stub(STUB), **{'Promoter Address': 'Anugul, PIN-759116'}))
@@ -0,0 +1,98 @@
+import csv
+import json
+
+import pytest
+
+from records import RECORD_FIELDS, empty_record
+from sinks import RecordSink, MultiSink, open_sinks
+
+RECORDS = [
+    dict(empty_record(f'https://rera.odisha.gov.in/projects/project-details/P{index}'),
+         **{'Project Name': f'Enclave <{index}>', 'RERA Regd. No': f'RP/01/2025/0000{index}', 'GST No': ''})
+    for index in range(1, 4)
+]
+
+
+def write(basename, formats, records=RECORDS, **options):
+    with open_sinks(str(basename), formats, **options) as output:
+        for record in records:
+            output.write(record)
+    return output
+
+
+def test_csv_and_json_lines_round_trip(tmp_path):
+    write(tmp_path / 'out', ['csv', 'jsonl'])
+    with open(tmp_path / 'out.csv', encoding='utf-8', newline='') as f:
+        assert list(csv.DictReader(f)) == RECORDS
+    with open(tmp_path / 'out.jsonl', encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+
+def test_append_adds_rows_without_a_second_header(tmp_path):
+    write(tmp_path / 'out', ['csv', 'jsonl'], RECORDS[:1])
+    write(tmp_path / 'out', ['csv', 'jsonl'], RECORDS[1:], append=True)
+    with open(tmp_path / 'out.csv', encoding='utf-8', newline='') as f:
+        assert list(csv.DictReader(f)) == RECORDS
+    with open(tmp_path / 'out.jsonl', encoding='utf-8') as f:
+        assert len(f.readlines()) == 3
+
+
+@pytest.mark.parametrize('records', [RECORDS, []])
+def test_json_array_is_valid_json(tmp_path, records):
+    write(tmp_path / 'out', ['json'], records)
+    with open(tmp_path / 'out.json', encoding='utf-8') as f:
+        assert json.load(f) == records
+
+
+def test_parquet_keeps_every_field_as_text(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    write(tmp_path / 'out', ['parquet'])
+    table = pq.read_table(tmp_path / 'out.parquet')
+    assert table.column_names == RECORD_FIELDS
+    assert table.to_pylist() == RECORDS
+
+
+def test_html_escapes_values_and_closes_the_table(tmp_path):
+    write(tmp_path / 'out', ['html'])
+    page = (tmp_path / 'out.html').read_text(encoding='utf-8')
+    assert page.count('<tr class="border-b') == 3
+    assert 'Enclave &lt;1&gt;' in page
+    assert page.rstrip().endswith('</html>')
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_sinks(str(tmp_path / 'out'), ['xlsx'])
+
+
+class CountingSink(RecordSink):
+    def __init__(self):
+        super().__init__('counting')
+        self.flushes = 0
+
+    def write(self, record):
+        self.count += 1
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_flush_every_n_records():
+    sink = CountingSink()
+    output = MultiSink([sink], flush_every=2, flush_seconds=0)
+    for record in RECORDS * 2:
+        output.write(record)
+    assert (sink.count, sink.flushes) == (6, 3)
+
+
+def test_flush_every_zero_flushes_by_time_only(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr('sinks.time.monotonic', lambda: clock[0])
+    sink = CountingSink()
+    output = MultiSink([sink], flush_every=0, flush_seconds=30)
+    for record in RECORDS:
+        output.write(record)
+    assert sink.flushes == 0
+    clock[0] += 30
+    output.write(RECORDS[0])
+    assert sink.flushes == 1
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from metrics import RunMetrics
+from ratelimit import HostRateController
+from records import record_from_stub
+from supervisor import BrowserWatchdog, MB, hang_clock_paused, scrape_supervised
+
+STUB = {'rera_no': 'RP/01/2025/01362', 'project_name': 'Basanti Enclave', 'promoter_name': 'Neelachal Infra',
+        'detail_url': 'https://rera.odisha.gov.in/projects/project-details/VTJGc2RHVmtYMS9FcDhW'}
+
+
+class FakeScraper:
+    """Scraper whose projects, browser and restarts follow scripted outcomes"""
+
+    killed = False
+
+    def __init__(self, outcomes=(), restarts=(), rss=0):
+        self.outcomes = list(outcomes)
+        self.restarts = list(restarts)
+        self.rss = rss
+        self.alive = True
+        self.restart_attempts = 0
+        self.metrics = RunMetrics()
+
+    def scrape_project_detail(self, stub):
+        outcome = self.outcomes.pop(0)
+        if outcome == 'crash':
+            self.alive = False
+            raise RuntimeError("browser went away")
+        if outcome == 'error':
+            raise ValueError("detail page changed")
+        return dict(record_from_stub(stub), **{'GST No': '21AADCN5439J2ZH'})
+
+    def browser_alive(self):
+        return self.alive
+
+    def browser_rss(self):
+        return self.rss
+
+    def kill_browser(self):
+        self.killed = True
+
+    def restart_driver(self):
+        self.restart_attempts += 1
+        if self.restarts and not self.restarts.pop(0):
+            raise RuntimeError("chromedriver did not start")
+        self.alive = True
+        self.rss = 0
+
+
+def test_rate_limit_waits_do_not_count_towards_the_hang_timeout():
+    watchdog = BrowserWatchdog(hang_timeout=0.2, metrics=RunMetrics())
+    controller = HostRateController(max_concurrent=1, min_interval=0.4, metrics=watchdog.metrics)
+    scraper = FakeScraper()
+    with watchdog.watch(scraper) as watch:
+        for _ in range(2):
+            # The second slot waits out min_interval, longer than the hang timeout
+            with controller.slot('http://portal.test/page', waiting=hang_clock_paused):
+                pass
+        watchdog.check(watch)
+        assert not scraper.killed
+        assert watch.active_seconds() < 0.2
+
+        time.sleep(0.3)
+        watchdog.check(watch)
+    assert scraper.killed
+    assert watch.reason == 'hang'
+
+
+def test_error_on_a_live_browser_keeps_the_listing_card_data():
+    scraper = FakeScraper(['error'])
+    record = scrape_supervised(scraper, STUB)
+
+    assert record == record_from_stub(STUB)
+    assert record['Project Name'] == 'Basanti Enclave'
+    assert scraper.restart_attempts == 0
+
+
+def test_failed_restart_is_counted_and_the_project_retried():
+    # The browser dies, the first new one fails to start, the second scrapes the project
+    scraper = FakeScraper(['crash', 'crash', 'ok'], restarts=[False, True])
+    record = scrape_supervised(scraper, STUB)
+
+    assert record['GST No'] == '21AADCN5439J2ZH'
+    assert scraper.restart_attempts == 2
+    counters = scraper.metrics.as_dict()['counters']
+    assert counters['errors'] == {'project': 2, 'browser_restart': 1}
+    assert counters['browser_restarts'] == {'crash': 2}
+
+
+def test_project_is_given_up_when_no_browser_will_start():
+    scraper = FakeScraper(['crash', 'crash', 'crash'], restarts=[False, False, False])
+    record = scrape_supervised(scraper, STUB, max_attempts=3)
+
+    assert record == record_from_stub(STUB)
+    assert scraper.metrics.as_dict()['counters']['errors'] == {'project': 3, 'browser_restart': 3, 'abandoned': 1}
+
+
+@pytest.mark.parametrize('restarted', [True, False])
+def test_memory_recycle_keeps_the_record_even_if_the_restart_fails(restarted):
+    scraper = FakeScraper(['ok'], restarts=[restarted], rss=2 * MB)
+    watchdog = BrowserWatchdog(max_rss_mb=1, metrics=scraper.metrics)
+    record = scrape_supervised(scraper, STUB, watchdog)
+
+    assert record['GST No'] == '21AADCN5439J2ZH'
+    counters = scraper.metrics.as_dict()['counters']
+    if restarted:
+        assert counters['recycles'] == {'memory': 1}
+    else:
+        assert counters['errors'] == {'browser_restart': 1}
+        assert 'recycles' not in counters
@@ -0,0 +1,121 @@
+import os
+import time
+import uuid
+
+import pytest
+
+from records import record_from_stub, stub_key
+from workqueue import SQLiteWorkQueue, RedisWorkQueue, DONE, FAILED, LEASED
+
+LEASE_SECONDS = 0.3
+STUBS = [{'rera_no': f'RP/01/2025/0000{index}', 'project_name': f'Project {index}'} for index in range(1, 3)]
+
+
+def scraped(stub):
+    return dict(record_from_stub(stub), **{'GST No': '21AADCN5439J2ZH'})
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def make_queue(request, tmp_path):
+    """Queue factory for each backend; Redis runs only when REDIS_URL points at a server"""
+    queues = []
+
+    def make(max_attempts=3):
+        if request.param == 'sqlite':
+            queue = SQLiteWorkQueue(str(tmp_path / 'queue.sqlite3'), LEASE_SECONDS, max_attempts)
+        else:
+            pytest.importorskip('redis')
+            if not os.environ.get('REDIS_URL'):
+                pytest.skip("REDIS_URL not set")
+            queue = RedisWorkQueue(os.environ['REDIS_URL'], prefix=f"rera-test-{uuid.uuid4().hex}",
+                                   lease_seconds=LEASE_SECONDS, max_attempts=max_attempts)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        if isinstance(queue, RedisWorkQueue):
+            queue.client.delete(*queue.keys.values())
+        queue.close()
+
+
+def enqueue(queue, stubs=STUBS):
+    for stub in stubs:
+        assert queue.push(stub)
+    assert not queue.push(stubs[0])
+    queue.mark_listing_complete()
+
+
+def leased_keys(queue, worker_id):
+    return [key for key, _ in queue.lease(worker_id)]
+
+
+def test_expired_lease_goes_back_on_the_queue(make_queue):
+    queue = make_queue()
+    enqueue(queue, STUBS[:1])
+    key = stub_key(STUBS[0])
+
+    assert leased_keys(queue, 'w1') == [key]
+    assert leased_keys(queue, 'w2') == []
+    assert not queue.drained()
+
+    time.sleep(LEASE_SECONDS + 0.1)
+    assert leased_keys(queue, 'w2') == [key]
+    assert queue.counts() == {LEASED: 1}
+
+    queue.complete(key, scraped(STUBS[0]))
+    assert queue.counts() == {DONE: 1}
+    assert queue.drained()
+
+
+def test_lease_that_expires_on_its_last_attempt_fails_the_job(make_queue):
+    queue = make_queue(max_attempts=1)
+    enqueue(queue, STUBS[:1])
+
+    assert leased_keys(queue, 'w1') == [stub_key(STUBS[0])]
+    time.sleep(LEASE_SECONDS + 0.1)
+    assert leased_keys(queue, 'w2') == []
+    assert queue.counts() == {FAILED: 1}
+    assert queue.drained()
+
+
+def test_failed_result_is_retried_until_max_attempts(make_queue):
+    queue = make_queue(max_attempts=2)
+    enqueue(queue, STUBS[:1])
+    key = stub_key(STUBS[0])
+
+    for _ in range(2):
+        assert leased_keys(queue, 'w1') == [key]
+        queue.complete(key, record_from_stub(STUBS[0]))
+    assert leased_keys(queue, 'w1') == []
+    assert queue.counts() == {FAILED: 1}
+    assert queue.drained()
+
+
+def test_result_posted_after_the_lease_expired_still_counts(make_queue):
+    queue = make_queue()
+    enqueue(queue)
+    first, second = (stub_key(stub) for stub in STUBS)
+
+    assert leased_keys(queue, 'w1') == [first]
+    time.sleep(LEASE_SECONDS + 0.1)
+    # Another worker takes over: the expired job or the next one, depending on the backend's order
+    taken_over = leased_keys(queue, 'w2')
+
+    queue.complete(first, scraped(STUBS[0]))
+    rest = []
+    while True:
+        keys = leased_keys(queue, 'w2')
+        if not keys:
+            break
+        rest += keys
+    assert first not in rest
+
+    # The second worker's own result for the finished job does not undo it
+    for key in taken_over + rest:
+        stub = STUBS[0] if key == first else STUBS[1]
+        queue.complete(key, record_from_stub(stub) if key == first else scraped(stub))
+    assert queue.counts() == {DONE: 2}
+    assert queue.drained()
+    assert [record['RERA Regd. No'] for record in queue.records()] == [first, second]
+    assert next(queue.records())['GST No'] == '21AADCN5439J2ZH'
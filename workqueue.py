@@ -0,0 +1,292 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from records import stub_key, has_detail_fields
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    stub TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    record TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, seq);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Redis scripts, so a lease or a result is applied atomically however many nodes race for it.
+# KEYS: pending list, leases zset (score = expiry), attempts hash, status hash[, records hash]
+REDIS_PUSH = """
+if redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2]) == 0 then return 0 end
+redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('RPUSH', KEYS[3], ARGV[1])
+redis.call('HSET', KEYS[4], ARGV[1], 'pending')
+return 1
+"""
+# Lease expiries use the server's clock, so clock skew between worker nodes cannot requeue live leases
+# (writes after TIME need script effects replication, the default since Redis 5)
+REDIS_LEASE = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)) do
+    redis.call('ZREM', KEYS[2], key)
+    if tonumber(redis.call('HGET', KEYS[3], key) or '0') < tonumber(ARGV[2]) then
+        redis.call('RPUSH', KEYS[1], key)
+        redis.call('HSET', KEYS[4], key, 'pending')
+    else
+        redis.call('HSET', KEYS[4], key, 'failed')
+    end
+end
+local key = redis.call('LPOP', KEYS[1])
+if not key then return false end
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[1]), key)
+redis.call('HINCRBY', KEYS[3], key, 1)
+redis.call('HSET', KEYS[4], key, 'leased')
+return key
+"""
+REDIS_COMPLETE = """
+local status = redis.call('HGET', KEYS[4], ARGV[1])
+if status == 'done' then return 0 end
+redis.call('HSET', KEYS[5], ARGV[1], ARGV[2])
+-- A late result for a job requeued after its lease expired: a failure leaves it queued once, a success dequeues it
+if status == 'pending' then
+    if ARGV[3] == 'failed' then return 1 end
+    redis.call('LREM', KEYS[1], 0, ARGV[1])
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[3])
+if ARGV[3] == 'failed' and tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0') < tonumber(ARGV[4]) then
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+    redis.call('HSET', KEYS[4], ARGV[1], 'pending')
+end
+return 1
+"""
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """Shared project queue: the coordinator pushes stubs, workers lease them and post records back"""
+
+    def __init__(self, lease_seconds=600, max_attempts=3):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def drained(self):
+        """Listing fully enqueued and nothing left pending or leased"""
+        return self.listing_complete() and self.outstanding() == 0
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Work queue in one SQLite file, for several worker processes on a host or a shared volume"""
+
+    def __init__(self, path='rera_queue.sqlite3', lease_seconds=600, max_attempts=3):
+        super().__init__(lease_seconds, max_attempts)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def push(self, stub):
+        """Enqueue a project unless it is already known; True if it was new"""
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO jobs (key, seq, stub, updated_at) "
+                "VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM jobs), ?, ?)",
+                (stub_key(stub), json.dumps(stub, ensure_ascii=False), time.time())
+            )
+        return cursor.rowcount == 1
+
+    def mark_listing_complete(self):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('listing_complete', '1')")
+
+    def listing_complete(self):
+        return self.conn.execute("SELECT 1 FROM meta WHERE name = 'listing_complete'").fetchone() is not None
+
+    def lease(self, worker_id, count=1):
+        """Claim up to count jobs, including ones whose previous lease expired, as (key, stub) pairs"""
+        now = time.time()
+        with self.lock:
+            # IMMEDIATE takes the write lock up front so two workers never claim the same row
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (FAILED, now, LEASED, now, self.max_attempts)
+                )
+                rows = self.conn.execute(
+                    "SELECT key, stub FROM jobs WHERE (status IN (?, ?) OR (status = ? AND lease_expires < ?)) "
+                    "AND attempts < ? ORDER BY seq LIMIT ?",
+                    (PENDING, FAILED, LEASED, now, self.max_attempts, count)
+                ).fetchall()
+                for key, _ in rows:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                        "updated_at = ? WHERE key = ?",
+                        (LEASED, worker_id, now + self.lease_seconds, now, key)
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        return [(key, json.loads(stub)) for key, stub in rows]
+
+    def complete(self, key, record):
+        """Post a worker's record; it is retried later if the detail page gave nothing"""
+        status = DONE if has_detail_fields(record) else FAILED
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, record = ?, worker = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE key = ? AND status != ?",
+                (status, json.dumps(record, ensure_ascii=False), time.time(), key, DONE)
+            )
+        return status
+
+    def outstanding(self):
+        """Jobs still to be scraped or currently leased"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE (status IN (?, ?) AND attempts < ?) "
+            "OR (status = ? AND (lease_expires >= ? OR attempts < ?))",
+            (PENDING, FAILED, self.max_attempts, LEASED, time.time(), self.max_attempts)
+        ).fetchone()[0]
+
+    def records(self):
+        """Every posted record in listing order"""
+        for (record,) in self.conn.execute("SELECT record FROM jobs WHERE record IS NOT NULL ORDER BY seq"):
+            yield json.loads(record)
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def close(self):
+        self.conn.close()
+
+
+class RedisWorkQueue(WorkQueue):
+    """Work queue in Redis, for worker nodes spread over several machines"""
+
+    def __init__(self, url='redis://localhost:6379/0', prefix='rera', lease_seconds=600, max_attempts=3):
+        if redis is None:
+            raise RuntimeError("Redis queues need the redis package (pip install redis)")
+        super().__init__(lease_seconds, max_attempts)
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.keys = {name: f"{prefix}:{name}" for name in
+                     ('stubs', 'order', 'pending', 'leases', 'attempts', 'status', 'records', 'listing_complete')}
+        self.push_script = self.client.register_script(REDIS_PUSH)
+        self.lease_script = self.client.register_script(REDIS_LEASE)
+        self.complete_script = self.client.register_script(REDIS_COMPLETE)
+
+    def push(self, stub):
+        keys = [self.keys[name] for name in ('stubs', 'order', 'pending', 'status')]
+        return bool(self.push_script(keys=keys, args=[stub_key(stub), json.dumps(stub, ensure_ascii=False)]))
+
+    def mark_listing_complete(self):
+        self.client.set(self.keys['listing_complete'], '1')
+
+    def listing_complete(self):
+        return bool(self.client.exists(self.keys['listing_complete']))
+
+    def lease(self, worker_id, count=1):
+        keys = [self.keys[name] for name in ('pending', 'leases', 'attempts', 'status')]
+        leased = []
+        for _ in range(count):
+            key = self.lease_script(keys=keys, args=[self.lease_seconds, self.max_attempts])
+            if not key:
+                break
+            leased.append((key, json.loads(self.client.hget(self.keys['stubs'], key))))
+        return leased
+
+    def complete(self, key, record):
+        status = DONE if has_detail_fields(record) else FAILED
+        keys = [self.keys[name] for name in ('pending', 'leases', 'attempts', 'status', 'records')]
+        self.complete_script(keys=keys, args=[key, json.dumps(record, ensure_ascii=False), status, self.max_attempts])
+        return status
+
+    def outstanding(self):
+        return self.client.llen(self.keys['pending']) + self.client.zcard(self.keys['leases'])
+
+    def records(self, chunk=500):
+        order = self.client.lrange(self.keys['order'], 0, -1)
+        for start in range(0, len(order), chunk):
+            for record in self.client.hmget(self.keys['records'], order[start:start + chunk]):
+                if record:
+                    yield json.loads(record)
+
+    def counts(self):
+        return dict(Counter(self.client.hvals(self.keys['status'])))
+
+    def close(self):
+        self.client.close()
+
+
+def open_work_queue(url, lease_seconds=600, max_attempts=3):
+    """redis://host:port/db URLs open a Redis queue; anything else is a SQLite file path"""
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisWorkQueue(url, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    return SQLiteWorkQueue(url.replace('sqlite:///', '', 1), lease_seconds, max_attempts)
+
+
+def enqueue_stubs(stubs, work_queue):
+    """Coordinator side: push every stub, then flag the listing as fully enumerated"""
+    added = 0
+    for stub in stubs:
+        if work_queue.push(stub):
+            added += 1
+    work_queue.mark_listing_complete()
+    return added
+
+
+def lease_stubs(work_queue, worker_id=None, poll_interval=5):
+    """Worker side: yield leased stubs until the coordinator is done and the queue is drained"""
+    worker_id = worker_id or default_worker_id()
+    while True:
+        jobs = work_queue.lease(worker_id)
+        if jobs:
+            for _, stub in jobs:
+                yield stub
+            continue
+        if work_queue.drained():
+            return
+        # Waiting for the coordinator to enqueue more, or for another node's lease to expire
+        time.sleep(poll_interval)
+
+
+def post_results(results, work_queue):
+    """Worker side: post each (stub, record) pair back to the queue as it is produced"""
+    for stub, record in results:
+        work_queue.complete(stub_key(stub), record)
+        yield stub, record
+
+
+def wait_until_drained(work_queue, poll_interval=10):
+    """Coordinator side: block until the workers have finished every job, printing progress"""
+    while not work_queue.drained():
+        print(f"   🛰️ Waiting for workers: {work_queue.counts()}")
+        time.sleep(poll_interval)